@@ -35,6 +35,7 @@ CREATE TABLE `alternative_components` (
   `original_component_id` int DEFAULT NULL,
   `alternative_component_id` int DEFAULT NULL,
   PRIMARY KEY (`id`),
+  UNIQUE KEY `natural_key` (`original_component_id`,`alternative_component_id`),
   KEY `original_component_id` (`original_component_id`),
   KEY `alternative_component_id` (`alternative_component_id`),
   CONSTRAINT `alternative_components_ibfk_1` FOREIGN KEY (`original_component_id`) REFERENCES `inventory` (`id`) ON DELETE CASCADE,
@@ -51,6 +52,31 @@ LOCK TABLES `alternative_components` WRITE;
 /*!40000 ALTER TABLE `alternative_components` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `demand_forecast`
+--
+
+DROP TABLE IF EXISTS `demand_forecast`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `demand_forecast` (
+  `component_id` int NOT NULL,
+  `category` varchar(100) DEFAULT NULL,
+  `as_of` date NOT NULL,
+  `method` varchar(20) NOT NULL,
+  `daily_demand` double NOT NULL,
+  `demand_std` double NOT NULL,
+  `stock_quantity` int NOT NULL,
+  `days_of_cover` double DEFAULT NULL,
+  `safety_stock` double NOT NULL,
+  `reorder_point` double NOT NULL,
+  `needs_reorder` tinyint(1) NOT NULL,
+  `computed_at` datetime NOT NULL,
+  PRIMARY KEY (`component_id`),
+  KEY `needs_reorder_cover` (`needs_reorder`,`days_of_cover`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `inventory`
 --
@@ -67,7 +93,16 @@ CREATE TABLE `inventory` (
   `supply_voltage` varchar(50) DEFAULT NULL,
   `stock_quantity` int DEFAULT NULL,
   `price` decimal(10,2) DEFAULT NULL,
-  PRIMARY KEY (`id`)
+  `input_bandwidth_hz` double DEFAULT NULL,
+  `power_consumption_w` double DEFAULT NULL,
+  `supply_voltage_v` double DEFAULT NULL,
+  `updated_at` timestamp(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `natural_key` (`component_name`),
+  KEY `category_input_bandwidth_hz` (`category`,`input_bandwidth_hz`),
+  KEY `category_power_consumption_w` (`category`,`power_consumption_w`),
+  KEY `category_supply_voltage_v` (`category`,`supply_voltage_v`),
+  KEY `updated_at` (`updated_at`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -79,6 +114,39 @@ LOCK TABLES `inventory` WRITE;
 /*!40000 ALTER TABLE `inventory` DISABLE KEYS */;
 /*!40000 ALTER TABLE `inventory` ENABLE KEYS */;
 UNLOCK TABLES;
+DELIMITER ;;
+CREATE TRIGGER inventory_deletions_delete AFTER DELETE ON inventory FOR EACH ROW INSERT INTO inventory_deletions (component_id) VALUES (OLD.id) ;;
+DELIMITER ;
+
+--
+-- Table structure for table `inventory_deletions`
+--
+
+DROP TABLE IF EXISTS `inventory_deletions`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `inventory_deletions` (
+  `id` bigint NOT NULL AUTO_INCREMENT,
+  `component_id` int NOT NULL,
+  `deleted_at` timestamp(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (`id`),
+  KEY `deleted_at` (`deleted_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `inventory_source_ids`
+--
+
+DROP TABLE IF EXISTS `inventory_source_ids`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `inventory_source_ids` (
+  `source_id` int NOT NULL,
+  `component_name` varchar(255) NOT NULL,
+  PRIMARY KEY (`source_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
 
 --
 -- Table structure for table `sales`
@@ -106,6 +174,68 @@ LOCK TABLES `sales` WRITE;
 /*!40000 ALTER TABLE `sales` DISABLE KEYS */;
 /*!40000 ALTER TABLE `sales` ENABLE KEYS */;
 UNLOCK TABLES;
+DELIMITER ;;
+CREATE TRIGGER sales_rollups_insert AFTER INSERT ON sales FOR EACH ROW BEGIN IF @skip_sales_rollups IS NULL THEN INSERT INTO sales_rollup_component (period, period_start, component_id, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, s.component_id AS rollup_key, SUM(COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(1) AS added_sales FROM (SELECT NEW.component_id AS component_id, NEW.sale_date AS sale_date, NEW.quantity_sold AS quantity_sold) AS s CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; INSERT INTO sales_rollup_category (period, period_start, category, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, COALESCE(i.category, '') AS rollup_key, SUM(COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(1) AS added_sales FROM (SELECT NEW.component_id AS component_id, NEW.sale_date AS sale_date, NEW.quantity_sold AS quantity_sold) AS s LEFT JOIN inventory i ON i.id = s.component_id CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; END IF; END ;;
+DELIMITER ;
+DELIMITER ;;
+CREATE TRIGGER sales_rollups_update AFTER UPDATE ON sales FOR EACH ROW BEGIN IF @skip_sales_rollups IS NULL THEN INSERT INTO sales_rollup_component (period, period_start, component_id, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, s.component_id AS rollup_key, SUM(-COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(-1) AS added_sales FROM (SELECT OLD.component_id AS component_id, OLD.sale_date AS sale_date, OLD.quantity_sold AS quantity_sold) AS s CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; INSERT INTO sales_rollup_category (period, period_start, category, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, COALESCE(i.category, '') AS rollup_key, SUM(-COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(-1) AS added_sales FROM (SELECT OLD.component_id AS component_id, OLD.sale_date AS sale_date, OLD.quantity_sold AS quantity_sold) AS s LEFT JOIN inventory i ON i.id = s.component_id CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; INSERT INTO sales_rollup_component (period, period_start, component_id, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, s.component_id AS rollup_key, SUM(COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(1) AS added_sales FROM (SELECT NEW.component_id AS component_id, NEW.sale_date AS sale_date, NEW.quantity_sold AS quantity_sold) AS s CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; INSERT INTO sales_rollup_category (period, period_start, category, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, COALESCE(i.category, '') AS rollup_key, SUM(COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(1) AS added_sales FROM (SELECT NEW.component_id AS component_id, NEW.sale_date AS sale_date, NEW.quantity_sold AS quantity_sold) AS s LEFT JOIN inventory i ON i.id = s.component_id CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; END IF; END ;;
+DELIMITER ;
+DELIMITER ;;
+CREATE TRIGGER sales_rollups_delete AFTER DELETE ON sales FOR EACH ROW BEGIN IF @skip_sales_rollups IS NULL THEN INSERT INTO sales_rollup_component (period, period_start, component_id, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, s.component_id AS rollup_key, SUM(-COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(-1) AS added_sales FROM (SELECT OLD.component_id AS component_id, OLD.sale_date AS sale_date, OLD.quantity_sold AS quantity_sold) AS s CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; INSERT INTO sales_rollup_category (period, period_start, category, quantity_sold, sales_count) SELECT * FROM (SELECT p.period, CASE p.period WHEN 'day' THEN s.sale_date WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END AS period_start, COALESCE(i.category, '') AS rollup_key, SUM(-COALESCE(s.quantity_sold, 0)) AS added_quantity, SUM(-1) AS added_sales FROM (SELECT OLD.component_id AS component_id, OLD.sale_date AS sale_date, OLD.quantity_sold AS quantity_sold) AS s LEFT JOIN inventory i ON i.id = s.component_id CROSS JOIN (SELECT 'day' AS period UNION ALL SELECT 'week' AS period UNION ALL SELECT 'month' AS period) p WHERE TRUE AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL GROUP BY p.period, period_start, rollup_key) AS delta ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, sales_count = sales_count + added_sales; END IF; END ;;
+DELIMITER ;
+
+--
+-- Table structure for table `sales_rollup_category`
+--
+
+DROP TABLE IF EXISTS `sales_rollup_category`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `sales_rollup_category` (
+  `period` enum('day','week','month') NOT NULL,
+  `period_start` date NOT NULL,
+  `category` varchar(100) NOT NULL DEFAULT '',
+  `quantity_sold` bigint NOT NULL DEFAULT 0,
+  `sales_count` int NOT NULL DEFAULT 0,
+  PRIMARY KEY (`period`,`period_start`,`category`),
+  KEY `category_period` (`category`,`period`,`period_start`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `sales_rollup_component`
+--
+
+DROP TABLE IF EXISTS `sales_rollup_component`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `sales_rollup_component` (
+  `period` enum('day','week','month') NOT NULL,
+  `period_start` date NOT NULL,
+  `component_id` int NOT NULL,
+  `quantity_sold` bigint NOT NULL DEFAULT 0,
+  `sales_count` int NOT NULL DEFAULT 0,
+  PRIMARY KEY (`period`,`period_start`,`component_id`),
+  KEY `component_period` (`component_id`,`period`,`period_start`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `sales_rollup_delta`
+--
+
+DROP TABLE IF EXISTS `sales_rollup_delta`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `sales_rollup_delta` (
+  `id` bigint NOT NULL AUTO_INCREMENT,
+  `component_id` int NOT NULL,
+  `sale_date` date NOT NULL,
+  `quantity_sold` bigint NOT NULL,
+  `sales_count` int NOT NULL,
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
 
 /*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
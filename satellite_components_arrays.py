@@ -0,0 +1,12 @@
+import numpy as np
+
+def sorted_unique(values, return_inverse=False):
+    """np.unique by sorting, which beats hashing on large integer arrays."""
+    order = np.argsort(values, kind="stable") if return_inverse else None
+    ordered = values[order] if return_inverse else np.sort(values)
+    first = np.concatenate(([True], ordered[1:] != ordered[:-1])) if len(ordered) else np.empty(0, dtype=bool)
+    if not return_inverse:
+        return ordered[first]
+    inverse = np.empty(len(values), dtype=np.int64)
+    inverse[order] = np.cumsum(first) - 1
+    return ordered[first], inverse
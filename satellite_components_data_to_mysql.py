@@ -1,7 +1,18 @@
 
 
+from satellite_components_normalization import normalize_column
+from satellite_components_sales_rollups import (apply_sales_delta, defer_sales_rollups, ensure_sales_rollups,
+                                                resume_sales_rollups, stage_sales_delta, stage_sales_merge)
 import pandas as pd
 import mysql.connector
+from mysql.connector import pooling
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import os
+import queue
+import sys
+import threading
+import time
 
 # MySQL connection details
 db_config = {
@@ -9,34 +20,672 @@ db_config = {
     "user": "root",
     "password": "12345",
     "database": "SATELLITE_INVENTORY_SYSTEM",
-    "port": 3306  # Adjust based on your database setup
+    "port": 3306,  # Adjust based on your database setup
+    "allow_local_infile": True  # Needed for the LOAD DATA LOCAL INFILE fast path
 }
 
-# Establish connection
-conn = mysql.connector.connect(**db_config)
-cursor = conn.cursor()
+BATCH_SIZE = 1000  # Rows sent per executemany call
+COMMIT_EVERY = 10000  # Rows per transaction
+CHUNK_SIZE = 50000  # Rows read from the CSV at a time
+POOL_SIZE = 8  # Connections shared by the parallel loads
+WRITERS_PER_TABLE = 3  # Connections a large CSV is spread over
+SPLIT_BYTES = 32 * 1024 * 1024  # CSVs larger than this are split across connections
+
+# Column types of each table's CSV, so chunks are parsed without type inference
+CSV_DTYPES = {
+    "inventory": {
+        "id": "Int64",
+        "component_name": "string",
+        "category": "string",
+        "input_bandwidth": "string",
+        "power_consumption": "string",
+        "supply_voltage": "string",
+        "stock_quantity": "Int64",
+        "price": "float64",
+    },
+    "alternative_components": {"id": "Int64", "original_component_id": "Int64", "alternative_component_id": "Int64"},
+    "sales": {"id": "Int64", "component_id": "Int64", "quantity_sold": "Int64", "sale_date": "string"},
+}
+# Date columns parsed while streaming, with their CSV format
+DATE_COLUMNS = {"sales": {"sale_date": "%Y-%m-%d"}}
+# Spec string columns -> (numeric column, SI unit) filled from them on load
+NUMERIC_SPEC_COLUMNS = {
+    "inventory": {
+        "input_bandwidth": ("input_bandwidth_hz", "Hz"),
+        "power_consumption": ("power_consumption_w", "W"),
+        "supply_voltage": ("supply_voltage_v", "V"),
+    },
+}
+# Columns identifying a row across loads; sales keep the id the source system gave them
+NATURAL_KEYS = {
+    "inventory": ["component_name"],
+    "sales": ["id"],
+    "alternative_components": ["original_component_id", "alternative_component_id"],
+}
+# Columns holding inventory ids as the source of the CSV files numbered them; a sync maps them to this database's
+COMPONENT_REFERENCES = {
+    "sales": ["component_id"],
+    "alternative_components": ["original_component_id", "alternative_component_id"],
+}
+SOURCE_IDS_TABLE = """CREATE TABLE IF NOT EXISTS inventory_source_ids (
+  source_id int NOT NULL,
+  component_name varchar(255) NOT NULL,
+  PRIMARY KEY (source_id)
+)"""
+
+def has_natural_key(table_name):
+    """True when table_name has a unique natural_key index besides its primary key."""
+    return NATURAL_KEYS.get(table_name, ["id"]) != ["id"]
+
+def relax_checks(cursor, table_name=None, keep_unique=False):
+    """Turns off unique and foreign key checks and non-unique index updates, as the dump header does.
+
+    Without table_name only this session's checks are relaxed. keep_unique leaves
+    unique checks on, so rows repeating a natural key are skipped rather than
+    slipping past the index.
+    """
+    cursor.execute("SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS")
+    if not keep_unique:
+        cursor.execute("SET UNIQUE_CHECKS=0")
+    cursor.execute("SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0")
+    if table_name:
+        cursor.execute(f"ALTER TABLE {table_name} DISABLE KEYS")
+
+def restore_checks(cursor, table_name=None):
+    if table_name:
+        cursor.execute(f"ALTER TABLE {table_name} ENABLE KEYS")
+    cursor.execute("SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS")
+    cursor.execute("SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS")
+
+def csv_rows(df):
+    """Returns the DataFrame rows as tuples of plain Python values, with NaN as NULL."""
+    df = df.astype(object).where(df.notna(), None)
+    return list(df.itertuples(index=False, name=None))
+
+def load_columns(header, table_name):
+    """Returns the columns loaded from a CSV file with this header: its own plus the numeric specs."""
+    numeric = [target for source, (target, _) in NUMERIC_SPEC_COLUMNS.get(table_name, {}).items()
+               if source in header]
+    return list(header) + numeric
+
+def add_numeric_specs(chunk, table_name):
+    """Adds the numeric column of each spec string column, taking the upper end of ranges."""
+    for source, (target, unit) in NUMERIC_SPEC_COLUMNS.get(table_name, {}).items():
+        if source in chunk.columns:
+            chunk[target] = normalize_column(chunk[source], source, unit)[1]
+
+def read_csv_chunks(file_path, table_name, chunk_size=CHUNK_SIZE):
+    """Yields (columns, rows) for each chunk of a CSV file, typed, with its dates and specs parsed."""
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size, dtype=CSV_DTYPES.get(table_name)):
+        for column, date_format in DATE_COLUMNS.get(table_name, {}).items():
+            if column in chunk.columns:
+                chunk[column] = pd.to_datetime(chunk[column], format=date_format, errors="coerce").dt.date
+        add_numeric_specs(chunk, table_name)
+        yield list(chunk.columns), csv_rows(chunk)
+
+def put_unless_stopped(chunks, item, stopped):
+    """Puts item on the queue, giving up once stopped is set rather than blocking forever."""
+    while not stopped.is_set():
+        try:
+            chunks.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def read_chunks_into(chunks, stopped, file_path, table_name, chunk_size=CHUNK_SIZE, consumers=1):
+    """Reader thread: queues the typed chunks of a CSV file, then one None per consumer."""
+    try:
+        for chunk in read_csv_chunks(file_path, table_name, chunk_size):
+            if not put_unless_stopped(chunks, chunk, stopped):
+                return
+        for _ in range(consumers):
+            put_unless_stopped(chunks, None, stopped)
+    except Exception as e:
+        for _ in range(consumers):
+            put_unless_stopped(chunks, e, stopped)
+
+def insert_chunks(chunks, stopped, cursor, connection, table_name, batch_size=BATCH_SIZE, commit_every=COMMIT_EVERY):
+    """Inserts queued chunks until the reader's None, or until another writer has failed; returns the rows inserted."""
+    rows = read = 0
+    while True:
+        try:
+            chunk = chunks.get(timeout=0.5)
+        except queue.Empty:
+            if stopped.is_set():
+                break
+            continue
+        if chunk is None:
+            break
+        if isinstance(chunk, Exception):
+            raise chunk
+        columns, chunk_rows = chunk
+        # Sales changes are queued in the transaction of their rows, so the rollups never miss or double count any
+        stage = stage_sales_delta if table_name == "sales" else None
+        read += len(chunk_rows)
+        rows += insert_rows(cursor, connection, table_name, columns, chunk_rows, batch_size, commit_every, stage)
+    if read > rows:
+        print(f"Skipped {read - rows} {table_name} rows whose natural key is already in the table")
+    return rows
+
+def stream_csv_rows(cursor, connection, file_path, table_name, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE,
+                    commit_every=COMMIT_EVERY, into=None):
+    """Inserts a CSV file chunk by chunk, reading the next chunk while the current one is written.
+
+    At most one chunk waits in the queue, so memory stays flat whatever the file size.
+    The file is typed as table_name and inserted into into, which defaults to table_name.
+    """
+    chunks = queue.Queue(maxsize=1)
+    stopped = threading.Event()
+    reader = threading.Thread(target=read_chunks_into, args=(chunks, stopped, file_path, table_name, chunk_size),
+                              daemon=True)
+    reader.start()
+    try:
+        return insert_chunks(chunks, stopped, cursor, connection, into or table_name, batch_size, commit_every)
+    finally:
+        stopped.set()
+        reader.join()
+
+def insert_rows(cursor, connection, table_name, columns, rows, batch_size=BATCH_SIZE, commit_every=COMMIT_EVERY,
+                stage=None):
+    """Inserts rows in batches through one INSERT statement, committing every commit_every rows.
+
+    Returns the rows inserted: on tables with a natural key, rows repeating one
+    already in the table are skipped. stage(cursor, columns, rows) is called with
+    the rows of each transaction just before it commits.
+    """
+    ignore = has_natural_key(table_name)
+    # executemany rewrites each batch into a single multi-row INSERT
+    sql = (f"INSERT {'IGNORE ' if ignore else ''}INTO {table_name} ({','.join(columns)}) "
+           f"VALUES ({','.join(['%s'] * len(columns))})")
+    inserted = 0
+    committed = 0
+    for start in range(0, len(rows), batch_size):
+        end = min(start + batch_size, len(rows))
+        cursor.executemany(sql, rows[start:end])
+        inserted += cursor.rowcount if ignore else end - start
+        if end - committed >= commit_every or end == len(rows):
+            if stage is not None:
+                stage(cursor, columns, rows[committed:end])
+            connection.commit()
+            committed = end
+    return inserted
+
+def load_data_infile(cursor, connection, file_path, table_name):
+    """Loads a CSV file with LOAD DATA LOCAL INFILE and returns the number of rows loaded.
+
+    Empty fields are stored as NULL, as the pandas loaders do, instead of '' or 0.
+    Rows repeating a natural key are skipped.
+    """
+    with open(file_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        # Only tables with a natural key can skip rows, and counting them needs a pass over the file
+        records = sum(1 for _ in reader) if has_natural_key(table_name) else None
+    with open(file_path, "rb") as f:
+        line_ending = "\\r\\n" if b"\r\n" in f.readline() else "\\n"
+    variables = ",".join(f"@{column}" for column in header)
+    assignments = ", ".join(f"{column} = NULLIF(@{column}, '')" for column in header)
+
+    cursor.execute(
+        f"LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE {table_name} CHARACTER SET utf8mb4 "
+        f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '{line_ending}' "
+        f"IGNORE 1 LINES ({variables}) SET {assignments}",
+        (file_path.replace("\\", "/"),),
+    )
+    connection.commit()
+    if records is not None and records > cursor.rowcount:
+        print(f"Skipped {records - cursor.rowcount} {table_name} rows whose natural key is already in the table")
+    return cursor.rowcount
+
+def ensure_numeric_spec_columns(cursor, table_name="inventory"):
+    """Adds the numeric spec columns and their (category, value) indexes to a table created without them."""
+    for _, (column, _) in NUMERIC_SPEC_COLUMNS.get(table_name, {}).items():
+        cursor.execute(f"SHOW COLUMNS FROM {table_name} LIKE %s", (column,))
+        if not cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} double DEFAULT NULL, "
+                           f"ADD KEY category_{column} (category, {column})")
+
+def backfill_numeric_specs(cursor, connection, table_name="inventory", batch_size=BATCH_SIZE):
+    """Fills the numeric spec columns of rows stored without them and returns the number of rows updated.
+
+    Rows are walked in id order batch_size at a time, so the table is never locked as a whole.
+    """
+    columns = NUMERIC_SPEC_COLUMNS.get(table_name)
+    if not columns:
+        return 0
+    sources = list(columns)
+    targets = [target for target, _ in columns.values()]
+    unfilled = " OR ".join(f"({source} IS NOT NULL AND {target} IS NULL)"
+                           for source, (target, _) in columns.items())
+    update = f"UPDATE {table_name} SET {', '.join(f'{target} = %s' for target in targets)} WHERE id = %s"
+
+    updated = 0
+    last_id = 0
+    while True:
+        cursor.execute(f"SELECT id, {','.join(sources)} FROM {table_name} WHERE id > %s AND ({unfilled}) "
+                       f"ORDER BY id LIMIT {int(batch_size)}", (last_id,))
+        rows = cursor.fetchall()
+        if not rows:
+            return updated
+        ids = [row[0] for row in rows]
+        numbers = [normalize_column([row[i + 1] for row in rows], source, unit)[1]
+                   for i, (source, (_, unit)) in enumerate(columns.items())]
+        cursor.executemany(update, [(*values, row_id) for row_id, values in zip(ids, zip(*numbers))])
+        connection.commit()
+        updated += len(rows)
+        last_id = ids[-1]
+
+def backfill_inventory_specs(connection=None):
+    """Adds the numeric spec columns to an existing inventory table and fills them."""
+    own_connection = connection is None
+    if own_connection:
+        connection = mysql.connector.connect(**db_config)
+    backfill_cursor = connection.cursor()
+    started = time.perf_counter()
+    try:
+        ensure_numeric_spec_columns(backfill_cursor)
+        rows = backfill_numeric_specs(backfill_cursor, connection)
+    finally:
+        backfill_cursor.close()
+        if own_connection:
+            connection.close()
+    print(f"Numeric specs filled for {rows} inventory rows in {time.perf_counter() - started:.2f} s")
+    return rows
+
+def find_components(cursor, category=None, **bounds):
+    """Returns the inventory rows in category whose numeric specs lie within bounds.
+
+    bounds are min_<column> or max_<column> for the numeric spec columns, in SI
+    units, e.g. find_components(cursor, "Transistor", min_input_bandwidth_hz=50e6,
+    max_power_consumption_w=3). With a category this is a range scan on a
+    (category, column) index; without one MySQL skip-scans the same index.
+    """
+    numeric = {target for columns in NUMERIC_SPEC_COLUMNS.values() for target, _ in columns.values()}
+    conditions = []
+    args = []
+    if category is not None:
+        conditions.append("category = %s")
+        args.append(category)
+    for name, value in bounds.items():
+        bound, _, column = name.partition("_")
+        if bound not in ("min", "max") or column not in numeric:
+            raise ValueError(f"Unknown bound {name}, expected min_ or max_ followed by one of {sorted(numeric)}")
+        conditions.append(f"{column} {'>=' if bound == 'min' else '<='} %s")
+        args.append(value)
+    cursor.execute(f"SELECT * FROM inventory WHERE {' AND '.join(conditions) or 'TRUE'}", tuple(args))
+    return cursor.fetchall()
 
 # Function to load CSV into MySQL
-def load_csv_to_mysql(file_path, table_name):
-    df = pd.read_csv(file_path)
-    columns = ",".join(df.columns)
-
-    for _, row in df.iterrows():
-        values = ",".join(["%s"] * len(row))
-        sql = f"INSERT INTO {table_name} ({columns}) VALUES ({values})"
-        cursor.execute(sql, tuple(row))
-
-    conn.commit()
-    print(f"Data inserted into {table_name} successfully!")
-
-# Load datasets
-load_csv_to_mysql(r"C:\Users\D Janani\Downloads\inventory_unique.csv", "inventory")
-load_csv_to_mysql(r"C:\Users\D Janani\Downloads\alternative_components (2).csv", "alternative_components")
-load_csv_to_mysql(r"C:\Users\D Janani\Downloads\sales (1).csv", "sales")
-
-# Close connection
-cursor.close()
-conn.close()
+def load_csv_to_mysql(file_path, table_name, batch_size=BATCH_SIZE, commit_every=COMMIT_EVERY, use_load_data=False,
+                      relax=True, connection=None, chunk_size=CHUNK_SIZE):
+    """Bulk loads a CSV file into table_name and returns the number of rows inserted.
+
+    The file is streamed in chunks of chunk_size rows, and the numeric spec
+    columns are filled from the spec strings. use_load_data tries LOAD DATA
+    LOCAL INFILE first, which needs local_infile enabled on the server, and
+    falls back to batched inserts if it is refused. Streamed sales rows reach
+    the rollups as one set-based update at the end instead of through the
+    row triggers.
+    """
+    own_connection = connection is None
+    if own_connection:
+        connection = mysql.connector.connect(**db_config)
+    load_cursor = connection.cursor()
+    started = time.perf_counter()
+    # Only what was changed is put back, so an early failure is not hidden by restoring unsaved settings
+    relaxed = deferred = False
+    try:
+        ensure_numeric_spec_columns(load_cursor, table_name)
+        if table_name == "sales":
+            ensure_sales_rollups(load_cursor)
+        if relax:
+            relax_checks(load_cursor, table_name, keep_unique=has_natural_key(table_name))
+            relaxed = True
+
+        rows = None
+        if use_load_data:
+            try:
+                rows = load_data_infile(load_cursor, connection, file_path, table_name)
+            except mysql.connector.Error as e:
+                connection.rollback()
+                print(f"LOAD DATA LOCAL INFILE failed, falling back to batched inserts: {e}")
+            else:
+                # LOAD DATA only fills the CSV's own columns. The rows are already committed, so a
+                # failure here must not fall back to inserting them a second time
+                backfill_numeric_specs(load_cursor, connection, table_name, batch_size)
+
+        if rows is None:
+            if table_name == "sales":
+                defer_sales_rollups(load_cursor)
+                deferred = True
+            rows = stream_csv_rows(load_cursor, connection, file_path, table_name, chunk_size, batch_size,
+                                   commit_every)
+            if table_name == "sales":
+                apply_sales_delta(load_cursor, connection)
+    finally:
+        if deferred:
+            resume_sales_rollups(load_cursor)
+        if relaxed:
+            restore_checks(load_cursor, table_name)
+        load_cursor.close()
+        if own_connection:
+            connection.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Data inserted into {table_name} successfully! {rows} rows in {elapsed:.2f} s "
+          f"({rows / elapsed if elapsed else 0:.0f} rows/s)")
+    return rows
+
+def ensure_natural_key(cursor, table_name):
+    """Adds a unique index on the natural key of table_name unless it already has one."""
+    if not has_natural_key(table_name):
+        return
+    key_columns = NATURAL_KEYS[table_name]
+    cursor.execute(f"SHOW INDEX FROM {table_name} WHERE Key_name = 'natural_key'")
+    if cursor.fetchall():
+        return
+    try:
+        cursor.execute(f"ALTER TABLE {table_name} ADD UNIQUE KEY natural_key ({','.join(key_columns)})")
+    except mysql.connector.Error as e:
+        # Rows appended by earlier full loads have to be deduplicated by hand first
+        print(f"Could not add a unique key on {table_name} ({', '.join(key_columns)}), "
+              f"merging without it: {e}")
+
+def record_source_ids(cursor, staging, source_id):
+    """Replaces the source id -> component_name map with the one of a staged inventory file.
+
+    source_id is the file's id column, or its row number when it has none,
+    which is the id the rows got when the file was first loaded.
+    """
+    cursor.execute("DELETE FROM inventory_source_ids")
+    cursor.execute(f"REPLACE INTO inventory_source_ids (source_id, component_name) "
+                   f"SELECT {source_id}, component_name FROM {staging} "
+                   f"WHERE {source_id} IS NOT NULL AND component_name IS NOT NULL ORDER BY staging_row")
+
+def map_component_references(cursor, staging, table_name):
+    """Rewrites the source inventory ids of a staged file to this database's ids through component_name.
+
+    Rows referring to a component the last synced inventory file does not
+    name are dropped; returns how many.
+    """
+    cursor.execute("SELECT COUNT(*) FROM inventory_source_ids")
+    if not cursor.fetchone()[0]:
+        print(f"No inventory file has been synced yet, {table_name} component ids are used as they are")
+        return 0
+    dropped = 0
+    for column in COMPONENT_REFERENCES[table_name]:
+        resolve = (f"LEFT JOIN inventory_source_ids m ON m.source_id = s.{column} "
+                   f"LEFT JOIN inventory i ON i.component_name = m.component_name")
+        cursor.execute(f"DELETE s FROM {staging} s {resolve} WHERE s.{column} IS NOT NULL AND i.id IS NULL")
+        dropped += cursor.rowcount
+        cursor.execute(f"UPDATE {staging} s {resolve} SET s.{column} = i.id WHERE s.{column} IS NOT NULL")
+    if dropped:
+        print(f"Skipped {dropped} {table_name} rows referring to components missing from the synced inventory")
+    return dropped
+
+def upsert_csv_to_mysql(file_path, table_name, connection=None, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE,
+                        commit_every=COMMIT_EVERY):
+    """Merges a CSV file into table_name on its natural key and returns the inserted/updated/unchanged counts.
+
+    The file is bulk loaded into a staging table first. Rows with a new key are
+    inserted, rows whose values differ are updated and identical rows are left
+    alone, so loading the same file twice changes nothing. Within the file the
+    last row for a key wins; rows without a key are skipped.
+
+    Ids in the files are the source's, not this database's: an inventory sync
+    records which component_name each of its ids stands for, and the component
+    ids of sales and alternative_components are mapped through it.
+    """
+    with open(file_path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    key_columns = NATURAL_KEYS[table_name]
+    missing = [column for column in key_columns if column not in header]
+    if missing:
+        raise ValueError(f"{file_path} has no {', '.join(missing)} column to match {table_name} rows on")
+    columns = load_columns(header, table_name)
+    # A surrogate id only identifies rows of the table it came from, so it is neither compared nor copied
+    value_columns = [column for column in columns if column not in key_columns and column != "id"]
+    insert_columns = key_columns + value_columns
+    staging = f"{table_name}_staging"
+
+    join = " AND ".join(f"t.{column} = s.{column}" for column in key_columns)
+    same = " AND ".join(f"t.{column} <=> s.{column}" for column in value_columns) or "TRUE"
+
+    own_connection = connection is None
+    if own_connection:
+        connection = mysql.connector.connect(**db_config)
+    merge_cursor = connection.cursor()
+    started = time.perf_counter()
+    deferred = False
+    try:
+        ensure_numeric_spec_columns(merge_cursor, table_name)
+        ensure_natural_key(merge_cursor, table_name)
+        merge_cursor.execute(SOURCE_IDS_TABLE)
+        if table_name == "sales":
+            ensure_sales_rollups(merge_cursor)
+            defer_sales_rollups(merge_cursor)
+            deferred = True
+        merge_cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        merge_cursor.execute(f"CREATE TABLE {staging} SELECT {','.join(columns)} FROM {table_name} LIMIT 0")
+        merge_cursor.execute(f"ALTER TABLE {staging} ADD staging_row int NOT NULL AUTO_INCREMENT PRIMARY KEY, "
+                             f"ADD KEY natural_key ({','.join(key_columns)})")
+        staged = stream_csv_rows(merge_cursor, connection, file_path, table_name, chunk_size, batch_size,
+                                 commit_every, into=staging)
+        if table_name == "inventory":
+            record_source_ids(merge_cursor, staging, "id" if "id" in header else "staging_row")
+        elif table_name in COMPONENT_REFERENCES:
+            map_component_references(merge_cursor, staging, table_name)
+
+        # Keep the last row for each key and drop rows without one
+        newer = " AND ".join(f"older.{column} = newer.{column}" for column in key_columns)
+        merge_cursor.execute(f"DELETE older FROM {staging} older JOIN {staging} newer "
+                             f"ON {newer} AND older.staging_row < newer.staging_row")
+        merge_cursor.execute(f"DELETE FROM {staging} WHERE {' OR '.join(f'{c} IS NULL' for c in key_columns)}")
+        merge_cursor.execute(f"SELECT COUNT(*) FROM {staging}")
+        merged = merge_cursor.fetchone()[0]
+
+        merge_cursor.execute(f"SELECT COUNT(t.{key_columns[0]}), "
+                             f"COALESCE(SUM(t.{key_columns[0]} IS NOT NULL AND NOT ({same})), 0) "
+                             f"FROM {staging} s LEFT JOIN {table_name} t ON {join}")
+        matched, changed = (int(count) for count in merge_cursor.fetchone())
+        counts = {
+            "inserted": merged - matched,
+            "updated": changed,
+            "unchanged": matched - changed,
+            "skipped": staged - merged,
+        }
+
+        if table_name == "sales" and (changed or counts["inserted"]):
+            stage_sales_merge(merge_cursor, staging, join, same, columns)
+            apply_sales_delta(merge_cursor)
+
+        # Only rows whose values differ are written, so unchanged rows take no locks
+        if value_columns and changed:
+            merge_cursor.execute(f"UPDATE {table_name} t JOIN {staging} s ON {join} "
+                                 f"SET {', '.join(f't.{column} = s.{column}' for column in value_columns)} "
+                                 f"WHERE NOT ({same})")
+        if counts["inserted"]:
+            merge_cursor.execute(f"INSERT INTO {table_name} ({','.join(insert_columns)}) "
+                                 f"SELECT {','.join(f's.{column}' for column in insert_columns)} "
+                                 f"FROM {staging} s LEFT JOIN {table_name} t ON {join} "
+                                 f"WHERE t.{key_columns[0]} IS NULL ORDER BY s.staging_row")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        if deferred:
+            resume_sales_rollups(merge_cursor)
+        merge_cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        merge_cursor.close()
+        if own_connection:
+            connection.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Data merged into {table_name} successfully! {counts['inserted']} inserted, {counts['updated']} updated, "
+          f"{counts['unchanged']} unchanged, {counts['skipped']} skipped in {elapsed:.2f} s")
+    return counts
+
+class InventoryLoader:
+    """Loads the inventory CSVs through a connection pool, keeping foreign key order.
+
+    inventory is loaded first. sales and alternative_components only reference
+    inventory.id, so they are then loaded in parallel. A CSV larger than
+    split_bytes that carries its own id column is streamed once and its chunks
+    are inserted over writers connections at the same time. Files without ids
+    stay on one connection so auto-increment ids follow file order.
+
+    sync_all merges the files into the existing rows instead of appending them.
+    """
+
+    def __init__(self, config=None, pool_size=POOL_SIZE, writers=WRITERS_PER_TABLE, split_bytes=SPLIT_BYTES,
+                 **load_options):
+        self.pool = pooling.MySQLConnectionPool(pool_name="inventory_loader", pool_size=pool_size,
+                                                **(config or db_config))
+        self.writers = writers
+        self.split_bytes = split_bytes
+        self.load_options = load_options  # Passed on to load_csv_to_mysql
+
+    def connection(self):
+        """Takes a connection from the pool, waiting while all of them are in use."""
+        while True:
+            try:
+                return self.pool.get_connection()
+            except mysql.connector.errors.PoolError:
+                time.sleep(0.05)
+
+    def update_sales_rollups(self, apply=False):
+        """Creates the sales rollups if needed and, with apply, folds in the changes queued by the writers."""
+        connection = self.connection()
+        rollup_cursor = connection.cursor()
+        try:
+            ensure_sales_rollups(rollup_cursor)
+            if apply:
+                apply_sales_delta(rollup_cursor, connection)
+        finally:
+            rollup_cursor.close()
+            connection.close()
+
+    def load_table(self, file_path, table_name):
+        """Loads one CSV file and returns the number of rows inserted."""
+        with open(file_path, newline="", encoding="utf-8") as f:
+            has_ids = "id" in next(csv.reader(f))
+        if (self.writers > 1 and has_ids and os.path.getsize(file_path) > self.split_bytes
+                and not self.load_options.get("use_load_data")):
+            return self.load_table_split(file_path, table_name)
+
+        connection = self.connection()
+        try:
+            return load_csv_to_mysql(file_path, table_name, connection=connection, **self.load_options)
+        finally:
+            connection.close()  # Returns it to the pool
+
+    def load_table_split(self, file_path, table_name):
+        """Streams a CSV file once and inserts its chunks over several connections at the same time."""
+        batch_size = self.load_options.get("batch_size", BATCH_SIZE)
+        commit_every = self.load_options.get("commit_every", COMMIT_EVERY)
+        chunks = queue.Queue(maxsize=self.writers)
+        stopped = threading.Event()
+
+        def write():
+            connection = self.connection()
+            write_cursor = connection.cursor()
+            try:
+                relax_checks(write_cursor, keep_unique=has_natural_key(table_name))
+                defer_sales_rollups(write_cursor)
+                try:
+                    return insert_chunks(chunks, stopped, write_cursor, connection, table_name, batch_size,
+                                         commit_every)
+                finally:
+                    resume_sales_rollups(write_cursor)
+                    restore_checks(write_cursor)
+            except Exception:
+                stopped.set()
+                raise
+            finally:
+                write_cursor.close()
+                connection.close()
+
+        if table_name == "sales":
+            self.update_sales_rollups()
+        started = time.perf_counter()
+        reader = threading.Thread(
+            target=read_chunks_into,
+            args=(chunks, stopped, file_path, table_name, self.load_options.get("chunk_size", CHUNK_SIZE),
+                  self.writers),
+            daemon=True,
+        )
+        reader.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.writers) as executor:
+                futures = [executor.submit(write) for _ in range(self.writers)]
+            rows = sum(future.result() for future in futures)
+        finally:
+            stopped.set()
+            reader.join()
+        if table_name == "sales":
+            # The writers only queued their changes; fold them in once
+            self.update_sales_rollups(apply=True)
+
+        elapsed = time.perf_counter() - started
+        print(f"Data inserted into {table_name} successfully! {rows} rows over {self.writers} connections "
+              f"in {elapsed:.2f} s ({rows / elapsed if elapsed else 0:.0f} rows/s)")
+        return rows
+
+    def upsert_table(self, file_path, table_name):
+        """Merges one CSV file into its table and returns the inserted/updated/unchanged counts."""
+        options = {name: value for name, value in self.load_options.items()
+                   if name in ("batch_size", "commit_every", "chunk_size")}
+        connection = self.connection()
+        try:
+            return upsert_csv_to_mysql(file_path, table_name, connection=connection, **options)
+        finally:
+            connection.close()
+
+    def in_foreign_key_order(self, load, inventory_path, sales_path, alternatives_path):
+        """Runs load for inventory, then for sales and alternative_components in parallel."""
+        results = {"inventory": load(inventory_path, "inventory")}
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                "sales": executor.submit(load, sales_path, "sales"),
+                "alternative_components": executor.submit(load, alternatives_path, "alternative_components"),
+            }
+        for table_name, future in futures.items():
+            results[table_name] = future.result()
+        return results
+
+    def load_all(self, inventory_path, sales_path, alternatives_path):
+        """Loads inventory, then sales and alternative_components in parallel; returns rows per table."""
+        started = time.perf_counter()
+        rows = self.in_foreign_key_order(self.load_table, inventory_path, sales_path, alternatives_path)
+        print(f"Loaded {sum(rows.values())} rows into 3 tables in {time.perf_counter() - started:.2f} s")
+        return rows
+
+    def sync_all(self, inventory_path, sales_path, alternatives_path):
+        """Merges the three files into the existing tables in the same order; returns counts per table."""
+        started = time.perf_counter()
+        counts = self.in_foreign_key_order(self.upsert_table, inventory_path, sales_path, alternatives_path)
+        totals = {name: sum(table_counts[name] for table_counts in counts.values())
+                  for name in ("inserted", "updated", "unchanged")}
+        print(f"Synced 3 tables in {time.perf_counter() - started:.2f} s: {totals['inserted']} inserted, "
+              f"{totals['updated']} updated, {totals['unchanged']} unchanged")
+        return counts
+
+if __name__ == "__main__":
+    # Load datasets: inventory first, then sales and alternatives in parallel
+    # Pass --upsert to merge them into the existing rows instead of appending,
+    # or --backfill to add the numeric spec columns to an existing database
+    if "--backfill" in sys.argv:
+        backfill_inventory_specs()
+        sys.exit()
+    loader = InventoryLoader()
+    load = loader.sync_all if "--upsert" in sys.argv else loader.load_all
+    load(
+        r"C:\Users\D Janani\Downloads\inventory_unique.csv",
+        r"C:\Users\D Janani\Downloads\sales (1).csv",
+        r"C:\Users\D Janani\Downloads\alternative_components (2).csv",
+    )
 
 
 
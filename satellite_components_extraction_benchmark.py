@@ -0,0 +1,67 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from satellite_components_webscraping import (
+    create_driver,
+    extract_product_details,
+    extract_product_details_from_html,
+    product_page_ready,
+    urls,
+)
+import os
+import statistics
+import sys
+import time
+
+def time_call(function, repeat):
+    """Returns the median wall time of repeat calls, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def benchmark_extraction(page_urls, repeat=5):
+    """Times the legacy extractor against the single-pass one on each loaded page."""
+    driver = create_driver()
+    rows = []
+
+    try:
+        for url in page_urls:
+            # Local snapshots can be benchmarked as well as live pages
+            if os.path.exists(url):
+                url = "file:///" + os.path.abspath(url).replace("\\", "/").lstrip("/")
+
+            driver.get(url)
+            try:
+                WebDriverWait(driver, 30, poll_frequency=0.1).until(product_page_ready)
+            except Exception as e:
+                print(f" Skipping {url}: page not ready ({e})")
+                continue
+
+            # Legacy: page_source + html.parser + execute_script round-trip
+            legacy_ms = time_call(lambda: extract_product_details(driver), repeat)
+            # Single pass: one page_source snapshot parsed with lxml
+            single_ms = time_call(lambda: extract_product_details_from_html(driver.page_source), repeat)
+            # Parse only, on a snapshot that is already in memory
+            snapshot = driver.page_source
+            parse_ms = time_call(lambda: extract_product_details_from_html(snapshot), repeat)
+
+            rows.append((url, legacy_ms, single_ms, parse_ms))
+            print(f" {legacy_ms:9.2f} ms {single_ms:9.2f} ms {parse_ms:9.2f} ms  {url}")
+    finally:
+        driver.quit()
+
+    if rows:
+        legacy_mean = statistics.mean(row[1] for row in rows)
+        single_mean = statistics.mean(row[2] for row in rows)
+        parse_mean = statistics.mean(row[3] for row in rows)
+        print(f" Pages: {len(rows)}")
+        print(f" Legacy extract_product_details:      {legacy_mean:.2f} ms/page")
+        print(f" Single-pass (with page_source):      {single_mean:.2f} ms/page")
+        print(f" Single-pass (snapshot parse only):   {parse_mean:.2f} ms/page")
+        print(f" Speed-up: {legacy_mean / single_mean:.1f}x")
+    return rows
+
+if __name__ == "__main__":
+    # Pass product URLs or saved .html files; defaults to the first 20 catalog URLs
+    benchmark_extraction(sys.argv[1:] or urls[:20])
@@ -0,0 +1,221 @@
+from satellite_components_arrays import sorted_unique
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+import mysql.connector
+import numpy as np
+import sys
+import time
+
+HISTORY_DAYS = 730  # Days of sales history in the demand matrix
+WINDOW_DAYS = 28  # Moving average window, also used for the demand spread
+ALPHA = 0.1  # Exponential smoothing weight of the most recent day
+LEAD_TIME_DAYS = 14  # Days between placing an order and the stock arriving
+SERVICE_Z = 1.65  # Safety stock in standard deviations of lead time demand; 1.65 covers about 95% of lead times
+WRITE_BATCH = 5000
+
+FORECAST_TABLE = """CREATE TABLE IF NOT EXISTS demand_forecast (
+  component_id int NOT NULL,
+  category varchar(100) DEFAULT NULL,
+  as_of date NOT NULL,
+  method varchar(20) NOT NULL,
+  daily_demand double NOT NULL,
+  demand_std double NOT NULL,
+  stock_quantity int NOT NULL,
+  days_of_cover double DEFAULT NULL,
+  safety_stock double NOT NULL,
+  reorder_point double NOT NULL,
+  needs_reorder tinyint(1) NOT NULL,
+  computed_at datetime NOT NULL,
+  PRIMARY KEY (component_id),
+  KEY needs_reorder_cover (needs_reorder, days_of_cover)
+)"""
+
+def demand_matrix(component_ids, day_offsets, quantities, ids, days):
+    """Sums sales into a len(ids) x days float32 matrix of units sold per component and day.
+
+    ids must be sorted; row i holds ids[i]. Sales of other components or
+    outside the days are dropped.
+    """
+    matrix = np.zeros((len(ids), days), dtype=np.float32)
+    if not len(ids):
+        return matrix
+    component_ids = np.asarray(component_ids, dtype=np.int64)
+    day_offsets = np.asarray(day_offsets, dtype=np.int64)
+    rows = np.minimum(np.searchsorted(ids, component_ids), len(ids) - 1)
+    valid = (ids[rows] == component_ids) & (day_offsets >= 0) & (day_offsets < days)
+    # Several sales can share a cell, so they are summed per cell before being written
+    cells, inverse = sorted_unique(rows[valid] * days + day_offsets[valid], return_inverse=True)
+    matrix.ravel()[cells] = np.bincount(inverse, weights=np.asarray(quantities, dtype=float)[valid],
+                                        minlength=len(cells))
+    return matrix
+
+def smoothing_weights(days, alpha):
+    """Weights turning a days-long history into its exponentially smoothed level on the last day."""
+    weights = alpha * (1 - alpha) ** np.arange(days - 1, -1, -1, dtype=float)
+    # The level starts at the first day's demand
+    weights[0] = (1 - alpha) ** (days - 1)
+    return weights.astype(np.float32)
+
+def forecast_demand(matrix, method="ses", window=WINDOW_DAYS, alpha=ALPHA):
+    """Returns (daily demand forecast, daily demand standard deviation) for every row of matrix.
+
+    "ses" is simple exponential smoothing, computed for all rows at once as one
+    matrix-vector product; "ma" is the mean of the last window days. The spread
+    is taken over the last window days either way.
+    """
+    recent = matrix[:, -window:]
+    if method == "ma":
+        daily_demand = recent.mean(axis=1, dtype=float)
+    elif method == "ses":
+        daily_demand = (matrix @ smoothing_weights(matrix.shape[1], alpha)).astype(float)
+    else:
+        raise ValueError(f"Unknown forecast method {method}, expected 'ses' or 'ma'")
+    return daily_demand, recent.std(axis=1, dtype=float)
+
+def forecast_rows(matrix, rows, method, window, alpha):
+    """Forecasts a block of rows; the unit of work of the process pool."""
+    return rows, forecast_demand(matrix, method, window, alpha)
+
+def forecast_by_category(matrix, categories, method="ses", window=WINDOW_DAYS, alpha=ALPHA, processes=None):
+    """forecast_demand over a process pool, one task per category.
+
+    Every category's rows are copied to a worker, so this only pays off when
+    the matrix is large and there are cores to spare.
+    """
+    daily_demand = np.empty(len(matrix))
+    demand_std = np.empty(len(matrix))
+    names, codes = np.unique(np.asarray(categories, dtype=str), return_inverse=True)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(forecast_rows, matrix[rows], rows, method, window, alpha)
+                   for rows in (np.flatnonzero(codes == code) for code in range(len(names)))]
+        for future in futures:
+            rows, (demand, std) = future.result()
+            daily_demand[rows] = demand
+            demand_std[rows] = std
+    return daily_demand, demand_std
+
+def reorder_points(daily_demand, demand_std, stock, lead_time=LEAD_TIME_DAYS, service_z=SERVICE_Z):
+    """Returns (days of cover, safety stock, reorder point, needs reorder) per component.
+
+    Days of cover is NaN for components without forecast demand.
+    """
+    stock = np.asarray(stock, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(daily_demand > 0, stock / daily_demand, np.nan)
+    safety_stock = service_z * demand_std * np.sqrt(lead_time)
+    reorder_point = daily_demand * lead_time + safety_stock
+    return days_of_cover, safety_stock, reorder_point, (stock <= reorder_point) & (daily_demand > 0)
+
+def latest_sale_date(cursor):
+    cursor.execute("SELECT MAX(period_start) FROM sales_rollup_component WHERE period = 'day'")
+    return cursor.fetchone()[0]
+
+def read_inventory(cursor):
+    """Returns (ids, categories, stock) of every component, sorted by id."""
+    cursor.execute("SELECT id, COALESCE(category, ''), COALESCE(stock_quantity, 0) FROM inventory ORDER BY id")
+    rows = cursor.fetchall()
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    categories = np.array([row[1] for row in rows], dtype=object)
+    return ids, categories, np.array([row[2] for row in rows], dtype=float)
+
+def read_daily_demand(cursor, ids, as_of, days=HISTORY_DAYS, batch_size=100000):
+    """Builds the demand matrix of the days up to as_of from the daily sales rollups."""
+    start = as_of - datetime.timedelta(days=days - 1)
+    cursor.execute("SELECT component_id, DATEDIFF(period_start, %s), quantity_sold FROM sales_rollup_component "
+                   "WHERE period = 'day' AND period_start BETWEEN %s AND %s", (start, start, as_of))
+    batches = []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        batches.append(np.array(rows, dtype=np.int64))
+    sales = np.concatenate(batches) if batches else np.empty((0, 3), dtype=np.int64)
+    return demand_matrix(sales[:, 0], sales[:, 1], sales[:, 2], ids, days)
+
+def ensure_forecast_table(cursor):
+    cursor.execute(FORECAST_TABLE)
+
+def write_forecasts(cursor, connection, as_of, method, ids, categories, stock, daily_demand, demand_std,
+                    days_of_cover, safety_stock, reorder_point, needs_reorder, batch_size=WRITE_BATCH):
+    """Replaces the demand_forecast rows with this run's results in one transaction."""
+    computed_at = datetime.datetime.now().replace(microsecond=0)
+    columns = ("component_id", "category", "as_of", "method", "daily_demand", "demand_std", "stock_quantity",
+               "days_of_cover", "safety_stock", "reorder_point", "needs_reorder", "computed_at")
+    sql = (f"INSERT INTO demand_forecast ({','.join(columns)}) VALUES ({','.join(['%s'] * len(columns))}) AS new "
+           f"ON DUPLICATE KEY UPDATE {', '.join(f'{column} = new.{column}' for column in columns[1:])}")
+    rows = [
+        (int(component_id), category or None, as_of, method, float(demand), float(std), int(quantity),
+         None if np.isnan(cover) else float(cover), float(safety), float(point), int(reorder), computed_at)
+        for component_id, category, quantity, demand, std, cover, safety, point, reorder in zip(
+            ids, categories, stock, daily_demand, demand_std, days_of_cover, safety_stock, reorder_point,
+            needs_reorder)
+    ]
+    try:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[start:start + batch_size])
+        # Components deleted since the last run
+        cursor.execute("DELETE FROM demand_forecast WHERE computed_at < %s", (computed_at,))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return len(rows)
+
+def run_forecast(connection, method="ses", as_of=None, days=HISTORY_DAYS, processes=None):
+    """Forecasts every component from the sales rollups and stores the results in demand_forecast.
+
+    as_of defaults to the last day with sales. With processes, categories are
+    forecast in parallel over that many processes. Returns the rows written.
+    """
+    cursor = connection.cursor()
+    try:
+        ensure_forecast_table(cursor)
+        as_of = as_of or latest_sale_date(cursor)
+        if as_of is None:
+            print("No daily sales rollups to forecast from, run the rollup backfill first")
+            return 0
+
+        started = time.perf_counter()
+        ids, categories, stock = read_inventory(cursor)
+        matrix = read_daily_demand(cursor, ids, as_of, days)
+        read_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if processes:
+            daily_demand, demand_std = forecast_by_category(matrix, categories, method, processes=processes)
+        else:
+            daily_demand, demand_std = forecast_demand(matrix, method)
+        days_of_cover, safety_stock, reorder_point, needs_reorder = reorder_points(daily_demand, demand_std, stock)
+        forecast_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        rows = write_forecasts(cursor, connection, as_of, method, ids, categories, stock, daily_demand, demand_std,
+                               days_of_cover, safety_stock, reorder_point, needs_reorder)
+    finally:
+        cursor.close()
+    print(f"Forecast {rows} components as of {as_of} ({int(needs_reorder.sum())} to reorder): "
+          f"read {read_s:.2f} s, forecast {forecast_s:.2f} s, write {time.perf_counter() - started:.2f} s")
+    return rows
+
+def reorder_list(cursor, category=None, limit=50):
+    """Returns (component id, category, stock, days of cover, reorder point) of the components to reorder first."""
+    conditions = "needs_reorder = 1"
+    args = []
+    if category is not None:
+        conditions += " AND category = %s"
+        args.append(category)
+    cursor.execute(f"SELECT component_id, category, stock_quantity, days_of_cover, reorder_point "
+                   f"FROM demand_forecast WHERE {conditions} ORDER BY days_of_cover LIMIT %s",
+                   tuple(args) + (int(limit),))
+    return cursor.fetchall()
+
+if __name__ == "__main__":
+    # python satellite_components_forecasting.py [--moving-average] [--processes N]
+    from satellite_components_data_to_mysql import db_config
+
+    processes = int(sys.argv[sys.argv.index("--processes") + 1]) if "--processes" in sys.argv else None
+    connection = mysql.connector.connect(**db_config)
+    try:
+        run_forecast(connection, "ma" if "--moving-average" in sys.argv else "ses", processes=processes)
+    finally:
+        connection.close()
@@ -0,0 +1,61 @@
+from satellite_components_forecasting import (ALPHA, HISTORY_DAYS, LEAD_TIME_DAYS, SERVICE_Z, WINDOW_DAYS,
+                                              demand_matrix, forecast_demand, reorder_points)
+import numpy as np
+import math
+import sys
+import time
+
+def synthetic_sales(components, days, seed=0):
+    """Intermittent daily demand: each component sells on a random share of days, in Poisson sized orders."""
+    rng = np.random.default_rng(seed)
+    selling = rng.beta(0.5, 4, components)  # Share of days with at least one sale
+    sales_per_component = rng.binomial(days, selling)
+    component_ids = np.repeat(np.arange(1, components + 1, dtype=np.int64), sales_per_component)
+    day_offsets = rng.integers(0, days, len(component_ids))
+    quantities = rng.poisson(rng.lognormal(1, 0.8, components)[component_ids - 1]) + 1
+    return component_ids, day_offsets, quantities, rng.integers(0, 500, components)
+
+def forecast_one(history, stock, method):
+    """The per-component loop the engine replaces: plain Python over one component's days."""
+    recent = history[-WINDOW_DAYS:]
+    if method == "ma":
+        demand = sum(recent) / len(recent)
+    else:
+        demand = history[0]
+        for quantity in history[1:]:
+            demand = ALPHA * quantity + (1 - ALPHA) * demand
+    mean = sum(recent) / len(recent)
+    std = math.sqrt(sum((quantity - mean) ** 2 for quantity in recent) / len(recent))
+    reorder_point = demand * LEAD_TIME_DAYS + SERVICE_Z * std * math.sqrt(LEAD_TIME_DAYS)
+    return demand, std, reorder_point, stock <= reorder_point and demand > 0
+
+def benchmark_forecasting(components=100000, days=HISTORY_DAYS, loop_components=1000):
+    """Times the matrix build and the forecasts over components x days, against a per-component loop."""
+    component_ids, day_offsets, quantities, stock = synthetic_sales(components, days)
+    ids = np.arange(1, components + 1, dtype=np.int64)
+    print(f" {components} components, {days} days, {len(component_ids)} daily sales")
+
+    started = time.perf_counter()
+    matrix = demand_matrix(component_ids, day_offsets, quantities, ids, days)
+    print(f" Demand matrix built in {time.perf_counter() - started:.2f} s, {matrix.nbytes / 1e6:.0f} MB")
+
+    for method in ("ses", "ma"):
+        started = time.perf_counter()
+        daily_demand, demand_std = forecast_demand(matrix, method)
+        days_of_cover, safety_stock, reorder_point, needs_reorder = reorder_points(daily_demand, demand_std, stock)
+        vectorized_s = time.perf_counter() - started
+
+        # Same answers as the loop, which is timed on a sample and scaled up
+        history = matrix[:loop_components].astype(float).tolist()
+        started = time.perf_counter()
+        expected = [forecast_one(row, quantity, method) for row, quantity in zip(history, stock)]
+        loop_s = (time.perf_counter() - started) * components / loop_components
+        assert np.allclose([row[0] for row in expected], daily_demand[:loop_components], rtol=1e-4, atol=1e-4)
+        assert np.allclose([row[2] for row in expected], reorder_point[:loop_components], rtol=1e-4, atol=1e-4)
+
+        print(f" {method:<4} vectorized {vectorized_s:>7.2f} s   per-component loop ~{loop_s:>7.1f} s   "
+              f"{int(needs_reorder.sum())} to reorder")
+
+if __name__ == "__main__":
+    # Optional argument: number of components (default 100,000)
+    benchmark_forecasting(components=int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,129 @@
+from satellite_components_data_to_mysql import db_config, has_natural_key, load_csv_to_mysql
+from satellite_components_sales_rollups import ensure_sales_rollups
+import mysql.connector
+import pandas as pd
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARK_DATABASE = "SATELLITE_INVENTORY_BENCHMARK"
+
+# Table -> CSV in this repository, loaded in foreign key order
+TABLE_FILES = [
+    ("inventory", "satellite_electronic_component.csv"),
+    ("alternative_components", "alternative_components _satellite.csv"),
+    ("sales", "electronic_component_sales.csv"),
+]
+# Filled by the sales triggers and loaders, so they are emptied along with the data before every mode
+ROLLUP_TABLES = ("sales_rollup_component", "sales_rollup_category", "sales_rollup_delta")
+# Columns holding inventory ids, shifted so each copy of a file refers to its own copy of the inventory
+COMPONENT_ID_COLUMNS = ("component_id", "original_component_id", "alternative_component_id")
+
+def connect_benchmark_database():
+    """Creates an empty copy of the inventory schema in a scratch database and connects to it.
+
+    The sales rollup tables and triggers are in place before the first mode,
+    so every mode loads into the same schema.
+    """
+    connection = mysql.connector.connect(**db_config)
+    cursor = connection.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {BENCHMARK_DATABASE}")
+    for table_name in [table_name for table_name, _ in TABLE_FILES] + list(ROLLUP_TABLES):
+        cursor.execute(f"DROP TABLE IF EXISTS {BENCHMARK_DATABASE}.{table_name}")
+    for table_name, _ in TABLE_FILES:
+        cursor.execute(f"CREATE TABLE {BENCHMARK_DATABASE}.{table_name} LIKE {db_config['database']}.{table_name}")
+    cursor.close()
+    connection.close()
+
+    connection = mysql.connector.connect(**dict(db_config, database=BENCHMARK_DATABASE))
+    cursor = connection.cursor()
+    ensure_sales_rollups(cursor)
+    cursor.close()
+    return connection
+
+def scaled_csv(file_path, scale, directory, components):
+    """Writes file_path repeated scale times, keeping ids and natural keys unique across the copies.
+
+    components is the number of rows in one copy of the inventory, whose ids
+    follow file order after a truncate.
+    """
+    df = pd.read_csv(file_path)
+    copies = []
+    for copy in range(scale):
+        part = df.copy()
+        if "id" in part.columns:
+            part["id"] += copy * int(df["id"].max())
+        if "component_name" in part.columns and copy:
+            part["component_name"] += f" #{copy + 1}"
+        for column in COMPONENT_ID_COLUMNS:
+            if column in part.columns:
+                part[column] += copy * components
+        copies.append(part)
+    path = os.path.join(directory, os.path.basename(file_path))
+    pd.concat(copies).to_csv(path, index=False)
+    return path
+
+def load_row_by_row(file_path, table_name, connection):
+    """The original loader: one INSERT round-trip per row from df.iterrows().
+
+    Rows repeating a natural key are skipped, as load_csv_to_mysql does.
+    """
+    cursor = connection.cursor()
+    df = pd.read_csv(file_path)
+    columns = ",".join(df.columns)
+    ignore = "IGNORE " if has_natural_key(table_name) else ""
+    rows = 0
+    for _, row in df.iterrows():
+        values = ",".join(["%s"] * len(row))
+        sql = f"INSERT {ignore}INTO {table_name} ({columns}) VALUES ({values})"
+        cursor.execute(sql, tuple(value.item() if hasattr(value, "item") else value for value in row))
+        rows += cursor.rowcount
+    connection.commit()
+    cursor.close()
+    return rows
+
+def truncate_tables(connection):
+    cursor = connection.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+    for table_name in [table_name for table_name, _ in TABLE_FILES] + list(ROLLUP_TABLES):
+        cursor.execute(f"TRUNCATE TABLE {table_name}")
+    cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+    cursor.close()
+
+def benchmark_loaders(scale=20, batch_sizes=(100, 1000, 5000), commit_every=10000):
+    """Loads each table in every mode and prints rows/sec; returns (mode, table, rows, seconds) tuples."""
+    base_directory = os.path.dirname(os.path.abspath(__file__))
+    connection = connect_benchmark_database()
+    modes = [("row_by_row", None)]
+    modes += [(f"executemany/{batch_size}", {'batch_size': batch_size}) for batch_size in batch_sizes]
+    modes.append(("load_data", {'use_load_data': True}))
+    results = []
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            components = len(pd.read_csv(os.path.join(base_directory, dict(TABLE_FILES)["inventory"])))
+            files = [(table_name, scaled_csv(os.path.join(base_directory, file_name), scale, directory, components))
+                     for table_name, file_name in TABLE_FILES]
+
+            for mode, options in modes:
+                truncate_tables(connection)
+                for table_name, file_path in files:
+                    started = time.perf_counter()
+                    if options is None:
+                        rows = load_row_by_row(file_path, table_name, connection)
+                    else:
+                        rows = load_csv_to_mysql(file_path, table_name, commit_every=commit_every,
+                                                 connection=connection, **options)
+                    results.append((mode, table_name, rows, time.perf_counter() - started))
+    finally:
+        connection.close()
+
+    print(f" {'mode':<18} {'table':<24} {'rows':>8} {'seconds':>8} {'rows/s':>10}")
+    for mode, table_name, rows, seconds in results:
+        print(f" {mode:<18} {table_name:<24} {rows:>8} {seconds:>8.2f} {rows / seconds if seconds else 0:>10.0f}")
+    return results
+
+if __name__ == "__main__":
+    # Optional argument: how many times to repeat each CSV (default 20, i.e. 10,000 rows per table)
+    benchmark_loaders(scale=int(sys.argv[1]) if len(sys.argv) > 1 else 20)
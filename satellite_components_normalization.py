@@ -0,0 +1,283 @@
+from functools import lru_cache
+import json
+import re
+import sys
+
+# Canonical parameters: (key, display name used in scraped records, default unit, other spellings).
+# The default unit applies to values that carry no unit of their own, e.g. "0 to 90" beamwidths.
+PARAMETERS = [
+    ("segment", "Segment", None, ()),
+    ("type", "Type", None, ("Product Type",)),
+    ("polarization", "Polarization", None, ()),
+    ("deployment", "Deployment", None, ()),
+    ("tx_frequency", "Tx Frequency", "Hz", ("Transmit Frequency",)),
+    ("rx_frequency", "Rx Frequency", "Hz", ("Receive Frequency",)),
+    ("tx_gain", "Tx Gain", "dB", ("Transmit Gain",)),
+    ("rx_gain", "Rx Gain", "dB", ("Receive Gain",)),
+    ("axial_ratio", "Axial Ratio", "dB", ()),
+    ("cross_polarization_on_axis", "Cross Polarization on Axis", "dB", ()),
+    ("horizontal_beamwidth", "Horizontal Beam Width", "deg", ("Horizontal Beamwidth",)),
+    ("noise_temperature", "Noise Temperature", "K", ("Noise Temp",)),
+    ("reflector", "Reflector", "m", ()),
+    ("vertical_beamwidth", "Vertical Bandwidth", "deg", ("Vertical Beamwidth",)),
+    ("vswr", "VSWR", "ratio", ()),
+    ("wind_rating", "Wind Rating", "m/s", ("Wind rating",)),
+    ("isolation", "Isolation", "dB", ()),
+    ("mounting", "Mounting", None, ()),
+    ("weight", "Weight", "kg", ()),
+    ("dimension", "Dimension", "m", ("Dimensions",)),
+    ("operating_temperature", "Operating Temperature", "degC", ("Operating Temp",)),
+    ("application", "Application", None, ()),
+    ("input_bandwidth", "Input Bandwidth", "Hz", ("Bandwidth",)),
+    ("power_consumption", "Power Consumption", "W", ("Power",)),
+    ("supply_voltage", "Supply Voltage", "V", ("Voltage",)),
+    ("inductance", "Inductance", "H", ()),
+    ("dc_resistance", "DC Resistance", "ohm", ("DCR",)),
+    ("rated_current", "Rated Current", "A", ()),
+    ("saturation_current", "Saturation Current", "A", ()),
+    ("self_resonant_frequency", "Self Resonant Frequency", "Hz", ("SRF",)),
+    ("radiation_hardness", "Radiation Hardness", "Gy", ("Total Ionizing Dose", "TID")),
+]
+
+# Unit spelling -> (SI unit, scale, offset); value_si = value * scale + offset
+UNITS = {
+    "THz": ("Hz", 1e12, 0), "GHz": ("Hz", 1e9, 0), "MHz": ("Hz", 1e6, 0), "kHz": ("Hz", 1e3, 0), "Hz": ("Hz", 1, 0),
+    "ghz": ("Hz", 1e9, 0), "mhz": ("Hz", 1e6, 0), "khz": ("Hz", 1e3, 0), "hz": ("Hz", 1, 0),
+    "Gbps": ("bit/s", 1e9, 0), "Mbps": ("bit/s", 1e6, 0), "kbps": ("bit/s", 1e3, 0), "bps": ("bit/s", 1, 0),
+    "kW": ("W", 1e3, 0), "W": ("W", 1, 0), "mW": ("W", 1e-3, 0), "uW": ("W", 1e-6, 0), "µW": ("W", 1e-6, 0),
+    "kV": ("V", 1e3, 0), "V": ("V", 1, 0), "mV": ("V", 1e-3, 0), "VDC": ("V", 1, 0), "Vdc": ("V", 1, 0),
+    "A": ("A", 1, 0), "mA": ("A", 1e-3, 0), "uA": ("A", 1e-6, 0), "µA": ("A", 1e-6, 0), "μA": ("A", 1e-6, 0),
+    "MΩ": ("ohm", 1e6, 0), "kΩ": ("ohm", 1e3, 0), "mΩ": ("ohm", 1e-3, 0), "Ω": ("ohm", 1, 0),
+    "Ohms": ("ohm", 1, 0), "Ohm": ("ohm", 1, 0), "ohms": ("ohm", 1, 0), "ohm": ("ohm", 1, 0),
+    "mOhms": ("ohm", 1e-3, 0), "mOhm": ("ohm", 1e-3, 0), "kOhms": ("ohm", 1e3, 0), "kOhm": ("ohm", 1e3, 0),
+    "H": ("H", 1, 0), "mH": ("H", 1e-3, 0), "uH": ("H", 1e-6, 0), "µH": ("H", 1e-6, 0), "μH": ("H", 1e-6, 0),
+    "nH": ("H", 1e-9, 0),
+    "F": ("F", 1, 0), "mF": ("F", 1e-3, 0), "uF": ("F", 1e-6, 0), "µF": ("F", 1e-6, 0), "nF": ("F", 1e-9, 0),
+    "pF": ("F", 1e-12, 0),
+    "kg": ("kg", 1, 0), "g": ("kg", 1e-3, 0), "mg": ("kg", 1e-6, 0), "lbs": ("kg", 0.45359237, 0),
+    "lb": ("kg", 0.45359237, 0), "oz": ("kg", 0.028349523125, 0),
+    "km": ("m", 1e3, 0), "m": ("m", 1, 0), "meters": ("m", 1, 0), "meter": ("m", 1, 0), "cm": ("m", 1e-2, 0),
+    "mm": ("m", 1e-3, 0), "in": ("m", 0.0254, 0), "inches": ("m", 0.0254, 0), '"': ("m", 0.0254, 0),
+    "ft": ("m", 0.3048, 0),
+    "mph": ("m/s", 0.44704, 0), "kph": ("m/s", 1 / 3.6, 0), "km/h": ("m/s", 1 / 3.6, 0), "m/s": ("m/s", 1, 0),
+    "K": ("K", 1, 0),
+    "°C": ("K", 1, 273.15), "Degree C": ("K", 1, 273.15), "Degrees C": ("K", 1, 273.15),
+    "deg C": ("K", 1, 273.15), "degC": ("K", 1, 273.15), "°F": ("K", 5 / 9, 255.3722222222222),
+    "krad": ("Gy", 10, 0), "rad": ("Gy", 0.01, 0), "kGy": ("Gy", 1e3, 0), "Gy": ("Gy", 1, 0),
+    "dBic": ("dBic", 1, 0), "dBi": ("dBi", 1, 0), "dBm": ("dBm", 1, 0), "dBW": ("dBW", 1, 0),
+    "dB/K": ("dB/K", 1, 0), "dBc": ("dBc", 1, 0), "dB": ("dB", 1, 0),
+    "%": ("%", 1, 0),
+    "°": ("deg", 1, 0), "deg": ("deg", 1, 0), "degrees": ("deg", 1, 0), "Degrees": ("deg", 1, 0),
+    "Degree": ("deg", 1, 0),
+    ":1": ("ratio", 1, 0),
+    "ms": ("s", 1e-3, 0), "us": ("s", 1e-6, 0), "ns": ("s", 1e-9, 0), "s": ("s", 1, 0),
+}
+
+# A bare degree sign means Celsius on temperature parameters and an angle everywhere else
+TEMPERATURE_DEGREES = {"°": "°C", "deg": "deg C", "degrees": "Degrees C", "Degrees": "Degrees C", "Degree": "Degree C"}
+
+# Placeholders the scraper writes for fields a page does not have
+MISSING = ("", "N/A")
+
+# Frequency band labels, as in "5.85 to 6.425 GHz(C)"
+BANDS = ("HF", "VHF", "UHF", "SHF", "EHF", "L", "S", "C", "X", "Ku", "K", "Ka", "Q", "V", "W", "E")
+
+NUMBER = r"[-+−]?\d+(?:\.\d+)?(?:\s+\d+/\d+)?"
+QUANTITY_PATTERN = re.compile(
+    r"(?P<plus_minus>±|\+/-|\+-)?\s*(?P<low>" + NUMBER + r")"
+    r"(?:\s*(?:to|-|–|~)\s*(?P<high>" + NUMBER + r"))?"
+    r"\s*(?P<unit>" + "|".join(re.escape(unit) for unit in sorted(UNITS, key=len, reverse=True)) + r")?"
+    r"(?![A-Za-z])"
+    r"(?:\s*\(\s*(?P<band>" + "|".join(sorted(BANDS, key=len, reverse=True)) + r")\s*\))?"
+)
+# Parenthesised alternatives such as "(80.5 kg)" repeat the value in other units
+ALTERNATIVE_PATTERN = re.compile(r"\([^()]*\d[^()]*(?:\)|$)")
+
+def alias_key(name):
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", name.lower()).split())
+
+PARAMETER_BY_ALIAS = {
+    alias_key(alias): (key, display_name, default_unit)
+    for key, display_name, default_unit, aliases in PARAMETERS
+    for alias in (key, display_name) + aliases
+}
+
+# Keys of the older lblValues layout come out of its line parser with part of the value still attached
+GLUED_KEY_PATTERN = re.compile(
+    r"^(" + "|".join(
+        re.escape(alias).replace(r"\ ", r"\s+")
+        for alias in sorted({alias for _, name, _, aliases in PARAMETERS for alias in (name,) + aliases},
+                            key=len, reverse=True)
+    ) + r")\s+(\S.*)$",
+    re.IGNORECASE,
+)
+
+def lookup_parameter(name):
+    """Returns (key, display name, default unit) for a spec key in any known spelling, or None."""
+    return PARAMETER_BY_ALIAS.get(alias_key(name))
+
+def canonical_key(name):
+    """Returns the canonical snake_case key for a spec key, deriving one for unknown keys."""
+    parameter = lookup_parameter(name)
+    return parameter[0] if parameter else alias_key(name).replace(" ", "_")
+
+def split_glued_parameters(parameters):
+    """Moves value text glued onto known keys back into the value.
+
+    e.g. {"Tx Frequency 5.85 to 14.5": "GHz(Ku)"} -> {"Tx Frequency": "5.85 to 14.5 GHz(Ku)"}
+    """
+    split = {}
+    for name, value in parameters.items():
+        match = None if lookup_parameter(name) else GLUED_KEY_PATTERN.match(name.strip())
+        if match:
+            name, value = " ".join(match.group(1).split()), f"{match.group(2)} {value}".strip()
+        split[name] = value
+    return split
+
+def to_number(text):
+    """Converts "-12.5" or a mixed fraction such as "13 1/2" to a float."""
+    parts = text.replace("−", "-").split()
+    number = float(parts[0])
+    if len(parts) > 1:
+        numerator, denominator = parts[1].split("/")
+        number += (-1 if number < 0 else 1) * float(numerator) / float(denominator)
+    return number
+
+@lru_cache(maxsize=65536)
+def parse_value(value, default_unit=None, temperature=False):
+    """Parses a spec value into {'min', 'max', 'unit', 'bands'} in SI units, or None without numbers.
+
+    Results are cached and shared between callers, so they must not be modified.
+
+    The unit of the first quantity decides which quantities count; quantities
+    without a unit take the next unit in the value, then the previous one,
+    then default_unit.
+    """
+    if not isinstance(value, str):
+        return None
+    text = ALTERNATIVE_PATTERN.sub(" ", value)
+
+    quantities = []
+    for match in QUANTITY_PATTERN.finditer(text):
+        low = to_number(match.group("low"))
+        high = to_number(match.group("high")) if match.group("high") else low
+        if match.group("plus_minus"):
+            low, high = -abs(low), abs(low)
+        quantities.append([low, high, match.group("unit"), match.group("band")])
+    if not quantities:
+        return None
+
+    # Fill in missing units from the quantities that follow, then from those before
+    following = None
+    for quantity in reversed(quantities):
+        if quantity[2] is None:
+            quantity[2] = following
+        else:
+            following = quantity[2]
+    previous = default_unit
+    for quantity in quantities:
+        if quantity[2] is None:
+            quantity[2] = previous
+        previous = quantity[2]
+
+    low = high = si_unit = None
+    bands = []
+    for quantity_low, quantity_high, unit, band in quantities:
+        if temperature and unit in TEMPERATURE_DEGREES:
+            unit = TEMPERATURE_DEGREES[unit]
+        si, scale, offset = UNITS.get(unit, (unit, 1, 0))
+        if si_unit is None:
+            si_unit = si
+        elif si != si_unit:
+            continue
+        values = (quantity_low * scale + offset, quantity_high * scale + offset)
+        low = min(values) if low is None else min(low, *values)
+        high = max(values) if high is None else max(high, *values)
+        if band and band not in bands:
+            bands.append(band)
+    return {'min': low, 'max': high, 'unit': si_unit, 'bands': tuple(bands)}
+
+def normalize_parameter(name, value):
+    """Returns (canonical key, parsed value or None) for one spec key and value."""
+    parameter = lookup_parameter(name)
+    if parameter is None:
+        return canonical_key(name), parse_value(value)
+    key, _, default_unit = parameter
+    return key, parse_value(value, default_unit, default_unit == "degC")
+
+def normalize_products(products, split_glued=True):
+    """Flattens a batch of scraped records into rows of canonical, numeric columns.
+
+    Each spec parameter becomes <key> (the original text), plus <key>_min,
+    <key>_max, <key>_unit and <key>_bands when its value has numbers in it.
+    Parsed values are cached, so repeats across the batch are parsed once.
+    """
+    rows = []
+    for product in products:
+        row = {
+            'part_number': product.get('Part Number'),
+            'manufacturer': product.get('Manufacturer'),
+            'product_name': product.get('Product Name'),
+        }
+        if 'URL' in product:
+            row['url'] = product['URL']
+
+        parameters = product.get('General Parameters')
+        if isinstance(parameters, dict):
+            if split_glued:
+                parameters = split_glued_parameters(parameters)
+            for name, value in parameters.items():
+                key, parsed = normalize_parameter(name, value)
+                row[key] = value
+                if parsed is not None:
+                    row[f"{key}_min"] = parsed['min']
+                    row[f"{key}_max"] = parsed['max']
+                    row[f"{key}_unit"] = parsed['unit']
+                    row[f"{key}_bands"] = ",".join(parsed['bands']) or None
+        rows.append(row)
+    return rows
+
+def product_key(row):
+    """Returns the URL, part number or product name identifying a normalized record, or None if it has none."""
+    for field in ("url", "part_number", "product_name"):
+        value = row.get(field)
+        if isinstance(value, str) and value.strip() not in MISSING:
+            return value
+    return None
+
+def normalize_column(values, name, unit=None):
+    """Parses one column of values for spec key name; returns parallel lists of SI mins and maxes.
+
+    With unit, values that parse to any other SI unit count as missing.
+    """
+    mins = []
+    maxes = []
+    for value in values:
+        parsed = normalize_parameter(name, value)[1]
+        if parsed and unit and parsed['unit'] != unit:
+            parsed = None
+        mins.append(parsed['min'] if parsed else None)
+        maxes.append(parsed['max'] if parsed else None)
+    return mins, maxes
+
+def normalize_jsonl(input_path, output_path, batch_size=1000):
+    """Normalizes a JSON Lines file of scraped records in batches, writing one row per line."""
+    count = 0
+    with open(input_path, encoding="utf-8") as source, open(output_path, "w", encoding="utf-8") as target:
+        batch = []
+        for line in source:
+            if line.strip():
+                batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                for row in normalize_products(batch):
+                    target.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += len(batch)
+                batch = []
+        for row in normalize_products(batch):
+            target.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += len(batch)
+    print(f" Normalized {count} products into '{output_path}'.")
+    return count
+
+if __name__ == "__main__":
+    normalize_jsonl(*(sys.argv[1:3] or ["electronic_component_data.jsonl", "electronic_component_normalized.jsonl"]))
@@ -0,0 +1,445 @@
+from satellite_components_normalization import MISSING, NUMBER, UNITS, normalize_products, product_key, to_number
+from functools import lru_cache
+from itertools import chain
+import numpy as np
+import json
+import os
+import re
+import sys
+import zlib
+
+TEXT_FIELDS = ("Product Name", "Manufacturer", "Description", "Notes")
+NAME_WEIGHT = 2  # Product name terms count this many times
+K1 = 1.2  # BM25 term frequency saturation
+B = 0.75  # BM25 document length normalization
+MERGE_POSTINGS = 200000  # Postings kept in per-term lists before they are merged into the CSR arrays ...
+MERGE_FRACTION = 0.1  # ... or this fraction of the merged postings, whichever is larger
+INITIAL_CAPACITY = 1024
+DIMENSIONS = 256  # Width of the hashed dense vectors
+
+TOKEN_PATTERN = re.compile(r"\d+(?:\.\d+)?|[^\W\d_]+")
+STOPWORDS = frozenset("a an and are as at by for from in is it of on or the to with".split())
+
+# "under 80 kg", "at least 10 GHz", ">= 5 W": a bound on any spec given in that unit
+UPPER_BOUNDS = ("under", "below", "less than", "at most", "up to", "max", "maximum", "<", "<=")
+CONSTRAINT_PATTERN = re.compile(
+    r"(?<![A-Za-z])(?P<op>(?i:under|below|less than|at most|up to|maximum|max|over|above|more than|at least|"
+    r"minimum|min)|<=|>=|<|>)\s*(?P<number>" + NUMBER + r")\s*"
+    r"(?P<unit>" + "|".join(re.escape(unit) for unit in sorted(UNITS, key=len, reverse=True)) + r")(?![A-Za-z])"
+)
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+def parse_query(query):
+    """Splits a query into its free text and {SI unit: [low, high]} bounds.
+
+    e.g. "Ku-band antenna under 80 kg" -> ("Ku-band antenna", {"kg": [-inf, 80.0]})
+    """
+    bounds = {}
+    for match in CONSTRAINT_PATTERN.finditer(query):
+        unit, scale, offset = UNITS[match.group("unit")]
+        value = to_number(match.group("number")) * scale + offset
+        low_high = bounds.setdefault(unit, [-np.inf, np.inf])
+        if match.group("op").lower() in UPPER_BOUNDS:
+            low_high[1] = min(low_high[1], value)
+        else:
+            low_high[0] = max(low_high[0], value)
+    return " ".join(CONSTRAINT_PATTERN.sub(" ", query).split()), bounds
+
+def product_text(product):
+    """Returns the indexed terms of a scraped record: name (weighted), manufacturer, description, notes, specs."""
+    parts = []
+    for field in TEXT_FIELDS:
+        value = product.get(field)
+        if isinstance(value, str) and value.strip() not in MISSING:
+            parts.extend([value] * (NAME_WEIGHT if field == "Product Name" else 1))
+    parameters = product.get("General Parameters")
+    if isinstance(parameters, dict):
+        for name, value in parameters.items():
+            parts.append(name)
+            if isinstance(value, str) and value.strip() not in MISSING:
+                parts.append(value)
+    return tokenize(" ".join(parts))
+
+@lru_cache(maxsize=262144)
+def token_features(token, dimensions):
+    """Hashes a word and its character trigrams to (vector positions, signs)."""
+    padded = f" {token} "
+    hashes = np.array([zlib.crc32(feature.encode("utf-8"))
+                       for feature in [token] + [padded[i:i + 3] for i in range(len(padded) - 2)]], dtype=np.int64)
+    return hashes % dimensions, np.where(hashes & 0x80000000, 1.0, -1.0)
+
+def hashed_vectors(rows, terms, term_of, weights, count, dimensions):
+    """Adds weights[i] times the hashed features of terms[term_of[i]] to row rows[i]; returns the rows L2 normalized.
+
+    The features are expanded sparsely, so the cost grows with the number of
+    features rather than with count x dimensions.
+    """
+    vectors = np.zeros(count * dimensions)
+    if len(term_of):
+        features = [token_features(term, dimensions) for term in terms]
+        lengths = np.array([len(positions) for positions, _ in features])
+        starts = np.cumsum(lengths) - lengths
+        positions = np.concatenate([positions for positions, _ in features])
+        signs = np.concatenate([signs for _, signs in features])
+        repeats = lengths[term_of]
+        # Feature j of occurrence i sits at starts[term_of[i]] + j
+        picked = np.repeat(starts[term_of] - (np.cumsum(repeats) - repeats), repeats) + np.arange(repeats.sum())
+        vectors = np.bincount(np.repeat(rows, repeats) * dimensions + positions[picked],
+                              weights=signs[picked] * np.repeat(weights, repeats), minlength=count * dimensions)
+    vectors = vectors.reshape(count, dimensions)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+def embed(tokens, dimensions):
+    """A local, model-free dense vector: hashed words and character trigrams, L2 normalized.
+
+    Trigrams let spelling variants such as "antenna" and "antennas" land close together.
+    """
+    return hashed_vectors(np.zeros(len(tokens), dtype=np.int64), tokens, np.arange(len(tokens)),
+                          np.ones(len(tokens)), 1, dimensions)[0]
+
+class CatalogIndex:
+    """Offline BM25 retrieval over the text of scraped products, with optional dense vectors.
+
+    Products are keyed by URL (or part number). Their terms go into an
+    inverted index held as CSR arrays: the postings of term t are
+    posting_docs/posting_tfs[indptr[t]:indptr[t + 1]]. A query scores only the
+    postings of its own terms, with vectorized BM25, so the catalog itself is
+    never read; product() fetches a full record from the catalog file by its
+    byte offset.
+
+    Newly added products go to per-term lists that are merged into the CSR
+    arrays in bulk, as with ComponentSearch. A re-scraped product replaces its
+    earlier document, which stays as a tombstone until the next merge drops
+    its postings.
+
+    With dimensions, each product also gets a hashed dense vector, kept in a
+    memory-mapped file when the index has a directory. Bounds such as
+    "under 80 kg" in a query filter on the parsed spec values.
+    """
+
+    def __init__(self, directory=None, dimensions=0, merge_postings=MERGE_POSTINGS, merge_fraction=MERGE_FRACTION):
+        self.directory = directory
+        self.dimensions = dimensions
+        self.merge_postings = merge_postings
+        self.merge_fraction = merge_fraction
+        self.terms = {}  # Term -> term id
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.posting_docs = np.empty(0, dtype=np.int32)
+        self.posting_tfs = np.empty(0, dtype=np.float32)
+        self.pending = []  # (term ids, docs, term frequencies) per batch added since the last merge, sorted by term
+        self.pending_postings = 0
+        self.size = 0  # Documents, dead ones included
+        self.keys = []  # Document -> key
+        self.docs = {}  # Key -> live document
+        self.titles = []  # Document -> (product name, manufacturer, url)
+        self.sources = []  # Document -> byte offset of its record in catalog_path, or None
+        self.lengths = np.zeros(INITIAL_CAPACITY, dtype=np.float32)
+        self.alive = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self.total_length = 0.0  # Terms in the live documents
+        self.norms = None  # Cached BM25 length normalization per document
+        self.quantities = {}  # SI unit -> ([docs], [mins], [maxes]) of every spec given in that unit
+        self.quantity_arrays = {}
+        self.catalog_path = None
+        self.catalog_offset = 0  # Bytes of catalog_path already indexed
+        self.vectors = None
+        if directory and os.path.exists(os.path.join(directory, "meta.json")):
+            self.load()
+        elif dimensions:
+            self.grow_vectors(INITIAL_CAPACITY)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def grow_vectors(self, capacity):
+        if self.directory is None:
+            grown = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            if self.vectors is not None:
+                grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "vectors.f32")
+        if self.vectors is not None:
+            self.vectors.flush()
+        with open(path, "ab") as f:
+            f.truncate(capacity * self.dimensions * 4)
+        self.vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+
+    def reserve(self, documents):
+        """Grows the per-document arrays so documents more fit, doubling the capacity."""
+        needed = self.size + documents
+        if needed <= len(self.alive):
+            return
+        capacity = max(needed, 2 * len(self.alive))
+        for name in ("lengths", "alive"):
+            grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+        if self.dimensions and len(self.vectors) < needed:
+            self.grow_vectors(capacity)
+
+    def add_products(self, products, sources=None):
+        """Indexes scraped records, replacing earlier ones with the same key; returns how many were indexed.
+
+        Records a delta scrape marked removed drop their product instead.
+        """
+        products = list(products)
+        sources = sources or [None] * len(products)
+        self.reserve(len(products))
+        start = self.size
+        texts = []
+        for product, row, source in zip(products, normalize_products(products), sources):
+            key = product_key(row)
+            if key is None:
+                continue
+            if product.get("Change") == "removed":
+                self.remove(key)
+                continue
+            doc = self.size
+            replaced = self.docs.get(key)
+            if replaced is not None:
+                self.alive[replaced] = False
+                self.total_length -= self.lengths[replaced]
+            tokens = product_text(product)
+            texts.append(tokens)
+            self.lengths[doc] = len(tokens)
+            self.alive[doc] = True
+            self.total_length += len(tokens)
+
+            for name, unit in row.items():
+                if name.endswith("_unit") and unit and row.get(f"{name[:-5]}_min") is not None:
+                    docs, mins, maxes = self.quantities.setdefault(unit, ([], [], []))
+                    docs.append(doc)
+                    mins.append(row[f"{name[:-5]}_min"])
+                    maxes.append(row[f"{name[:-5]}_max"])
+
+            self.docs[key] = doc
+            self.keys.append(key)
+            self.titles.append((row.get("product_name"), row.get("manufacturer"), row.get("url")))
+            self.sources.append(source)
+            self.size += 1
+        added = self.size - start
+        if not added:
+            return 0
+
+        # The whole batch is posted at once: one (term, document) key per token, counted by sorting
+        words = list(chain.from_iterable(texts))
+        batch_terms = {term: local for local, term in enumerate(dict.fromkeys(words))}
+        term_ids = np.array([self.terms.setdefault(term, len(self.terms)) for term in batch_terms], dtype=np.int64)
+        local_ids = np.fromiter(map(batch_terms.__getitem__, words), dtype=np.int64, count=len(words))
+        docs = np.repeat(np.arange(added, dtype=np.int64), [len(tokens) for tokens in texts])
+        keys, tfs = np.unique(local_ids * added + docs, return_counts=True)
+        local_terms, docs = keys // added, keys % added
+        if self.dimensions:
+            self.vectors[start:self.size] = hashed_vectors(docs, list(batch_terms), local_terms, tfs, added,
+                                                           self.dimensions)
+        batch_ids = term_ids[local_terms]
+        order = np.argsort(batch_ids, kind="stable")
+        self.pending.append((batch_ids[order], (docs[order] + start).astype(np.int32), tfs[order].astype(np.float32)))
+        self.pending_postings += len(order)
+
+        self.norms = None
+        self.quantity_arrays = {}
+        if self.pending_postings > max(self.merge_postings, self.merge_fraction * len(self.posting_docs)):
+            self.merge()
+        return added
+
+    def remove(self, key):
+        doc = self.docs.pop(key, None)
+        if doc is not None:
+            self.alive[doc] = False
+            self.total_length -= self.lengths[doc]
+            self.norms = None
+
+    def sync(self, path="electronic_component_data.jsonl", batch_size=1000):
+        """Indexes the records appended to a JSON Lines catalog since the last sync; returns how many.
+
+        A line still being written by a running scraper is left for the next sync.
+        """
+        if path != self.catalog_path or os.path.getsize(path) < self.catalog_offset:
+            # Another file, or this one was rewritten: read it from the start
+            self.catalog_path, self.catalog_offset = path, 0
+        added = 0
+        with open(path, "rb") as f:
+            f.seek(self.catalog_offset)
+            products, sources = [], []
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    products.append(json.loads(line))
+                    sources.append(offset)
+                if len(products) >= batch_size:
+                    added += self.add_products(products, sources)
+                    products, sources = [], []
+            added += self.add_products(products, sources)
+            self.catalog_offset = offset
+        return added
+
+    def merge(self):
+        """Folds the pending postings into the CSR arrays and drops the postings of dead documents."""
+        terms = len(self.terms)
+        counts = np.diff(self.indptr)
+        term_ids = [np.repeat(np.arange(len(counts), dtype=np.int64), counts)]
+        docs = [self.posting_docs]
+        tfs = [self.posting_tfs]
+        for batch_ids, batch_docs, batch_tfs in self.pending:
+            term_ids.append(batch_ids)
+            docs.append(batch_docs)
+            tfs.append(batch_tfs)
+        term_ids, docs, tfs = np.concatenate(term_ids), np.concatenate(docs), np.concatenate(tfs)
+        live = self.alive[docs]
+        term_ids, docs, tfs = term_ids[live], docs[live], tfs[live]
+        # Documents only ever grow, so a stable sort keeps every term's postings in document order
+        order = np.argsort(term_ids, kind="stable")
+        self.posting_docs, self.posting_tfs = docs[order], tfs[order]
+        self.indptr = np.zeros(terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=terms), out=self.indptr[1:])
+        self.pending = []
+        self.pending_postings = 0
+
+    def postings(self, term_id):
+        """Returns (documents, term frequencies) of a term, merged and pending."""
+        start, end = (self.indptr[term_id], self.indptr[term_id + 1]) if term_id + 1 < len(self.indptr) else (0, 0)
+        docs, tfs = [self.posting_docs[start:end]], [self.posting_tfs[start:end]]
+        for batch_ids, batch_docs, batch_tfs in self.pending:
+            start, end = np.searchsorted(batch_ids, [term_id, term_id + 1])
+            docs.append(batch_docs[start:end])
+            tfs.append(batch_tfs[start:end])
+        if len(docs) == 1:
+            return docs[0], tfs[0]
+        return np.concatenate(docs), np.concatenate(tfs)
+
+    def bm25(self, tokens):
+        """Returns the BM25 score of every document for the query tokens."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        live = len(self.docs)
+        if self.norms is None:
+            average = self.total_length / live if live else 1.0
+            self.norms = (K1 * (1 - B + B * self.lengths[:self.size] / max(average, 1e-9))).astype(np.float32)
+        for term in set(tokens):
+            term_id = self.terms.get(term)
+            if term_id is None:
+                continue
+            docs, tfs = self.postings(term_id)
+            # Tombstoned postings count towards df until the next merge
+            df = min(len(docs), live)
+            idf = np.log(1 + (live - df + 0.5) / (df + 0.5))
+            # A document appears once per term, so plain fancy-index addition is safe
+            scores[docs] += idf * tfs * (K1 + 1) / (tfs + self.norms[docs])
+        return scores
+
+    def within_bounds(self, bounds):
+        """Returns a bool per document: does it have a spec in each bound's unit that reaches into the bound."""
+        allowed = np.ones(self.size, dtype=bool)
+        for unit, (low, high) in bounds.items():
+            arrays = self.quantity_arrays.get(unit)
+            if arrays is None:
+                docs, mins, maxes = self.quantities.get(unit, ([], [], []))
+                arrays = self.quantity_arrays[unit] = (np.array(docs, dtype=np.int64), np.array(mins, dtype=float),
+                                                       np.array(maxes, dtype=float))
+            docs, mins, maxes = arrays
+            matching = np.zeros(self.size, dtype=bool)
+            matching[docs[(maxes >= low) & (mins <= high)]] = True
+            allowed &= matching
+        return allowed
+
+    def search(self, query, k=10, dense_weight=0.0):
+        """Returns the top k products for a free text query, best first.
+
+        Each result is a dict with key, score, product_name, manufacturer, url
+        and doc. With dense_weight and dense vectors, the score adds that much
+        cosine similarity to the BM25 score scaled to the best match.
+        """
+        text, bounds = parse_query(query)
+        tokens = tokenize(text)
+        scores = self.bm25(tokens)
+        if dense_weight and self.dimensions and tokens:
+            best = scores.max() if self.size else 0
+            similarity = self.vectors[:self.size] @ embed(tokens, self.dimensions)
+            scores = (scores / best if best > 0 else scores) + dense_weight * similarity
+        candidates = self.alive[:self.size].copy()
+        if bounds:
+            candidates &= self.within_bounds(bounds)
+        if tokens:
+            candidates &= scores > 0
+        candidates = np.flatnonzero(candidates)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            {"key": self.keys[doc], "score": float(scores[doc]), "product_name": self.titles[doc][0],
+             "manufacturer": self.titles[doc][1], "url": self.titles[doc][2], "doc": int(doc)}
+            for doc in candidates
+        ]
+
+    def product(self, doc):
+        """Reads the full scraped record of a document from the catalog file, or None if it was added directly."""
+        source = self.sources[doc]
+        if source is None or self.catalog_path is None:
+            return None
+        with open(self.catalog_path, "rb") as f:
+            f.seek(source)
+            return json.loads(f.readline())
+
+    def save(self):
+        """Writes the index to its directory; the dense vectors are already there."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.merge()
+        np.savez(os.path.join(self.directory, "postings.npz"), indptr=self.indptr, docs=self.posting_docs,
+                 tfs=self.posting_tfs, lengths=self.lengths[:self.size], alive=self.alive[:self.size])
+        if self.vectors is not None:
+            self.vectors.flush()
+        meta = {
+            "dimensions": self.dimensions,
+            "terms": sorted(self.terms, key=self.terms.get),
+            "keys": self.keys,
+            "titles": self.titles,
+            "sources": self.sources,
+            "quantities": self.quantities,
+            "catalog_path": self.catalog_path,
+            "catalog_offset": self.catalog_offset,
+        }
+        # Written aside and renamed, so a crash never leaves a half-written index behind
+        path = os.path.join(self.directory, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def load(self):
+        with open(os.path.join(self.directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with np.load(os.path.join(self.directory, "postings.npz")) as arrays:
+            self.indptr, self.posting_docs, self.posting_tfs = arrays["indptr"], arrays["docs"], arrays["tfs"]
+            lengths, alive = arrays["lengths"], arrays["alive"]
+        self.dimensions = meta["dimensions"]
+        self.terms = {term: term_id for term_id, term in enumerate(meta["terms"])}
+        self.keys = meta["keys"]
+        self.titles = [tuple(title) for title in meta["titles"]]
+        self.sources = meta["sources"]
+        self.quantities = {unit: tuple(values) for unit, values in meta["quantities"].items()}
+        self.catalog_path, self.catalog_offset = meta["catalog_path"], meta["catalog_offset"]
+        self.size = len(self.keys)
+        self.lengths, self.alive = lengths, alive
+        self.docs = {self.keys[doc]: int(doc) for doc in np.flatnonzero(alive)}
+        self.total_length = float(lengths[alive].sum())
+        if self.dimensions:
+            path = os.path.join(self.directory, "vectors.f32")
+            capacity = os.path.getsize(path) // (self.dimensions * 4)
+            self.vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+        self.reserve(INITIAL_CAPACITY)
+
+if __name__ == "__main__":
+    # python satellite_components_retrieval.py <index directory> "<query>" [catalog.jsonl]
+    # Products scraped since the last run are indexed first
+    index = CatalogIndex(sys.argv[1], dimensions=DIMENSIONS)
+    catalog_path = sys.argv[3] if len(sys.argv) > 3 else "electronic_component_data.jsonl"
+    if os.path.exists(catalog_path) and index.sync(catalog_path):
+        index.save()
+    for result in index.search(sys.argv[2], dense_weight=0.5):
+        print(f"{result['score']:8.3f}  {result['product_name']}  ({result['manufacturer']})  {result['url']}")
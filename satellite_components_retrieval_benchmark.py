@@ -0,0 +1,117 @@
+from satellite_components_retrieval import DIMENSIONS, CatalogIndex, parse_query, tokenize
+import numpy as np
+import json
+import os
+import sys
+import tempfile
+import time
+
+PRODUCT_TYPES = ["Antenna", "LNB", "BUC", "Transceiver", "Modem", "Amplifier", "Feed", "Diplexer", "Filter",
+                 "Reflector", "Converter", "Power Supply"]
+BANDS = ["L", "S", "C", "X", "Ku", "Ka"]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def synthetic_products(count, start=0, seed=0):
+    """Scraped-looking records: typed, banded product names, filler description words and a few specs."""
+    rng = np.random.default_rng(seed + start)
+    words = [f"w{i}" for i in range(5000)]
+    manufacturers = [f"Maker{i}" for i in range(300)]
+    products = []
+    for i in range(start, start + count):
+        product_type, band = PRODUCT_TYPES[i % len(PRODUCT_TYPES)], BANDS[rng.integers(len(BANDS))]
+        products.append({
+            "URL": f"https://example.com/product/{i}",
+            "Part Number": f"P{i}",
+            "Product Name": f"{band}-band {product_type} {i}",
+            "Manufacturer": manufacturers[rng.integers(len(manufacturers))],
+            "Description": " ".join(words[j] for j in rng.zipf(1.3, 25) % len(words)) + f" {band}-band {product_type}",
+            "Notes": "N/A",
+            "General Parameters": {
+                "Weight": f"{rng.uniform(0.1, 200):.1f} kg",
+                "Tx Frequency": f"{rng.uniform(1, 30):.2f} to {rng.uniform(30, 40):.2f} GHz({band})",
+                "Power Consumption": f"{rng.uniform(1, 500):.0f} W",
+            },
+        })
+    return products
+
+def write_jsonl(path, products, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for product in products:
+            f.write(json.dumps(product) + "\n")
+
+def scan_catalog(path, query, k=10):
+    """Baseline: parse every record per query and count query terms in its text."""
+    tokens = set(tokenize(parse_query(query)[0]))
+    scored = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            product = json.loads(line)
+            text = tokenize(" ".join(str(value) for value in product.values()))
+            score = sum(token in tokens for token in text)
+            if score:
+                scored.append((score, product["URL"]))
+    return sorted(scored, reverse=True)[:k]
+
+def time_queries(index, queries, **options):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, **options)
+        samples.append((time.perf_counter() - started) * 1e3)
+    return samples
+
+def benchmark_retrieval(products=100000, queries=300, new_products=1000):
+    """Indexes products synthetic records from a JSON Lines file and prints build and query times."""
+    rng = np.random.default_rng(1)
+    workload = []
+    for i in range(queries):
+        product_type, band = PRODUCT_TYPES[i % len(PRODUCT_TYPES)], BANDS[rng.integers(len(BANDS))]
+        workload.append([f"{band}-band {product_type}", f"{band}-band {product_type} under {rng.integers(10, 100)} kg",
+                         f"{product_type.lower()} w{rng.integers(50)} Maker{rng.integers(300)}"][i % 3])
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = os.path.join(directory, "catalog.jsonl")
+        write_jsonl(catalog, synthetic_products(products))
+
+        started = time.perf_counter()
+        index = CatalogIndex(os.path.join(directory, "index"), dimensions=DIMENSIONS)
+        index.sync(catalog)
+        index.merge()
+        print(f" Indexed {len(index)} products in {time.perf_counter() - started:.2f} s, {len(index.terms)} terms, "
+              f"{len(index.posting_docs)} postings")
+
+        results = [("bm25", time_queries(index, workload)),
+                   ("bm25 + dense", time_queries(index, workload, dense_weight=0.5))]
+
+        # New products land in the pending postings and are searchable straight away
+        write_jsonl(catalog, synthetic_products(new_products, start=products), mode="a")
+        started = time.perf_counter()
+        added = index.sync(catalog)
+        print(f" Synced {added} new products in {(time.perf_counter() - started) * 1e3:.0f} ms")
+        results.append(("bm25, unmerged", time_queries(index, workload)))
+
+        started = time.perf_counter()
+        index.save()
+        saved_s = time.perf_counter() - started
+        started = time.perf_counter()
+        index = CatalogIndex(os.path.join(directory, "index"))
+        print(f" Saved in {saved_s:.2f} s, loaded in {time.perf_counter() - started:.2f} s")
+        results.append(("bm25, reloaded", time_queries(index, workload)))
+
+        started = time.perf_counter()
+        for query in workload[:3]:
+            scan_catalog(catalog, query)
+        results.append(("catalog scan", [(time.perf_counter() - started) * 1e3 / 3]))
+        index = None
+
+    print(f" {'engine':<16} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, samples in results:
+        print(f" {name:<16} {percentile(samples, 0.5):>9.2f} {percentile(samples, 0.95):>9.2f}")
+    return results
+
+if __name__ == "__main__":
+    # Optional argument: number of products (default 100,000)
+    benchmark_retrieval(products=int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
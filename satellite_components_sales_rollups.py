@@ -0,0 +1,239 @@
+import mysql.connector
+import sys
+import time
+
+PERIODS = ("day", "week", "month")
+BACKFILL_IDS = 1000000  # sales ids folded into the rollups per transaction by the backfill
+
+# Every sales row counts once per period; weeks start on Monday
+PERIOD_ROWS = " UNION ALL ".join(f"SELECT '{period}' AS period" for period in PERIODS)
+
+ROLLUP_TABLES = [
+    """CREATE TABLE IF NOT EXISTS sales_rollup_component (
+  period enum('day','week','month') NOT NULL,
+  period_start date NOT NULL,
+  component_id int NOT NULL,
+  quantity_sold bigint NOT NULL DEFAULT 0,
+  sales_count int NOT NULL DEFAULT 0,
+  PRIMARY KEY (period, period_start, component_id),
+  KEY component_period (component_id, period, period_start)
+)""",
+    """CREATE TABLE IF NOT EXISTS sales_rollup_category (
+  period enum('day','week','month') NOT NULL,
+  period_start date NOT NULL,
+  category varchar(100) NOT NULL DEFAULT '',
+  quantity_sold bigint NOT NULL DEFAULT 0,
+  sales_count int NOT NULL DEFAULT 0,
+  PRIMARY KEY (period, period_start, category),
+  KEY category_period (category, period, period_start)
+)""",
+    """CREATE TABLE IF NOT EXISTS sales_rollup_delta (
+  id bigint NOT NULL AUTO_INCREMENT,
+  component_id int NOT NULL,
+  sale_date date NOT NULL,
+  quantity_sold bigint NOT NULL,
+  sales_count int NOT NULL,
+  PRIMARY KEY (id)
+)""",
+]
+
+def rollup_sql(source, where="TRUE", quantity="COALESCE(s.quantity_sold, 0)", count="1"):
+    """Returns the statements adding the sales rows of source (aliased s) to both rollup tables.
+
+    quantity and count are the per-row amounts; negative amounts take rows back out.
+    """
+    period_start = ("CASE p.period WHEN 'day' THEN s.sale_date "
+                    "WHEN 'week' THEN s.sale_date - INTERVAL WEEKDAY(s.sale_date) DAY "
+                    "ELSE s.sale_date - INTERVAL (DAYOFMONTH(s.sale_date) - 1) DAY END")
+    statements = []
+    for table, key, key_value, join in (
+        ("sales_rollup_component", "component_id", "s.component_id", ""),
+        ("sales_rollup_category", "category", "COALESCE(i.category, '')",
+         "LEFT JOIN inventory i ON i.id = s.component_id "),
+    ):
+        statements.append(
+            f"INSERT INTO {table} (period, period_start, {key}, quantity_sold, sales_count) "
+            f"SELECT * FROM (SELECT p.period, {period_start} AS period_start, {key_value} AS rollup_key, "
+            f"SUM({quantity}) AS added_quantity, SUM({count}) AS added_sales "
+            f"FROM {source} {join}CROSS JOIN ({PERIOD_ROWS}) p "
+            f"WHERE {where} AND s.component_id IS NOT NULL AND s.sale_date IS NOT NULL "
+            f"GROUP BY p.period, period_start, rollup_key) AS delta "
+            f"ON DUPLICATE KEY UPDATE quantity_sold = quantity_sold + added_quantity, "
+            f"sales_count = sales_count + added_sales"
+        )
+    return statements
+
+def trigger_sql():
+    """Returns {trigger name: CREATE TRIGGER statement} keeping the rollups in step with row-level writes.
+
+    Bulk loaders set @skip_sales_rollups and fold their rows in set-wise instead.
+    """
+    def row(alias):
+        return (f"(SELECT {alias}.component_id AS component_id, {alias}.sale_date AS sale_date, "
+                f"{alias}.quantity_sold AS quantity_sold) AS s")
+
+    added = rollup_sql(row("NEW"))
+    removed = rollup_sql(row("OLD"), quantity="-COALESCE(s.quantity_sold, 0)", count="-1")
+    bodies = {
+        "sales_rollups_insert": ("AFTER INSERT", added),
+        "sales_rollups_update": ("AFTER UPDATE", removed + added),
+        "sales_rollups_delete": ("AFTER DELETE", removed),
+    }
+    return {
+        name: (f"CREATE TRIGGER {name} {event} ON sales FOR EACH ROW BEGIN "
+               f"IF @skip_sales_rollups IS NULL THEN {'; '.join(statements)}; END IF; END")
+        for name, (event, statements) in bodies.items()
+    }
+
+def ensure_sales_rollups(cursor):
+    """Creates the rollup tables and sales triggers on a database created without them."""
+    for statement in ROLLUP_TABLES:
+        cursor.execute(statement)
+    cursor.execute("SHOW TRIGGERS LIKE 'sales'")
+    existing = {row[0] for row in cursor.fetchall()}
+    for name, statement in trigger_sql().items():
+        if name not in existing:
+            cursor.execute(statement)
+
+def defer_sales_rollups(cursor):
+    """Stops the triggers from updating the rollups row by row on this connection."""
+    cursor.execute("SET @skip_sales_rollups = 1")
+
+def resume_sales_rollups(cursor):
+    cursor.execute("SET @skip_sales_rollups = NULL")
+
+def stage_sales_delta(cursor, columns, rows, sign=1):
+    """Queues the rollup change of a batch of sales rows, pre-aggregated per component and day."""
+    component = columns.index("component_id")
+    sale_date = columns.index("sale_date")
+    quantity = columns.index("quantity_sold") if "quantity_sold" in columns else None
+    totals = {}
+    for row in rows:
+        if row[component] is None or row[sale_date] is None:
+            continue
+        key = (row[component], row[sale_date])
+        total = totals.setdefault(key, [0, 0])
+        total[0] += sign * ((row[quantity] or 0) if quantity is not None else 0)
+        total[1] += sign
+    if totals:
+        cursor.executemany("INSERT INTO sales_rollup_delta (component_id, sale_date, quantity_sold, sales_count) "
+                           "VALUES (%s, %s, %s, %s)",
+                           [(component_id, day, total[0], total[1]) for (component_id, day), total in totals.items()])
+    return len(totals)
+
+def stage_sales_merge(cursor, staging, join, same, columns):
+    """Queues the rollup change of merging staging (aliased s) into sales (aliased t), before it is merged.
+
+    join matches staging rows to sales rows and same is true when a matched row
+    is unchanged. Changed rows are taken out at their old values and put back
+    at their new ones; columns missing from staging keep their sales values.
+    """
+    def new(column):
+        return f"s.{column}" if column in columns else f"t.{column}"
+
+    changes = [
+        # Old values of the rows that change
+        ("t.component_id", "t.sale_date", "-COALESCE(t.quantity_sold, 0)", "-1",
+         f"{staging} s JOIN sales t ON {join}", f"NOT ({same})"),
+        # New values of the rows that change or are new
+        (new("component_id"), new("sale_date"), f"COALESCE({new('quantity_sold')}, 0)", "1",
+         f"{staging} s LEFT JOIN sales t ON {join}", f"t.id IS NULL OR NOT ({same})"),
+    ]
+    for component_id, sale_date, quantity, count, source, where in changes:
+        cursor.execute(f"INSERT INTO sales_rollup_delta (component_id, sale_date, quantity_sold, sales_count) "
+                       f"SELECT {component_id}, {sale_date}, SUM({quantity}), SUM({count}) FROM {source} "
+                       f"WHERE ({where}) AND {component_id} IS NOT NULL AND {sale_date} IS NOT NULL "
+                       f"GROUP BY {component_id}, {sale_date}")
+
+def apply_sales_delta(cursor, connection=None):
+    """Folds the queued sales changes into the rollups and clears them; returns the delta rows applied.
+
+    With a connection the change is committed as one transaction. The queued
+    rows are locked until then, so when two appliers run at once the second
+    waits and only sees what the first left behind.
+    """
+    cursor.execute("SELECT MAX(id), COUNT(*) FROM sales_rollup_delta FOR UPDATE")
+    last_id, pending = cursor.fetchone()
+    if last_id is None:
+        return 0
+    for statement in rollup_sql("sales_rollup_delta s", where="s.id <= %s", quantity="s.quantity_sold",
+                                count="s.sales_count"):
+        cursor.execute(statement, (last_id,))
+    cursor.execute("DELETE FROM sales_rollup_delta WHERE id <= %s", (last_id,))
+    if connection is not None:
+        connection.commit()
+    return pending
+
+def backfill_sales_rollups(connection, batch_ids=BACKFILL_IDS):
+    """Rebuilds both rollup tables from the whole sales table, batch_ids sales ids per transaction.
+
+    Run it while nothing else writes to sales, and after recategorising
+    components or deleting them (cascaded deletes fire no triggers).
+    """
+    cursor = connection.cursor()
+    started = time.perf_counter()
+    try:
+        ensure_sales_rollups(cursor)
+        cursor.execute("TRUNCATE TABLE sales_rollup_component")
+        cursor.execute("TRUNCATE TABLE sales_rollup_category")
+        # Queued changes are already part of sales
+        cursor.execute("TRUNCATE TABLE sales_rollup_delta")
+        cursor.execute("SELECT MIN(id), MAX(id) FROM sales")
+        first_id, last_id = cursor.fetchone()
+        if first_id is None:
+            return
+        statements = rollup_sql("sales s", where="s.id BETWEEN %s AND %s")
+        for start in range(first_id, last_id + 1, batch_ids):
+            for statement in statements:
+                cursor.execute(statement, (start, start + batch_ids - 1))
+            connection.commit()
+            print(f"Rolled up sales ids {start} to {min(start + batch_ids - 1, last_id)}")
+    finally:
+        cursor.close()
+    print(f"Sales rollups rebuilt in {time.perf_counter() - started:.2f} s")
+
+def check_period(period):
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period {period}, expected one of {PERIODS}")
+
+def units_sold(cursor, component_id, period="week", start=None, end=None):
+    """Returns (period start, units sold, sales) per period for one component, read from the rollups."""
+    check_period(period)
+    cursor.execute("SELECT period_start, quantity_sold, sales_count FROM sales_rollup_component "
+                   "WHERE component_id = %s AND period = %s AND period_start BETWEEN %s AND %s "
+                   "AND sales_count > 0 ORDER BY period_start",
+                   (component_id, period, start or "1000-01-01", end or "9999-12-31"))
+    return cursor.fetchall()
+
+def category_demand(cursor, period="month", start=None, end=None, category=None):
+    """Returns (period start, category, units sold, sales) per period and category, read from the rollups."""
+    check_period(period)
+    conditions = "period = %s AND period_start BETWEEN %s AND %s AND sales_count > 0"
+    args = [period, start or "1000-01-01", end or "9999-12-31"]
+    if category is not None:
+        conditions += " AND category = %s"
+        args.append(category)
+    cursor.execute(f"SELECT period_start, category, quantity_sold, sales_count FROM sales_rollup_category "
+                   f"WHERE {conditions} ORDER BY period_start, category", tuple(args))
+    return cursor.fetchall()
+
+def top_sellers(cursor, period_start, period="week", limit=10):
+    """Returns the (component id, units sold) best sellers of the period starting at period_start."""
+    check_period(period)
+    cursor.execute("SELECT component_id, quantity_sold FROM sales_rollup_component "
+                   "WHERE period = %s AND period_start = %s ORDER BY quantity_sold DESC LIMIT %s",
+                   (period, period_start, int(limit)))
+    return cursor.fetchall()
+
+if __name__ == "__main__":
+    # Rebuild the rollups from the sales table: python satellite_components_sales_rollups.py backfill
+    from satellite_components_data_to_mysql import db_config
+
+    if sys.argv[1:2] == ["backfill"]:
+        connection = mysql.connector.connect(**db_config)
+        try:
+            backfill_sales_rollups(connection)
+        finally:
+            connection.close()
+    else:
+        print("Usage: python satellite_components_sales_rollups.py backfill")
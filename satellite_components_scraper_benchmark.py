@@ -0,0 +1,326 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+import satellite_components_webscraping as scraper
+from satellite_components_webscraping import (
+    AdaptiveTimeout,
+    PageFetcher,
+    crawl_category_listing,
+    create_driver,
+    create_http_session,
+    extract_product_details,
+    extract_product_details_from_html,
+    product_page_ready,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+import glob
+import os
+import psutil
+import re
+import statistics
+import sys
+import threading
+import time
+import zlib
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_fixtures")
+BENCHMARK_CATEGORY = "power-inductors"
+
+# serial and pooled load pages in Chrome like the default scraper; http never starts a browser
+MODES = ("serial", "pooled", "http")
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """Returns the recorded product pages, keyed by file name, and the listing and empty listing pages."""
+    products = {}
+    for path in sorted(glob.glob(os.path.join(directory, "product_*.html"))):
+        with open(path, "rb") as f:
+            products[os.path.basename(path)] = f.read()
+    with open(os.path.join(directory, "listing.html"), "rb") as f:
+        listing = f.read()
+    with open(os.path.join(directory, "listing_empty.html"), "rb") as f:
+        listing_empty = f.read()
+    return products, listing, listing_empty
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves recorded satnow pages: /products/... and /search/<category>/filters?page=N."""
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/products/"):
+            # Each product URL always gets the same layout
+            pages = server.product_pages
+            body = pages[zlib.crc32(parts.path.encode("utf-8")) % len(pages)]
+        elif parts.path.startswith("/search/"):
+            page = int(parse_qs(parts.query).get("page", ["1"])[0])
+            if page > server.listing_pages:
+                body = server.listing_empty
+            else:
+                # Every page needs its own links, or the crawler takes it for a repeat of the last one
+                body = re.sub(rb'href="(/products/[^"]+)"', rb'href="\1-p%d"' % page, server.listing)
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server(directory=FIXTURES_DIR, listing_pages=20, latency=0.02, port=0):
+    """Starts a local server for the fixtures in a background thread and returns it.
+
+    latency adds a fixed delay to every response to stand in for the network.
+    """
+    products, listing, listing_empty = load_fixtures(directory)
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    server.daemon_threads = True
+    server.product_pages = list(products.values())
+    server.listing = listing
+    server.listing_empty = listing_empty
+    server.listing_pages = listing_pages
+    server.latency = latency
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class TimingCollector:
+    """Keeps the per-page timings PageFetcher reports, in place of a ScrapeMetrics file."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = []
+
+    def record(self, url, timings):
+        with self.lock:
+            self.rows.append(dict(timings))
+
+class MemorySampler:
+    """Samples the RSS of this process and its children (Chrome included) and keeps the peak."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def sample(self):
+        process = psutil.Process()
+        total = 0
+        for member in [process] + process.children(recursive=True):
+            try:
+                total += member.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak = max(self.peak, total)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+        self.sample()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def make_fetcher_factory(mode, workers, collector):
+    """Returns a function creating fetchers for mode, without politeness limits against the local server."""
+    session = create_http_session(pool_size=workers) if mode == "http" else None
+    wait_timeout = AdaptiveTimeout()
+    return session, lambda: PageFetcher(session, wait_timeout, metrics=collector)
+
+def summarize(section, mode, workers, collector, elapsed, cpu_s, peak_bytes):
+    rows = collector.rows
+    latencies = [row.get('total_s', 0) for row in rows]
+    result = {
+        'section': section,
+        'mode': mode,
+        'workers': workers,
+        'pages': len(rows),
+        'errors': sum(1 for row in rows if row.get('status') not in ('ok', 'empty')),
+        'pages_per_s': len(rows) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else 0.0,
+        'p95_ms': percentile(latencies, 0.95) * 1000 if latencies else 0.0,
+        'parse_s': sum(row.get('parse_s', 0) for row in rows),
+        'cpu_s': cpu_s,
+        'peak_mb': peak_bytes / (1024 * 1024),
+    }
+    print(f" {section:<8} {mode:<7} {workers:>3} {result['pages']:>6} {result['errors']:>6} "
+          f"{result['pages_per_s']:>9.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+          f"{result['parse_s']:>8.3f} {result['cpu_s']:>7.2f} {result['peak_mb']:>8.1f}")
+    return result
+
+def benchmark_products(base_url, mode, workers, pages):
+    """Scrapes pages product URLs from the fixture server and returns the summary row."""
+    product_urls = [f"{base_url}/products/{BENCHMARK_CATEGORY}/example-magnetics/11-2058-pi-{i:05d}" for i in range(pages)]
+    collector = TimingCollector()
+    session, make_fetcher = make_fetcher_factory(mode, workers, collector)
+
+    # One fetcher (and at most one Chrome instance) per pool thread, as in the scraper
+    fetchers = []
+    local = threading.local()
+
+    def scrape(url):
+        if not hasattr(local, 'fetcher'):
+            local.fetcher = make_fetcher()
+            fetchers.append(local.fetcher)
+        try:
+            return local.fetcher.scrape(url)
+        except Exception as e:
+            print(f" Error on {url}: {e}")
+            return None
+
+    try:
+        with MemorySampler() as memory:
+            cpu_started = time.process_time()
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(scrape, product_urls))
+            elapsed = time.perf_counter() - started
+            cpu_s = time.process_time() - cpu_started
+    finally:
+        for fetcher in fetchers:
+            fetcher.close()
+        if session is not None:
+            session.close()
+    return summarize("products", mode, workers, collector, elapsed, cpu_s, memory.peak)
+
+def benchmark_listing(base_url, mode, window, listing_pages):
+    """Crawls the fixture server's listing pages with crawl_category_listing and returns the summary row."""
+    collector = TimingCollector()
+    session, make_fetcher = make_fetcher_factory(mode, window, collector)
+    template = scraper.LISTING_URL_TEMPLATE
+    scraper.LISTING_URL_TEMPLATE = base_url + "/search/{category}/filters?page={page}&country=global"
+    try:
+        with MemorySampler() as memory:
+            cpu_started = time.process_time()
+            started = time.perf_counter()
+            links = sum(len(page_links) for _, page_links in crawl_category_listing(
+                BENCHMARK_CATEGORY, window=window, max_pages=listing_pages + window, make_fetcher=make_fetcher))
+            elapsed = time.perf_counter() - started
+            cpu_s = time.process_time() - cpu_started
+    finally:
+        scraper.LISTING_URL_TEMPLATE = template
+        if session is not None:
+            session.close()
+    print(f" {links} product links collected")
+    return summarize("listing", mode, window, collector, elapsed, cpu_s, memory.peak)
+
+def benchmark_extraction(base_url, products, repeat=20, browser=True):
+    """Times extract_product_details_from_html, and the legacy extractor in Chrome, on each fixture layout."""
+    print(f" {'fixture':<30} {'html cpu ms':>12} {'legacy ms':>10}")
+    driver = create_driver() if browser else None
+    try:
+        for name, content in products.items():
+            samples = []
+            for _ in range(repeat):
+                started = time.process_time()
+                extract_product_details_from_html(content)
+                samples.append((time.process_time() - started) * 1000)
+
+            legacy_ms = float('nan')
+            if driver is not None:
+                # The server picks the layout from the URL, so find a URL that serves this fixture
+                index = list(products).index(name)
+                path = next(f"/products/{BENCHMARK_CATEGORY}/fixture/{i}" for i in range(1000)
+                            if zlib.crc32(f"/products/{BENCHMARK_CATEGORY}/fixture/{i}".encode("utf-8")) % len(products) == index)
+                driver.get(base_url + path)
+                WebDriverWait(driver, 30, poll_frequency=0.1).until(product_page_ready)
+                legacy = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    extract_product_details(driver)
+                    legacy.append((time.perf_counter() - started) * 1000)
+                legacy_ms = statistics.median(legacy)
+            print(f" {name:<30} {statistics.median(samples):>12.3f} {legacy_ms:>10.2f}")
+    finally:
+        if driver is not None:
+            driver.quit()
+
+def browser_available():
+    try:
+        create_driver().quit()
+        return True
+    except Exception as e:
+        print(f" Chrome is not available, skipping browser modes: {e}")
+        return False
+
+def run_benchmarks(pages=200, listing_pages=20, workers=4, latency=0.02, modes=MODES, directory=FIXTURES_DIR):
+    """Runs the listing, product and extraction benchmarks against the local fixture server.
+
+    Returns one summary dict per section and mode.
+    """
+    server = start_fixture_server(directory, listing_pages, latency)
+    products = load_fixtures(directory)[0]
+    browser = any(mode != "http" for mode in modes) and browser_available()
+    results = []
+
+    try:
+        print(f" Fixture server at {server.base_url}: {len(products)} product layouts, "
+              f"{listing_pages} listing pages, {latency * 1000:.0f} ms latency")
+        print(f" {'section':<8} {'mode':<7} {'wrk':>3} {'pages':>6} {'errors':>6} {'pages/s':>9} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'parse s':>8} {'cpu s':>7} {'peak MB':>8}")
+        for mode in modes:
+            if mode != "http" and not browser:
+                continue
+            mode_workers = 1 if mode == "serial" else workers
+            results.append(benchmark_listing(server.base_url, mode, mode_workers, listing_pages))
+            results.append(benchmark_products(server.base_url, mode, mode_workers, pages))
+
+        benchmark_extraction(server.base_url, products, browser=browser)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+def record_fixtures(product_urls, listing_url, directory=FIXTURES_DIR):
+    """Saves live satnow pages as fixtures: product_<slug>.html for each product URL and listing.html.
+
+    Product pages whose parameters are rendered client-side are saved from Chrome instead.
+    """
+    os.makedirs(directory, exist_ok=True)
+    session = create_http_session()
+    driver = None
+    try:
+        pages = [(url, "product_" + url.rstrip("/").rsplit("/", 1)[-1] + ".html") for url in product_urls]
+        pages.append((listing_url, "listing.html"))
+        for url, name in pages:
+            content = session.get(url, timeout=scraper.HTTP_TIMEOUT).content
+            if name.startswith("product_") and extract_product_details_from_html(content, require_specs=True) is None:
+                if driver is None:
+                    driver = create_driver()
+                driver.get(url)
+                WebDriverWait(driver, 30, poll_frequency=0.1).until(product_page_ready)
+                content = driver.page_source.encode("utf-8")
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(content)
+            print(f" Recorded {url} -> {name}")
+    finally:
+        session.close()
+        if driver is not None:
+            driver.quit()
+
+if __name__ == "__main__":
+    # "record URL..." refreshes the fixtures from satnow.com; otherwise "[modes...]" runs the benchmarks offline
+    if sys.argv[1:2] == ["record"]:
+        record_fixtures(sys.argv[2:] or scraper.urls[:2],
+                        scraper.LISTING_URL_TEMPLATE.format(category=BENCHMARK_CATEGORY, page=1))
+    else:
+        run_benchmarks(modes=tuple(sys.argv[1:]) or MODES)
@@ -0,0 +1,412 @@
+from satellite_components_normalization import normalize_products, product_key
+import datetime
+import numpy as np
+import json
+
+# Numeric attributes held as float64 columns, each with sorted indexes; missing values are NaN
+NUMERIC_COLUMNS = ("input_bandwidth_hz", "power_consumption_w", "supply_voltage_v", "stock_quantity", "price")
+MERGE_ROWS = 10000  # Unindexed rows scanned linearly before the indexes are rebuilt
+MERGE_FRACTION = 0.05  # ... or this fraction of the indexed rows, whichever is larger
+INITIAL_CAPACITY = 1024
+REFRESH_OVERLAP_S = 60  # Changes this much older than the last read are read again, in case they committed late
+DELETIONS_TABLE = """CREATE TABLE IF NOT EXISTS inventory_deletions (
+  id bigint NOT NULL AUTO_INCREMENT,
+  component_id int NOT NULL,
+  deleted_at timestamp(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (id),
+  KEY deleted_at (deleted_at)
+)"""
+DELETIONS_TRIGGER = ("CREATE TRIGGER inventory_deletions_delete AFTER DELETE ON inventory FOR EACH ROW "
+                     "INSERT INTO inventory_deletions (component_id) VALUES (OLD.id)")
+# Scraped spec key -> (numeric column, SI unit its values must be in to fill it)
+CATALOG_SPECS = {
+    "input_bandwidth": ("input_bandwidth_hz", "Hz"),
+    "power_consumption": ("power_consumption_w", "W"),
+    "supply_voltage": ("supply_voltage_v", "V"),
+}
+
+def ensure_change_tracking(cursor):
+    """Adds the inventory write timestamp and the deleted id log that refresh_inventory reads."""
+    cursor.execute("SHOW COLUMNS FROM inventory LIKE 'updated_at'")
+    if not cursor.fetchall():
+        cursor.execute("ALTER TABLE inventory ADD COLUMN updated_at timestamp(6) NOT NULL "
+                       "DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6), ADD KEY updated_at (updated_at)")
+    cursor.execute(DELETIONS_TABLE)
+    cursor.execute("SHOW TRIGGERS LIKE 'inventory'")
+    if "inventory_deletions_delete" not in {row[0] for row in cursor.fetchall()}:
+        cursor.execute(DELETIONS_TRIGGER)
+
+def parse_bounds(bounds):
+    """Turns min_<column>/max_<column> keyword bounds into {column: [low, high]}."""
+    ranges = {}
+    for name, value in bounds.items():
+        if value is None:
+            continue
+        bound, _, column = name.partition("_")
+        if bound not in ("min", "max") or column not in NUMERIC_COLUMNS:
+            raise ValueError(f"Unknown bound {name}, expected min_ or max_ followed by one of {NUMERIC_COLUMNS}")
+        low_high = ranges.setdefault(column, [-np.inf, np.inf])
+        low_high[0 if bound == "min" else 1] = float(value)
+    return ranges
+
+class ComponentSearch:
+    """Parametric component search over NumPy column arrays.
+
+    Rows live in growable column arrays keyed by an arbitrary hashable key
+    (the inventory id, or ("catalog", url) for scraped products). Each
+    category has a bitmap, and each numeric column has a sorted index over all
+    rows and one per category, so a range query is a binary search plus a
+    vectorized filter of the candidates.
+
+    Writes append to the arrays and tombstone the row they replace. Appended
+    rows are scanned linearly until there are more than MERGE_ROWS of them
+    (or MERGE_FRACTION of the table), when the arrays are compacted and the
+    indexes rebuilt.
+    """
+
+    def __init__(self, merge_rows=MERGE_ROWS, merge_fraction=MERGE_FRACTION):
+        self.merge_rows = merge_rows
+        self.merge_fraction = merge_fraction
+        self.size = 0  # Rows in the arrays, dead ones included
+        self.indexed = 0  # Rows covered by the sorted indexes
+        self.keys = np.empty(INITIAL_CAPACITY, dtype=object)
+        self.names = np.empty(INITIAL_CAPACITY, dtype=object)
+        self.codes = np.zeros(INITIAL_CAPACITY, dtype=np.int32)
+        self.alive = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self.values = {column: np.full(INITIAL_CAPACITY, np.nan) for column in NUMERIC_COLUMNS}
+        self.categories = []  # Code -> category name
+        self.category_codes = {}
+        self.bitmaps = []  # Code -> bool array marking the rows of that category
+        self.positions = {}  # Key -> position of its live row
+        self.dead = 0  # Tombstoned rows not yet compacted away
+        self.indexes = {}  # (code or None, column) -> (sorted values, positions)
+        self.inventory_read_at = None  # Database time of the last inventory read
+
+    def __len__(self):
+        return len(self.positions)
+
+    def category_code(self, category):
+        code = self.category_codes.get(category)
+        if code is None:
+            code = self.category_codes[category] = len(self.categories)
+            self.categories.append(category)
+            self.bitmaps.append(np.zeros(len(self.keys), dtype=bool))
+        return code
+
+    def reserve(self, rows):
+        """Grows the arrays so rows more rows fit, doubling the capacity."""
+        needed = self.size + rows
+        if needed <= len(self.keys):
+            return
+        capacity = max(needed, 2 * len(self.keys))
+
+        def grow(array, fill):
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            return grown
+
+        self.keys = grow(self.keys, None)
+        self.names = grow(self.names, None)
+        self.codes = grow(self.codes, 0)
+        self.alive = grow(self.alive, False)
+        self.values = {column: grow(array, np.nan) for column, array in self.values.items()}
+        self.bitmaps = [grow(bitmap, False) for bitmap in self.bitmaps]
+
+    def add_rows(self, keys, names, categories, columns):
+        """Appends rows given column-wise and replaces earlier rows with the same keys.
+
+        columns maps numeric column names to sequences; absent columns are NaN.
+        """
+        count = len(keys)
+        if not count:
+            return
+        self.reserve(count)
+        start, end = self.size, self.size + count
+
+        self.keys[start:end] = keys
+        self.names[start:end] = names
+        category_codes = self.category_codes
+        codes = np.fromiter((category_codes[category] if category in category_codes else self.category_code(category)
+                             for category in categories), dtype=np.int32, count=count)
+        self.codes[start:end] = codes
+        for code in np.unique(codes):
+            self.bitmaps[code][start:end] = codes == code
+        for column in NUMERIC_COLUMNS:
+            if column in columns:
+                self.values[column][start:end] = np.asarray(columns[column], dtype=float)
+        self.alive[start:end] = True
+
+        positions = self.positions
+        # Each key replaces its earlier row once, however often it repeats within the batch
+        replaced = [positions[key] for key in dict.fromkeys(keys) if key in positions] if positions else []
+        self.alive[replaced] = False
+        before = len(positions)
+        positions.update(zip(keys, range(start, end)))
+        if len(positions) - before + len(replaced) < count:
+            # A key repeated within the batch: only its last row stays alive
+            self.alive[start:end] = np.fromiter((positions[key] == position for position, key in enumerate(keys, start)),
+                                                dtype=bool, count=count)
+        self.dead += count - (len(positions) - before)
+        self.size = end
+
+        if end - self.indexed > max(self.merge_rows, self.merge_fraction * self.indexed):
+            self.rebuild()
+
+    def upsert(self, rows):
+        """Adds or replaces rows given as dicts with key, component_name, category and numeric columns."""
+        rows = list(rows)
+        self.add_rows(
+            [row["key"] for row in rows],
+            [row.get("component_name") for row in rows],
+            [row.get("category") for row in rows],
+            {column: [row.get(column) for row in rows] for column in NUMERIC_COLUMNS},
+        )
+
+    def remove(self, keys):
+        """Drops the rows with these keys; unknown keys are ignored."""
+        for key in keys:
+            position = self.positions.pop(key, None)
+            if position is not None:
+                self.alive[position] = False
+                self.dead += 1
+
+    def rebuild(self):
+        """Compacts away dead rows and rebuilds the sorted indexes over every row.
+
+        Rows are clustered by category, so a per-category query reads one contiguous block of each column.
+        """
+        keep = np.flatnonzero(self.alive[:self.size])
+        keep = keep[np.argsort(self.codes[keep], kind="stable")]
+        count = len(keep)
+        self.keys[:count] = self.keys[keep]
+        self.names[:count] = self.names[keep]
+        self.codes[:count] = self.codes[keep]
+        for column, array in self.values.items():
+            array[:count] = array[keep]
+        for bitmap in self.bitmaps:
+            bitmap[:count] = bitmap[keep]
+            bitmap[count:] = False
+        self.alive[:count] = True
+        self.alive[count:] = False
+        self.keys[count:] = None
+        self.size = self.indexed = count
+        self.dead = 0
+        self.positions = dict(zip(self.keys[:count].tolist(), range(count)))
+
+        codes = self.codes[:count]
+        self.indexes = {}
+        for column, array in self.values.items():
+            # NaN sorts last, so range searches never reach missing values
+            order = np.argsort(array[:count], kind="stable")
+            self.indexes[(None, column)] = (array[order], order)
+            ordered_codes = codes[order]
+            for code in range(len(self.categories)):
+                positions = order[ordered_codes == code]
+                self.indexes[(code, column)] = (array[positions], positions)
+
+    def matches(self, positions, code, ranges, skip=None):
+        """Returns the positions that are alive, in category code and within every range but skip."""
+        mask = self.alive[positions] if self.dead else np.ones(len(positions), dtype=bool)
+        if code is not None:
+            mask &= self.bitmaps[code][positions]
+        for column, (low, high) in ranges.items():
+            if column != skip:
+                values = self.values[column][positions]
+                mask &= (values >= low) & (values <= high)
+        return positions[mask]
+
+    def tail_matches(self, code, ranges):
+        """Filters the appended rows not yet in the indexes, which sit contiguously after them."""
+        start, end = self.indexed, self.size
+        mask = self.alive[start:end].copy()
+        if code is not None:
+            mask &= self.bitmaps[code][start:end]
+        for column, (low, high) in ranges.items():
+            values = self.values[column][start:end]
+            mask &= (values >= low) & (values <= high)
+        return np.flatnonzero(mask) + start
+
+    def index_range(self, code, column, low=-np.inf, high=np.inf):
+        """Returns (positions sorted by column, start, end) of the indexed rows within [low, high]."""
+        index = self.indexes.get((code, column))
+        if index is None:
+            # A category first seen since the last rebuild has only unindexed rows
+            return np.empty(0, dtype=np.int64), 0, 0
+        sorted_values, positions = index
+        return (positions, int(np.searchsorted(sorted_values, low, "left")),
+                int(np.searchsorted(sorted_values, high, "right")))
+
+    def ordered(self, positions, order_by, descending):
+        """Sorts positions by column order_by, missing values last."""
+        values = self.values[order_by][positions]
+        order = np.argsort(-values if descending else values, kind="stable")
+        return positions[order]
+
+    def search_positions(self, category=None, order_by=None, descending=False, limit=None, **bounds):
+        ranges = parse_bounds(bounds)
+        if order_by is not None and order_by not in NUMERIC_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by}, expected one of {NUMERIC_COLUMNS}")
+        if self.size > self.indexed and not self.indexes:
+            self.rebuild()
+        code = None
+        if category is not None:
+            code = self.category_codes.get(category)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+
+        # Appended rows not yet in the indexes are filtered directly
+        tail = self.tail_matches(code, ranges)
+
+        if self.indexed == 0:
+            found = np.empty(0, dtype=np.int64)
+        else:
+            # The narrowest range decides the candidates; a per-category index already filters the category
+            narrowest = None
+            for column, (low, high) in ranges.items():
+                positions, start, end = self.index_range(code, column, low, high)
+                if narrowest is None or end - start < narrowest[3] - narrowest[2]:
+                    narrowest = (column, positions, start, end)
+
+            if limit is not None and order_by is not None and (
+                    narrowest is None or narrowest[0] == order_by or narrowest[3] - narrowest[2] > 4 * limit):
+                found = self.scan_ordered(code, ranges, order_by, descending, limit)
+            elif narrowest is None:
+                found = np.flatnonzero(self.alive[:self.indexed] if code is None else
+                                       self.alive[:self.indexed] & self.bitmaps[code][:self.indexed])
+            else:
+                column, positions, start, end = narrowest
+                found = self.matches(positions[start:end], None, ranges, skip=column)
+
+        result = np.concatenate([found, tail]) if len(tail) else found
+        if order_by is not None:
+            result = self.ordered(result, order_by, descending)
+        return result[:limit] if limit is not None else result
+
+    def scan_ordered(self, code, ranges, order_by, descending, limit):
+        """Walks the order_by index in growing windows until limit rows pass the filters."""
+        low, high = ranges.get(order_by, (-np.inf, np.inf))
+        positions, start, end = self.index_range(code, order_by, low, high)
+        # Rows with a value in order, then, unless order_by is bounded, the rows missing it
+        runs = [positions[start:end][::-1] if descending else positions[start:end]]
+        if order_by not in ranges:
+            runs.append(positions[end:])
+
+        found = []
+        count = 0
+        window = max(4 * limit, 256)
+        for run in runs:
+            offset = 0
+            while offset < len(run) and count < limit:
+                passed = self.matches(run[offset:offset + window], None, ranges, skip=order_by)
+                found.append(passed)
+                count += len(passed)
+                offset += window
+                window *= 2
+        return np.concatenate(found)[:limit] if found else np.empty(0, dtype=np.int64)
+
+    def search(self, category=None, order_by=None, descending=False, limit=None, **bounds):
+        """Returns the keys of the live rows in category within bounds.
+
+        bounds are min_<column> or max_<column> for the numeric columns, in SI
+        units, e.g. search("Transistor", min_input_bandwidth_hz=50e6,
+        max_power_consumption_w=3, order_by="price", limit=10) for the ten
+        cheapest matches. Rows missing the order_by value come last.
+        """
+        return self.keys[self.search_positions(category, order_by, descending, limit, **bounds)].tolist()
+
+    def describe(self, keys):
+        """Returns the stored rows for keys as dicts."""
+        rows = []
+        for key in keys:
+            position = self.positions.get(key)
+            if position is None:
+                continue
+            row = {"key": key, "component_name": self.names[position],
+                   "category": self.categories[self.codes[position]]}
+            for column in NUMERIC_COLUMNS:
+                value = self.values[column][position]
+                row[column] = None if np.isnan(value) else float(value)
+            rows.append(row)
+        return rows
+
+    def load_inventory(self, connection, changed_since=None, batch_size=50000):
+        """Adds the inventory rows written after changed_since, or all of them, and returns how many were read.
+
+        With changed_since, components deleted after it are removed first.
+        """
+        cursor = connection.cursor()
+        rows = 0
+        try:
+            ensure_change_tracking(cursor)
+            cursor.execute("SELECT NOW(6)")
+            read_at = cursor.fetchone()[0]
+            condition, args = "TRUE", ()
+            if changed_since is not None:
+                cursor.execute("SELECT component_id FROM inventory_deletions WHERE deleted_at > %s", (changed_since,))
+                self.remove([row[0] for row in cursor.fetchall()])
+                condition, args = "updated_at > %s", (changed_since,)
+            cursor.execute(f"SELECT id, component_name, category, {', '.join(NUMERIC_COLUMNS)} FROM inventory "
+                           f"WHERE {condition} ORDER BY id", args)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                columns = list(zip(*batch))
+                self.add_rows(list(columns[0]), columns[1], columns[2],
+                              {column: columns[3 + i] for i, column in enumerate(NUMERIC_COLUMNS)})
+                rows += len(batch)
+            self.inventory_read_at = read_at
+        finally:
+            cursor.close()
+        return rows
+
+    def refresh_inventory(self, connection):
+        """Picks up the inventory rows inserted, updated or deleted since the last load."""
+        if self.inventory_read_at is None:
+            return self.load_inventory(connection)
+        changed_since = self.inventory_read_at - datetime.timedelta(seconds=REFRESH_OVERLAP_S)
+        return self.load_inventory(connection, changed_since=changed_since)
+
+    def load_catalog(self, path="electronic_component_data.jsonl", batch_size=1000):
+        """Adds the scraped products of a JSON Lines file, keyed by ("catalog", url, part number or name).
+
+        Records a delta scrape marked removed drop their product instead.
+        """
+        rows = 0
+        with open(path, encoding="utf-8") as f:
+            products = []
+            for line in f:
+                if line.strip():
+                    products.append(json.loads(line))
+                if len(products) >= batch_size:
+                    rows += self.add_catalog_products(products)
+                    products = []
+            rows += self.add_catalog_products(products)
+        return rows
+
+    def add_catalog_products(self, products):
+        """Upserts scraped products and drops the ones a delta scrape marked removed; returns how many were read."""
+        normalized = normalize_products(products)
+        rows = []
+        removed = []
+        for product, row in zip(products, normalized):
+            identity = product_key(row)
+            if identity is None:
+                # Without a real key it would overwrite every other such record
+                continue
+            key = ("catalog", identity)
+            if product.get("Change") == "removed":
+                removed.append(key)
+                continue
+            entry = {
+                "key": key,
+                "component_name": row.get("product_name"),
+                "category": row.get("type") or row.get("segment"),
+            }
+            # A value in any other unit, such as a power in dBm, is left missing rather than misread
+            for spec, (column, unit) in CATALOG_SPECS.items():
+                entry[column] = row.get(f"{spec}_max") if row.get(f"{spec}_unit") == unit else None
+            rows.append(entry)
+        self.upsert(rows)
+        self.remove(removed)
+        return len(normalized)
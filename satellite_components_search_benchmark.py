@@ -0,0 +1,144 @@
+from satellite_components_normalization import normalize_column
+from satellite_components_search import ComponentSearch, NUMERIC_COLUMNS
+import numpy as np
+import pandas as pd
+import os
+import sys
+import time
+
+# String spec column in the inventory CSV -> numeric column of the search engine
+SPEC_COLUMNS = {
+    "input_bandwidth": "input_bandwidth_hz",
+    "power_consumption": "power_consumption_w",
+    "supply_voltage": "supply_voltage_v",
+}
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def synthetic_inventory(rows, seed=0):
+    """Resamples the repository's inventory CSV to rows components, jittering every numeric value."""
+    base = pd.read_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "satellite_electronic_component.csv"))
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(base), rows)
+
+    columns = {target: np.asarray(normalize_column(base[source], source)[1], dtype=float)[picks]
+               for source, target in SPEC_COLUMNS.items()}
+    columns["stock_quantity"] = base["stock_quantity"].to_numpy(dtype=float)[picks]
+    columns["price"] = base["price"].to_numpy(dtype=float)[picks]
+    for column, values in columns.items():
+        values *= rng.lognormal(0, 0.1, rows)
+    columns["stock_quantity"] = np.round(columns["stock_quantity"])
+
+    keys = np.arange(1, rows + 1).tolist()
+    names = [f"Component_{key}" for key in keys]
+    return keys, names, base["category"].to_numpy(dtype=object)[picks], columns
+
+def random_queries(columns, categories, count, seed=1):
+    """Builds count mixed queries: category + range, multi-attribute range and top-k by price."""
+    rng = np.random.default_rng(seed)
+    quantiles = {column: np.nanquantile(values, [0.1, 0.5, 0.9]) for column, values in columns.items()}
+    queries = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            low = quantiles["input_bandwidth_hz"][2] * rng.uniform(0.9, 1.0)
+            high = quantiles["power_consumption_w"][0] * rng.uniform(1.0, 1.5)
+            queries.append(("category + range", dict(category=rng.choice(categories), min_input_bandwidth_hz=low,
+                                                     max_power_consumption_w=high)))
+        elif kind == 1:
+            queries.append(("multi-attribute range", dict(
+                min_input_bandwidth_hz=quantiles["input_bandwidth_hz"][1] * rng.uniform(1.0, 1.2),
+                max_power_consumption_w=quantiles["power_consumption_w"][0] * rng.uniform(0.8, 1.2),
+                min_supply_voltage_v=quantiles["supply_voltage_v"][0],
+                max_supply_voltage_v=quantiles["supply_voltage_v"][1],
+                min_stock_quantity=quantiles["stock_quantity"][1],
+            )))
+        else:
+            queries.append(("top-10 by price", dict(category=rng.choice(categories), min_stock_quantity=100,
+                                                    max_power_consumption_w=quantiles["power_consumption_w"][1],
+                                                    order_by="price", limit=10)))
+    return queries
+
+def full_scan(columns, categories, category=None, order_by=None, descending=False, limit=None, **bounds):
+    """Baseline: one boolean mask over every row, as an unindexed scan would do."""
+    mask = np.ones(len(categories), dtype=bool)
+    if category is not None:
+        mask &= categories == category
+    for name, value in bounds.items():
+        bound, _, column = name.partition("_")
+        mask &= columns[column] >= value if bound == "min" else columns[column] <= value
+    rows = np.flatnonzero(mask)
+    if order_by is not None:
+        values = columns[order_by][rows]
+        rows = rows[np.argsort(-values if descending else values, kind="stable")]
+    return rows[:limit] if limit is not None else rows
+
+def array_bytes(engine):
+    """Bytes held by the engine's NumPy arrays: columns, bitmaps and sorted indexes."""
+    arrays = [engine.keys, engine.names, engine.codes, engine.alive, *engine.values.values(), *engine.bitmaps]
+    arrays += [array for index in engine.indexes.values() for array in index]
+    return sum(array.nbytes for array in arrays)
+
+def time_queries(run, queries):
+    """Returns {query kind: (latencies in microseconds, rows returned)}."""
+    latencies = {}
+    for kind, query in queries:
+        started = time.perf_counter()
+        found = run(query)
+        samples, rows = latencies.setdefault(kind, ([], []))
+        samples.append((time.perf_counter() - started) * 1e6)
+        rows.append(len(found))
+    return latencies
+
+def benchmark_search(rows=1000000, queries=3000, write_batches=20, write_batch_size=1000):
+    """Builds the engine over rows synthetic components and prints query latencies against a full scan."""
+    keys, names, categories, columns = synthetic_inventory(rows)
+    category_names = sorted(set(categories))
+
+    started = time.perf_counter()
+    engine = ComponentSearch()
+    engine.add_rows(keys, names, categories, columns)
+    engine.rebuild()
+    build_s = time.perf_counter() - started
+    print(f" Built over {len(engine)} components in {build_s:.2f} s, {array_bytes(engine) / 1e6:.0f} MB of arrays")
+
+    workload = random_queries(columns, category_names, queries)
+    # Both answer every query the same way
+    for _, query in workload[:30]:
+        expected = full_scan(columns, categories, **query)
+        found = engine.search(**query)
+        if query.get("order_by"):
+            assert np.allclose(columns["price"][np.asarray(found) - 1], columns["price"][expected])
+        else:
+            assert sorted(found) == sorted((expected + 1).tolist())
+
+    results = [
+        ("indexed", time_queries(lambda query: engine.search_positions(**query), workload)),
+        ("full scan", time_queries(lambda query: full_scan(columns, categories, **query), workload[:300])),
+    ]
+
+    # Writes: replace random rows in batches, which land in the unindexed tail until the next merge
+    rng = np.random.default_rng(2)
+    started = time.perf_counter()
+    for _ in range(write_batches):
+        changed = rng.integers(1, rows + 1, write_batch_size)
+        engine.upsert({"key": int(key), "component_name": f"Component_{key}", "category": categories[key - 1],
+                       **{column: columns[column][key - 1] * 1.01 for column in NUMERIC_COLUMNS}}
+                      for key in changed)
+    write_s = time.perf_counter() - started
+    print(f" Upserted {write_batches * write_batch_size} rows in {write_s:.2f} s "
+          f"({write_batches * write_batch_size / write_s:.0f} rows/s), {engine.size - engine.indexed} unindexed")
+    results.append(("after writes", time_queries(lambda query: engine.search_positions(**query), workload)))
+
+    print(f" {'engine':<14} {'query':<24} {'rows':>8} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9}")
+    for engine_name, latencies in results:
+        for kind, (samples, found) in latencies.items():
+            print(f" {engine_name:<14} {kind:<24} {np.mean(found):>8.0f} {percentile(samples, 0.5):>9.0f} "
+                  f"{percentile(samples, 0.95):>9.0f} {percentile(samples, 0.99):>9.0f}")
+    return results
+
+if __name__ == "__main__":
+    # Optional argument: number of components (default 1,000,000)
+    benchmark_search(rows=int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
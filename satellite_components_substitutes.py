@@ -0,0 +1,296 @@
+from satellite_components_arrays import sorted_unique
+from collections import OrderedDict
+import numpy as np
+import threading
+
+CACHE_SIZE = 10000  # Closures kept, least recently used dropped first
+COMPACT_EDGES = 100000  # Pending edge changes merged into the CSR arrays once there are more than this ...
+COMPACT_FRACTION = 0.1  # ... or this fraction of the edges, whichever is larger
+
+def edge_keys(sources, targets, nodes):
+    """Encodes (source, target) index pairs as single int64 keys."""
+    return sources.astype(np.int64) * nodes + targets
+
+class SubstituteGraph:
+    """Substitute lookups over alternative_components held as a CSR adjacency.
+
+    Components are mapped to dense indexes through a sorted id array; the
+    substitutes of node i are indices[indptr[i]:indptr[i + 1]]. Traversals
+    expand a whole frontier per hop with vectorized gathers.
+
+    Transitive closures are cached per component. Stock is applied when a
+    result is returned, so stock updates never invalidate the cache; edge
+    changes invalidate only the closures that reach the changed component.
+    Changed edges are kept aside and merged into the CSR arrays in bulk.
+    With symmetric, every pair also counts in the other direction.
+    component_ids and stock give the stock on hand of every component,
+    including those without substitutes yet.
+    """
+
+    def __init__(self, originals, alternatives, symmetric=False, cache_size=CACHE_SIZE, component_ids=(), stock=()):
+        self.symmetric = symmetric
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # Node index -> (reached node indexes, sorted; their hop counts)
+        self.lock = threading.Lock()
+        self.ids = np.empty(0, dtype=np.int64)
+        self.stock = np.empty(0)
+        self.build(np.asarray(originals, dtype=np.int64), np.asarray(alternatives, dtype=np.int64),
+                   np.asarray(component_ids, dtype=np.int64), np.asarray(stock, dtype=float))
+
+    def build(self, originals, alternatives, stock_ids=None, stock=None):
+        """Builds the CSR arrays from id pairs, keeping the stock already known for each component."""
+        if stock_ids is None:
+            stock_ids, stock = self.ids, self.stock
+        if self.symmetric:
+            originals, alternatives = (np.concatenate([originals, alternatives]),
+                                       np.concatenate([alternatives, originals]))
+        self.ids, inverse = sorted_unique(np.concatenate([originals, alternatives, stock_ids]), return_inverse=True)
+        nodes = len(self.ids)
+        sources, targets = inverse[:len(originals)], inverse[len(originals):2 * len(originals)]
+
+        # Sorting the encoded pairs groups edges by source and drops duplicates in one pass
+        keys = sorted_unique(edge_keys(sources, targets, nodes))
+        self.built = keys[keys // nodes != keys % nodes]  # Sorted encoded keys of the CSR edges
+        keys = self.built
+        self.indices = (keys % nodes).astype(np.int32)
+        self.indptr = np.zeros(nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // nodes, minlength=nodes), out=self.indptr[1:])
+
+        self.stock = np.full(nodes, np.nan)
+        if len(stock_ids):
+            self.stock[np.searchsorted(self.ids, stock_ids)] = stock
+        self.stamp = np.zeros(nodes, dtype=np.int32)
+        self.generation = 0
+        self.added = np.empty(0, dtype=np.int64)  # Encoded keys of edges added since the build
+        self.removed = np.empty(0, dtype=np.int64)  # ... and of built edges removed since
+
+    @classmethod
+    def from_mysql(cls, connection, symmetric=False, batch_size=100000):
+        """Reads every substitute pair and the stock of every component."""
+        cursor = connection.cursor()
+        try:
+            pairs = fetch_array(cursor, "SELECT original_component_id, alternative_component_id "
+                                        "FROM alternative_components WHERE original_component_id IS NOT NULL "
+                                        "AND alternative_component_id IS NOT NULL", batch_size)
+            stock = fetch_array(cursor, "SELECT id, COALESCE(stock_quantity, 0) FROM inventory", batch_size)
+            graph = cls(pairs[:, 0], pairs[:, 1], symmetric, component_ids=stock[:, 0], stock=stock[:, 1])
+        finally:
+            cursor.close()
+        return graph
+
+    def sync_from_mysql(self, connection, batch_size=100000):
+        """Re-reads alternative_components and applies the difference; returns (added, removed) counts."""
+        cursor = connection.cursor()
+        try:
+            pairs = fetch_array(cursor, "SELECT original_component_id, alternative_component_id "
+                                        "FROM alternative_components WHERE original_component_id IS NOT NULL "
+                                        "AND alternative_component_id IS NOT NULL", batch_size)
+        finally:
+            cursor.close()
+        current = self.edges()
+        wanted = np.unique(pairs, axis=0) if len(pairs) else pairs.reshape(0, 2)
+        if self.symmetric:
+            current = current[current[:, 0] < current[:, 1]]
+            wanted = np.unique(np.sort(wanted, axis=1), axis=0) if len(wanted) else wanted
+        added = wanted[~row_in(wanted, current)]
+        removed = current[~row_in(current, wanted)]
+        self.apply_changes(added, removed)
+        return len(added), len(removed)
+
+    @property
+    def nodes(self):
+        return len(self.ids)
+
+    def edges(self):
+        """Returns every current edge as an (n, 2) array of component ids."""
+        nodes = self.nodes
+        # Added keys are never built ones, so the two parts are disjoint
+        keys = np.sort(np.concatenate([np.setdiff1d(self.built, self.removed, assume_unique=True), self.added]))
+        return np.column_stack([self.ids[keys // nodes], self.ids[keys % nodes]])
+
+    def index_of(self, component_ids):
+        """Maps component ids to node indexes, -1 for components the graph has not seen."""
+        component_ids = np.asarray(component_ids, dtype=np.int64)
+        positions = np.searchsorted(self.ids, component_ids).clip(max=max(self.nodes - 1, 0))
+        found = (self.ids[positions] == component_ids) if self.nodes else np.zeros(len(component_ids), dtype=bool)
+        return np.where(found, positions, -1)
+
+    def set_stock(self, component_ids, quantities):
+        """Updates stock on hand; components the graph has not seen are ignored."""
+        positions = self.index_of(component_ids)
+        known = positions >= 0
+        self.stock[positions[known]] = np.asarray(quantities, dtype=float)[known]
+
+    def apply_changes(self, added=(), removed=()):
+        """Removes, then adds, substitute pairs of component ids, invalidating the closures they affect."""
+        added = np.asarray(added, dtype=np.int64).reshape(-1, 2)
+        removed = np.asarray(removed, dtype=np.int64).reshape(-1, 2)
+        if self.symmetric:
+            added = np.concatenate([added, added[:, ::-1]])
+            removed = np.concatenate([removed, removed[:, ::-1]])
+
+        with self.lock:
+            if (self.index_of(added.ravel()) < 0).any():
+                # New components need new node indexes, so everything is rebuilt
+                edges = self.edges()
+                if len(removed):
+                    edges = edges[~row_in(edges, removed)]
+                edges = np.concatenate([edges, added])
+                self.rebuild(edges)
+                self.invalidate(self.index_of(np.concatenate([added[:, 0], removed[:, 0]])))
+                return
+
+            nodes = self.nodes
+            added_keys = edge_keys(self.index_of(added[:, 0]), self.index_of(added[:, 1]), nodes)
+            removed_index = self.index_of(removed.ravel()).reshape(-1, 2)
+            removed_index = removed_index[(removed_index >= 0).all(axis=1)]
+            removed_keys = edge_keys(removed_index[:, 0], removed_index[:, 1], nodes)
+
+            built = self.built_keys(np.concatenate([added_keys, removed_keys]))
+            added_built = built[:len(added_keys)]
+            removed_built = built[len(added_keys):]
+            # Removals apply first, so a pair both removed and added ends up present
+            self.removed = np.setdiff1d(np.union1d(self.removed, removed_keys[removed_built]),
+                                        added_keys[added_built])
+            self.added = np.union1d(np.setdiff1d(self.added, removed_keys), added_keys[~added_built])
+            self.invalidate(np.concatenate([added_keys, removed_keys]) // nodes)
+
+            if len(self.added) + len(self.removed) > max(COMPACT_EDGES, COMPACT_FRACTION * len(self.indices)):
+                self.compact()
+
+    def built_keys(self, keys):
+        """Returns which encoded edges are present in the CSR arrays."""
+        if not len(self.built):
+            return np.zeros(len(keys), dtype=bool)
+        positions = np.searchsorted(self.built, keys).clip(max=len(self.built) - 1)
+        return self.built[positions] == keys
+
+    def rebuild(self, edges):
+        """Rebuilds the CSR arrays from an (n, 2) array of component id edges, keeping cached closures.
+
+        Node indexes follow the sorted ids, so cached closures are remapped in order.
+        """
+        old_ids = self.ids
+        cache = self.cache
+        symmetric, self.symmetric = self.symmetric, False
+        self.build(edges[:, 0], edges[:, 1], old_ids, self.stock)
+        self.symmetric = symmetric
+        self.cache = OrderedDict((int(self.index_of([old_ids[root]])[0]), (self.index_of(old_ids[reached]), hops))
+                                 for root, (reached, hops) in cache.items())
+
+    def compact(self):
+        """Merges the pending edge changes into the CSR arrays; cached closures stay valid."""
+        self.rebuild(self.edges())
+
+    def invalidate(self, sources):
+        """Drops the cached closures that contain, or start from, any of the changed source nodes."""
+        sources = np.unique(sources[sources >= 0])
+        if not len(sources):
+            return
+        for root in list(self.cache):
+            reached = self.cache[root][0]
+            positions = np.searchsorted(reached, sources).clip(max=max(len(reached) - 1, 0))
+            if np.isin(root, sources) or (len(reached) and (reached[positions] == sources).any()):
+                del self.cache[root]
+
+    def neighbors(self, frontier):
+        """Returns the substitutes of every node in frontier, pending changes included."""
+        starts = self.indptr[frontier]
+        lengths = self.indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        targets = self.indices[offsets].astype(np.int64)
+
+        if len(self.removed):
+            keys = edge_keys(np.repeat(frontier, lengths), targets, self.nodes)
+            targets = targets[~np.isin(keys, self.removed, assume_unique=False)]
+        if len(self.added):
+            added_sources = self.added // self.nodes
+            targets = np.concatenate([targets, self.added[np.isin(added_sources, frontier)] % self.nodes])
+        return targets
+
+    def traverse(self, root, max_hops=None):
+        """Breadth-first search from node root; returns (reached nodes, sorted, and their hop counts)."""
+        self.generation += 1
+        if self.generation == np.iinfo(np.int32).max:
+            self.stamp[:] = 0
+            self.generation = 1
+        generation = self.generation
+        self.stamp[root] = generation
+
+        reached = []
+        hops = []
+        frontier = np.array([root], dtype=np.int64)
+        hop = 0
+        while len(frontier) and (max_hops is None or hop < max_hops):
+            hop += 1
+            targets = self.neighbors(frontier)
+            targets = sorted_unique(targets[self.stamp[targets] != generation])
+            self.stamp[targets] = generation
+            reached.append(targets)
+            hops.append(np.full(len(targets), hop, dtype=np.int32))
+            frontier = targets
+
+        if not reached:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+        reached = np.concatenate(reached)
+        hops = np.concatenate(hops)
+        order = np.argsort(reached)
+        return reached[order], hops[order]
+
+    def closure(self, root):
+        """Returns the cached transitive closure of node root, computing it on a miss."""
+        cached = self.cache.get(root)
+        if cached is not None:
+            self.cache.move_to_end(root)
+            return cached
+        cached = self.cache[root] = self.traverse(root)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return cached
+
+    def substitutes(self, component_id, max_hops=None, min_stock=None):
+        """Returns (component id, hops, stock) for every substitute reachable within max_hops.
+
+        max_hops None follows substitutes of substitutes all the way. With
+        min_stock only components with at least that much stock on hand are
+        returned, though the search still passes through the others. Nearest
+        substitutes come first, the best stocked first among equals.
+        """
+        with self.lock:
+            root = self.index_of([component_id])[0]
+            if root < 0:
+                return []
+            if max_hops is None or root in self.cache:
+                reached, hops = self.closure(root)
+                if max_hops is not None:
+                    within = hops <= max_hops
+                    reached, hops = reached[within], hops[within]
+            else:
+                reached, hops = self.traverse(root, max_hops)
+            stock = self.stock[reached]
+
+        if min_stock is not None:
+            usable = stock >= min_stock
+            reached, hops, stock = reached[usable], hops[usable], stock[usable]
+        order = np.lexsort((-np.nan_to_num(stock, nan=-np.inf), hops))
+        return [(int(self.ids[node]), int(hop), None if np.isnan(quantity) else int(quantity))
+                for node, hop, quantity in zip(reached[order], hops[order], stock[order])]
+
+def fetch_array(cursor, sql, batch_size):
+    """Runs sql and returns its rows as an int64 array, reading batch_size rows at a time."""
+    cursor.execute(sql)
+    batches = []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        batches.append(np.array(rows, dtype=np.int64))
+    return np.concatenate(batches) if batches else np.empty((0, 2), dtype=np.int64)
+
+def row_in(rows, other):
+    """Returns which rows of an (n, 2) id array also appear in other."""
+    if not len(rows) or not len(other):
+        return np.zeros(len(rows), dtype=bool)
+    base = int(max(rows.max(), other.max())) + 1
+    return np.isin(rows[:, 0] * base + rows[:, 1], other[:, 0] * base + other[:, 1])
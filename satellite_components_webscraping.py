@@ -5,6 +5,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from bs4 import BeautifulSoup
+from satellite_components_normalization import split_glued_parameters
 import json
 import time
 import os
@@ -65,46 +66,11 @@ def extract_product_details(driver, js_code):
             "Application": "Application",
         }
 
-        mapped_parameters = {}
-        for key, value in general_parameters.items():
-            if key in parameter_mapping:
-                mapped_parameters[parameter_mapping[key]] = value
-            elif key == "Tx" and "Gain" in general_parameters:
-                mapped_parameters["Tx Gain"] = general_parameters["39.3 to 39.5 dB(C), 42 dB(X), 46.6"]
-            elif key == "Rx" and "Gain" in general_parameters:
-                mapped_parameters["Rx Gain"] = general_parameters["35.4 dB(C), 41.3 dB(X), 45.3"]
-            elif key == "Axial" and "Ratio" in general_parameters:
-                mapped_parameters["Axial Ratio"] = general_parameters["2.3 to 3 dB(C), 1.5"]
-            elif key == "Cross Polarization on" and "Axis" in general_parameters:
-                mapped_parameters["Cross Polarization on Axis"] = general_parameters["-30 to -15.3 dB(C), -21.3 dB(X), -30 to -23"]
-            elif key == "Horizontal" and "Beamwidth" in general_parameters:
-                mapped_parameters["Horizontal Beam Width"] = general_parameters["± 35° continuous fine adjustment (360°"]
-            elif key == "Noise" and "Temp" in general_parameters:
-                mapped_parameters["Noise Temperature"] = general_parameters["36 to 41 K(C), 56 to 60 K(X), 50 to 55"]
-            elif key == "Vertical" and "Beamwidth" in general_parameters:
-                mapped_parameters["Vertical Bandwidth"] = general_parameters["0 to 90"]
-            elif key == "Wind" and "rating" in general_parameters:
-                mapped_parameters["Wind Rating"] = general_parameters["Operational : 30 mph Gusting to 40 mph ( 48 kph G 64"]
-            elif key == "Operating" and "Temperature" in general_parameters:
-                mapped_parameters["Operating Temperature"] = general_parameters["-30 to 60 Degrees"]
-            elif key == "Tx" and "Frequency" in general_parameters:
-                mapped_parameters["Tx Frequency"] = general_parameters["5.85 to 6.425 GHz(C)/ 7.9 to 8.4 GHz(X)/ 13.75 to 14.5"]
-            elif key == "Rx" and "Frequency" in general_parameters:
-                mapped_parameters["Rx Frequency"] = general_parameters["3.4 to 4.20 GHz(C)/ 7.25 to 7.75 GHz(X)/ 10.7 to 12.75"]
-            elif key == "Reflector" in general_parameters:
-                mapped_parameters["Reflector"] = general_parameters["1.8 meters (70.87 in) Glass Fiber Reinforced Polyester"]
-            elif key == "VSWR" in general_parameters:
-                mapped_parameters["VSWR"] = general_parameters["1.30:1, 1.50:1(C), 1.30:1(X), 1.30:1, 1.50:1(Ku)"]
-            elif key == "Isolation" in general_parameters:
-                mapped_parameters["Isolation"] = general_parameters["-110 to -35 dB"]
-            elif key == "Mounting" in general_parameters:
-                mapped_parameters["Mounting"] = general_parameters["Tripod Mount"]
-            elif key == "Weight" in general_parameters:
-                mapped_parameters["Weight"] = general_parameters["177 lbs (80.5 kg)"]
-            elif key == "Dimension" in general_parameters:
-                mapped_parameters["Dimension"] = general_parameters["39\" x 41\" x 13 1/2\""]
-            elif key == "Application" in general_parameters:
-                mapped_parameters["Application"] = general_parameters["commercial or military"]
+        # The line parser leaves part of long values glued to their keys
+        general_parameters = split_glued_parameters(general_parameters)
+        mapped_parameters = {
+            parameter_mapping[key]: value for key, value in general_parameters.items() if key in parameter_mapping
+        }
 
         product['general_parameters'] = mapped_parameters
 
@@ -243,8 +209,30 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from satellite_components_normalization import split_glued_parameters
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+import psutil
+import requests
+import urllib3
+import atexit
+import csv
+import gzip
+import hashlib
+import heapq
 import json
+import os
+import queue
+import random
+import sqlite3
+import sys
+import threading
 import time
 
 # Column mapping for required parameters
@@ -273,9 +261,90 @@ COLUMN_MAPPING = {
     "Application": "Application",
 }
 
-def extract_product_details(driver):
+# Headers for plain HTTP fetches of product pages
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+HTTP_TIMEOUT = 15  # Seconds per HTTP request
+PAGE_LOAD_TIMEOUT = 30  # Seconds before driver.get gives up on a page
+
+# Resources the extractor never reads, blocked in the lean browser profile
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+]
+BLOCKED_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "fonts.googleapis.com", "fonts.gstatic.com", "facebook.net", "facebook.com",
+    "linkedin.com", "licdn.com", "twitter.com", "hotjar.com", "addthis.com", "sharethis.com",
+    "youtube.com", "ytimg.com",
+]
+
+# A product page is ready once the detail header is present and the spec list
+# has rendered, or the load has finished on pages that have no spec list
+PAGE_READY_SCRIPT = """
+if (!document.querySelector('div.d-block.detail')) return false;
+if (document.querySelector('.spec-container ul.list-unstyled.m-0 li')) return true;
+return document.readyState === 'complete';
+"""
+
+# Search listing pages for any satnow category, e.g. "power-inductors"
+LISTING_URL_TEMPLATE = "https://www.satnow.com/search/{category}/filters?page={page}&country=global"
+
+# Product links on the two search listing layouts
+LISTING_LINK_XPATHS = (
+    "//*[@id='pnlLatestProductsBox']/div[2]/div[1]/ul/li/a",
+    "//*[@id='ContentPlaceHolder1_dListItems']/div/div[2]/div[1]/h3/a",
+)
+
+LISTING_CONTAINER_XPATH = "//*[@id='pnlLatestProductsBox' or @id='ContentPlaceHolder1_dListItems']"
+
+# A listing page is ready once product links are present, or the load has
+# finished on a page past the last one, which has no results
+LISTING_READY_SCRIPT = """
+for (const xpath of arguments[0]) {
+  if (document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue) return true;
+}
+return document.readyState === 'complete';
+"""
+
+# Selectors compiled once to XPath and reused for every page
+PART_NUMBER_SELECTOR = CSSSelector('div.d-block.detail p')
+MANUFACTURER_SELECTOR = CSSSelector('div#CatByManu')
+DESCRIPTION_SELECTOR = CSSSelector('span#ContentPlaceHolder1_lblPartDescription')
+PRODUCT_NAME_SELECTOR = CSSSelector('div.d-block.detail h1')
+SPEC_CONTAINER_SELECTOR = CSSSelector('.spec-container')
+SPEC_ITEM_SELECTOR = CSSSelector('.spec-container ul.list-unstyled.m-0 li')
+SPEC_FIELD_SELECTOR = CSSSelector('.field')
+SPEC_VALUE_SELECTOR = CSSSelector('.value')
+LEGACY_SPECS_SELECTOR = CSSSelector('div.specs span#ContentPlaceHolder1_lblValues')
+NOTES_SELECTOR = CSSSelector('div.featured-native-bottom div.featured-text')
+DETAIL_HEADER_SELECTOR = CSSSelector('div.d-block.detail')
+
+# The parts of a product page that feed the extracted record; a delta re-scrape
+# skips pages where none of them changed
+FINGERPRINT_SELECTORS = [
+    DETAIL_HEADER_SELECTOR,
+    MANUFACTURER_SELECTOR,
+    DESCRIPTION_SELECTOR,
+    SPEC_CONTAINER_SELECTOR,
+    LEGACY_SPECS_SELECTOR,
+    NOTES_SELECTOR,
+]
+
+# Returned instead of a product when a delta re-scrape finds the page unchanged
+UNCHANGED = object()
+
+# Bump when extraction changes, so the next delta re-scrape emits every product again
+EXTRACTOR_VERSION = 2
+
+def extract_product_details(driver, timings=None):
     """Extracts product details including General Parameters using JavaScript."""
     try:
+        started = time.perf_counter()
         soup = BeautifulSoup(driver.page_source, 'html.parser')
         product = {}
 
@@ -307,8 +376,10 @@ def extract_product_details(driver):
         });
         return JSON.stringify(params);
         """
+        script_started = time.perf_counter()
         general_parameters_json = driver.execute_script(js_code)
         general_parameters = json.loads(general_parameters_json)
+        script_seconds = time.perf_counter() - script_started
 
         # Map extracted parameters to desired names
         mapped_parameters = {COLUMN_MAPPING.get(k, k): v for k, v in general_parameters.items()}
@@ -318,51 +389,1574 @@ def extract_product_details(driver):
         notes_element = soup.select_one('div.featured-native-bottom div.featured-text')
         product['Notes'] = notes_element.text.strip() if notes_element else "N/A"
 
+        if timings is not None:
+            timings['script_s'] = script_seconds
+            timings['parse_s'] = time.perf_counter() - started - script_seconds
         return product
     except Exception as e:
         print(f" Error extracting product details: {e}")
         return None
 
-def main(urls):
-    """Main function to scrape product details."""
+def first_text(selector, tree):
+    """Returns the text of the first element matched by selector, or None."""
+    elements = selector(tree)
+    return elements[0].text_content() if elements else None
+
+def parse_legacy_specs(specs_text):
+    """Parses the older ContentPlaceHolder1_lblValues block the same way as the first script's JavaScript."""
+    parameters = {}
+    lines = specs_text.split('\n')
+    current_category = None
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        i += 1
+        if line == '':
+            continue
+
+        if 'General Parameters' in line:
+            current_category = 'General Parameters'
+            continue
+        if 'Product Details' in line:
+            current_category = 'Product Details'
+            continue
+        if 'Technical Documents' in line:
+            current_category = 'Technical Documents'
+            continue
+
+        if current_category in ('General Parameters', 'Product Details'):
+            parts = line.split(' ')
+            key = ' '.join(parts[:-1]).strip()
+            value = parts[-1].strip()
+            if key and value:
+                parameters[key] = value
+            elif i < len(lines):
+                parameters[line] = lines[i].strip()
+                i += 1
+    return parameters
+
+def extract_product_details_from_html(html, require_specs=False):
+    """Extracts product details from one HTML snapshot in a single lxml pass.
+
+    Returns None when require_specs is set and the page has neither the
+    spec container nor the older lblValues block.
+    """
+    try:
+        tree = lxml_html.fromstring(html)
+    except Exception as e:
+        print(f" Error extracting product details: {e}")
+        return None
+    return extract_product_details_from_tree(tree, require_specs)
+
+def extract_product_details_from_tree(tree, require_specs=False):
+    """Extracts product details from a parsed lxml tree; see extract_product_details_from_html."""
+    try:
+        # Extract General Parameters from the spec list, or the older lblValues layout
+        general_parameters = {}
+        if SPEC_CONTAINER_SELECTOR(tree):
+            for item in SPEC_ITEM_SELECTOR(tree):
+                key_elements = SPEC_FIELD_SELECTOR(item)
+                value_elements = SPEC_VALUE_SELECTOR(item)
+                key = ' '.join(key_elements[0].text_content().split()) if key_elements else ""
+                value = ' '.join(value_elements[0].text_content().split()) if value_elements else ""
+                if key and value:
+                    general_parameters[key] = value
+        else:
+            legacy_specs = first_text(LEGACY_SPECS_SELECTOR, tree)
+            if legacy_specs is None:
+                # Without either block the parameters are rendered client-side
+                if require_specs:
+                    return None
+            else:
+                general_parameters = split_glued_parameters(parse_legacy_specs(legacy_specs))
+
+        product = {}
+
+        # Extract Part Number
+        part_number = first_text(PART_NUMBER_SELECTOR, tree)
+        product['Part Number'] = part_number.split(':')[1].strip() if part_number else "N/A"
+
+        # Extract Manufacturer
+        manufacturer = first_text(MANUFACTURER_SELECTOR, tree)
+        product['Manufacturer'] = manufacturer.split('by')[1].strip().split('\n')[0].strip() if manufacturer else "N/A"
+
+        # Extract Description
+        description = first_text(DESCRIPTION_SELECTOR, tree)
+        product['Description'] = description.strip() if description else "N/A"
+
+        # Extract Product Name
+        product_name = first_text(PRODUCT_NAME_SELECTOR, tree)
+        product['Product Name'] = product_name.strip() if product_name else "N/A"
+
+        # Map extracted parameters to desired names
+        mapped_parameters = {COLUMN_MAPPING.get(k, k): v for k, v in general_parameters.items()}
+        product['General Parameters'] = mapped_parameters if mapped_parameters else "N/A"
+
+        # Extract Notes
+        notes = first_text(NOTES_SELECTOR, tree)
+        product['Notes'] = notes.strip() if notes else "N/A"
+
+        return product
+    except Exception as e:
+        print(f" Error extracting product details: {e}")
+        return None
+
+def page_fingerprint(tree):
+    """Hashes the text of the detail header, spec list and notes of a parsed product page."""
+    # Extractor and column mapping changes alter every record, so they invalidate every fingerprint too
+    digest = hashlib.sha256(json.dumps([EXTRACTOR_VERSION, COLUMN_MAPPING], sort_keys=True).encode('utf-8'))
+    for selector in FINGERPRINT_SELECTORS:
+        for element in selector(tree):
+            digest.update(' '.join(element.text_content().split()).encode('utf-8'))
+            digest.update(b'\x1f')
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+def create_driver(lean=True, blocked_domains=None):
+    """Creates a headless Chrome driver for scraping.
+
+    The lean profile blocks images, media, fonts and third-party domains and
+    returns from driver.get at DOMContentLoaded (eager page loads).
+    """
     chrome_options = ChromeOptions()
     chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")  
     chrome_options.add_argument("--disable-dev-shm-usage")  
     chrome_options.add_argument("--disable-gpu")  
 
+    # Network events in the performance log are used to count bytes per page
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    if lean:
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+        })
+
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+
+    if lean:
+        domains = BLOCKED_DOMAINS if blocked_domains is None else blocked_domains
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {
+            "urls": BLOCKED_URL_PATTERNS + [f"*{domain}*" for domain in domains],
+        })
+    return driver
+
+def page_network_stats(driver):
+    """Sums the network events logged since the last call: bytes, requests and blocked requests."""
+    stats = {'bytes': 0, 'requests': 0, 'blocked': 0}
     try:
-        driver = webdriver.Chrome(options=chrome_options)
-    except Exception as e:
-        print(f" Error initializing WebDriver: {e}")
-        return
+        entries = driver.get_log("performance")
+    except Exception:
+        return stats
+
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            stats['bytes'] += int(message["params"].get("encodedDataLength", 0))
+            stats['requests'] += 1
+        elif message["method"] == "Network.loadingFailed":
+            stats['requests'] += 1
+            if message["params"].get("blockedReason"):
+                stats['blocked'] += 1
+    return stats
+
+# A Chrome session is replaced after this many pages or once its process tree uses this much memory
+DRIVER_MAX_PAGES = 100
+DRIVER_MAX_RSS_MB = 1536
+
+# WebDriver errors that mean the browser or chromedriver died, rather than the page misbehaving
+DRIVER_CRASH_MESSAGES = (
+    "invalid session id",
+    "session deleted",
+    "chrome not reachable",
+    "disconnected",
+    "tab crashed",
+    "no such window",
+    "target window already closed",
+)
+
+def is_driver_crash(error):
+    """Returns True when error means the Chrome session itself is gone."""
+    if isinstance(error, TimeoutException):
+        return False
+    if isinstance(error, WebDriverException):
+        message = str(error).lower()
+        return any(marker in message for marker in DRIVER_CRASH_MESSAGES)
+    # chromedriver no longer listening on its port
+    return isinstance(error, (ConnectionError, urllib3.exceptions.HTTPError))
+
+def kill_process_tree(processes, timeout=5):
+    """Terminates processes, killing any that are still running after timeout seconds."""
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
 
-    all_products = []
+def cleanup_orphaned_chromedrivers():
+    """Kills chromedriver processes left behind by scrapers that died, with their Chrome children.
 
-    for url in urls:
+    A chromedriver is orphaned when its parent process no longer exists or it
+    has been re-parented to init. Only the current user's processes are touched.
+    """
+    try:
+        user = psutil.Process().username()
+    except psutil.Error:
+        return 0
+
+    killed = 0
+    for process in psutil.process_iter(['name', 'ppid', 'username']):
+        name = (process.info['name'] or '').lower()
+        if not name.startswith('chromedriver') or process.info['username'] != user:
+            continue
+        parent = process.info['ppid']
+        if parent not in (0, 1) and psutil.pid_exists(parent):
+            continue
+        try:
+            tree = process.children(recursive=True) + [process]
+        except psutil.Error:
+            continue
+        kill_process_tree(tree)
+        killed += 1
+
+    if killed:
+        print(f" Cleaned up {killed} orphaned chromedriver process(es).")
+    return killed
+
+class DriverManager:
+    """Owns one Chrome session and replaces it before it grows too large.
+
+    The session is recycled after max_pages pages, or once chromedriver and the
+    Chrome processes it started use more than max_rss_mb of resident memory.
+    Sessions still open when the interpreter exits are shut down with it.
+    """
+
+    live = set()
+    live_lock = threading.Lock()
+
+    def __init__(self, lean=True, max_pages=DRIVER_MAX_PAGES, max_rss_mb=DRIVER_MAX_RSS_MB):
+        self.lean = lean
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.driver = None
+        self.process = None
+        self.pages = 0
+        self.sessions = 0
+
+    def get(self):
+        """Returns the current driver, starting a new session when there is none."""
+        if self.driver is None:
+            self.driver = create_driver(lean=self.lean)
+            self.pages = 0
+            self.sessions += 1
+            try:
+                self.process = psutil.Process(self.driver.service.process.pid)
+            except (AttributeError, psutil.Error):
+                self.process = None
+            with DriverManager.live_lock:
+                DriverManager.live.add(self)
+        return self.driver
+
+    def open_page(self):
+        """Returns the driver to load the next page with, recycling the session first if it is due."""
+        if self.driver is not None:
+            if self.max_pages and self.pages >= self.max_pages:
+                print(f" Recycling Chrome after {self.pages} pages.")
+                self.quit()
+            elif self.max_rss_mb:
+                rss_mb = self.rss_mb()
+                if rss_mb > self.max_rss_mb:
+                    print(f" Recycling Chrome at {rss_mb:.0f} MB RSS after {self.pages} pages.")
+                    self.quit()
+        driver = self.get()
+        self.pages += 1
+        return driver
+
+    def process_tree(self):
+        """Returns chromedriver and every process it started."""
+        if self.process is None:
+            return []
         try:
-            print(f" Processing: {url}")
+            return [self.process] + self.process.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def rss_mb(self):
+        total = 0
+        for process in self.process_tree():
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def quit(self):
+        """Ends the session and kills any of its processes that outlive driver.quit()."""
+        if self.driver is None:
+            return
+        tree = self.process_tree()
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f" Chrome did not quit cleanly: {e}")
+        kill_process_tree([process for process in tree if process.is_running()])
+
+        self.driver = None
+        self.process = None
+        with DriverManager.live_lock:
+            DriverManager.live.discard(self)
+
+    @classmethod
+    def quit_all(cls):
+        with cls.live_lock:
+            managers = list(cls.live)
+        for manager in managers:
+            manager.quit()
+
+atexit.register(DriverManager.quit_all)
+
+def create_http_session(pool_size=4):
+    """Creates a keep-alive HTTP session backed by a connection pool."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HTTP_HEADERS)
+    return session
+
+def product_page_ready(driver):
+    """WebDriverWait condition for the elements the extractor reads."""
+    return driver.execute_script(PAGE_READY_SCRIPT)
+
+def listing_page_ready(driver):
+    """WebDriverWait condition for search listing pages."""
+    return driver.execute_script(LISTING_READY_SCRIPT, list(LISTING_LINK_XPATHS))
+
+def listing_links_from_html(content, page_url):
+    """Returns the absolute product links on a search listing page.
+
+    Returns None when the page has no listing container at all, which means
+    the results are rendered client-side rather than that there are none.
+    """
+    tree = lxml_html.fromstring(content)
+    tree.make_links_absolute(page_url)
+    for xpath in LISTING_LINK_XPATHS:
+        links = tree.xpath(xpath)
+        if links:
+            return [link.get("href") for link in links]
+    return [] if tree.xpath(LISTING_CONTAINER_XPATH) else None
+
+class AdaptiveTimeout:
+    """Page wait timeout learned from recent load times, backing off after timeouts."""
+
+    def __init__(self, initial=10, minimum=2, maximum=30, factor=3, history=50):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.samples = deque(maxlen=history)
+        self.floor = 0  # Raised by timeouts, halved by every successful load
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+            self.floor /= 2
+
+    def record_timeout(self, timeout):
+        """Counts a load that gave up after timeout seconds and doubles the wait for the next pages.
+
+        Without this only successful loads would be sampled, and the timeout
+        could only shrink until slow pages were always skipped.
+        """
+        with self.lock:
+            self.samples.append(timeout)
+            self.floor = max(self.floor, 2 * timeout)
+
+    def current(self):
+        """Returns a multiple of the recent p95 load time, clamped to [minimum, maximum]."""
+        with self.lock:
+            floor = self.floor
+            if len(self.samples) < 5:
+                return min(max(self.initial, floor), self.maximum)
+            ordered = sorted(self.samples)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return min(max(p95 * self.factor, self.minimum, floor), self.maximum)
+
+class ScrapeMetrics:
+    """Appends per-URL timing and transfer rows to a CSV metrics file."""
+
+    FIELDS = ["url", "mode", "status", "cache", "navigate_s", "wait_s", "parse_s", "script_s", "total_s",
+              "load_s", "bytes", "requests", "blocked"]
+
+    def __init__(self, path="scrape_metrics.csv"):
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.FIELDS, extrasaction="ignore")
+        if write_header:
+            self.writer.writeheader()
+        self.lock = threading.Lock()
+        self.pages = 0
+        self.total_bytes = 0
+        self.total_load_s = 0.0
+
+    def record(self, url, timings):
+        timings['load_s'] = timings.get('navigate_s', 0) + timings.get('wait_s', 0)
+        row = {field: "" for field in self.FIELDS}
+        row.update({key: round(value, 4) if isinstance(value, float) else value for key, value in timings.items()})
+        row["url"] = url
+        with self.lock:
+            self.writer.writerow(row)
+            self.file.flush()
+            self.pages += 1
+            self.total_bytes += timings.get('bytes', 0)
+            self.total_load_s += timings['load_s']
+
+    def close(self):
+        if self.pages:
+            print(f" {self.pages} pages: {self.total_bytes / 1024 / 1024:.1f} MB transferred, "
+                  f"{self.total_bytes / self.pages / 1024:.1f} KB and {self.total_load_s / self.pages:.2f} s load per page")
+        self.file.close()
+
+class PageCache:
+    """Content-addressed on-disk HTML cache keyed by URL, with LRU eviction.
+
+    Pages fetched over HTTP keep their ETag/Last-Modified so they can be
+    revalidated; browser-rendered pages have no validators and are served
+    until they are older than ttl seconds.
+    """
+
+    def __init__(self, directory="page_cache", max_bytes=512 * 1024 * 1024, ttl=24 * 3600):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                rendered INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self.db.commit()
+
+    def blob_path(self, content_hash):
+        return os.path.join(self.directory, content_hash[:2], content_hash + ".html.gz")
+
+    def get(self, url):
+        """Returns the cached entry for url as a dict, or None."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT content_hash, etag, last_modified, rendered, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                with gzip.open(self.blob_path(row[0]), "rb") as f:
+                    content = f.read()
+            except OSError:
+                # The blob was removed behind our back; forget the entry
+                self.db.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self.db.commit()
+                return None
+            self.db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+        return {
+            'content': content,
+            'etag': row[1],
+            'last_modified': row[2],
+            'rendered': bool(row[3]),
+            'fetched_at': row[4],
+        }
+
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def touch(self, url):
+        """Marks a cached page as revalidated."""
+        with self.lock:
+            now = time.time()
+            self.db.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.db.commit()
+
+    def put(self, url, content, etag=None, last_modified=None, rendered=False):
+        """Stores a page, sharing the blob with any other URL that has identical content."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        content_hash = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(content_hash)
+
+        with self.lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary_path = f"{path}.{threading.get_ident()}.tmp"
+                with gzip.open(temporary_path, "wb") as f:
+                    f.write(content)
+                os.replace(temporary_path, path)
+
+            previous = self.db.execute("SELECT content_hash FROM pages WHERE url = ?", (url,)).fetchone()
+            now = time.time()
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, content_hash, os.path.getsize(path), etag, last_modified, int(rendered), now, now),
+            )
+            if previous and previous[0] != content_hash:
+                self.remove_orphan_blob(previous[0])
+            self.evict()
+            self.db.commit()
+
+    def remove_orphan_blob(self, content_hash):
+        in_use = self.db.execute("SELECT 1 FROM pages WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone()
+        if not in_use:
+            try:
+                os.remove(self.blob_path(content_hash))
+            except OSError:
+                pass
+
+    def evict(self):
+        """Drops least recently used pages until the cache is under max_bytes."""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        while total > self.max_bytes:
+            row = self.db.execute("SELECT url, content_hash, size FROM pages ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self.db.execute("DELETE FROM pages WHERE url = ?", (row[0],))
+            self.remove_orphan_blob(row[1])
+            total -= row[2]
+
+    def close(self):
+        self.db.close()
+
+class ProductFingerprints:
+    """Fingerprints and last records of the product pages seen in earlier runs, for delta re-scrapes.
+
+    New fingerprints are staged in memory and only stored by commit() once
+    their records have been flushed to the output, so a crash never hides a
+    change from the next run.
+    """
+
+    def __init__(self, path="product_fingerprints.sqlite3"):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS products (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT,
+                fingerprint TEXT NOT NULL,
+                record TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.db.commit()
+        self.staged = {}  # url -> (content_hash, fingerprint, record), or None to delete
+        self.missing = set()  # URLs that answered 404/410 in this run
+        self.changes = {'new': 0, 'changed': 0, 'unchanged': 0, 'removed': 0}
+
+    def lookup(self, url):
+        """Returns the stored (content_hash, fingerprint) for url, or None."""
+        with self.lock:
+            return self.db.execute("SELECT content_hash, fingerprint FROM products WHERE url = ?", (url,)).fetchone()
+
+    def unchanged(self, url, content_hash=None):
+        """Counts url as unchanged, remembering a new content hash for its identical fingerprint."""
+        with self.lock:
+            self.changes['unchanged'] += 1
+            if content_hash is not None:
+                self.db.execute(
+                    "UPDATE products SET content_hash = ?, updated_at = ? WHERE url = ?", (content_hash, time.time(), url)
+                )
+                self.db.commit()
+
+    def stage(self, url, content_hash, fingerprint, record, known):
+        """Stages a new or changed product and returns 'new' or 'changed'."""
+        change = 'changed' if known else 'new'
+        with self.lock:
+            self.staged[url] = (content_hash, fingerprint, record)
+            self.changes[change] += 1
+        return change
+
+    def stage_removals(self, seen_urls):
+        """Stages the removal of stored products not in seen_urls or missing in this run.
+
+        Returns their (url, last record) pairs.
+        """
+        with self.lock:
+            rows = self.db.execute("SELECT url, record FROM products").fetchall()
+            removed = [
+                (url, json.loads(record)) for url, record in rows
+                if (url not in seen_urls or url in self.missing) and url not in self.staged
+            ]
+            for url, _ in removed:
+                self.staged[url] = None
+            self.changes['removed'] += len(removed)
+        return removed
+
+    def commit(self, urls):
+        """Stores the staged fingerprints of urls, whose records have reached the output."""
+        with self.lock:
+            now = time.time()
+            for url in urls:
+                if url not in self.staged:
+                    continue
+                staged = self.staged.pop(url)
+                if staged is None:
+                    self.db.execute("DELETE FROM products WHERE url = ?", (url,))
+                else:
+                    content_hash, fingerprint, record = staged
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)",
+                        (url, content_hash, fingerprint, json.dumps(record, ensure_ascii=False), now),
+                    )
+            self.db.commit()
+
+    def summary(self):
+        return ", ".join(f"{count} {change}" for change, count in self.changes.items())
+
+    def close(self):
+        self.db.close()
+
+class RetryableResponse(requests.HTTPError):
+    """A 429 or 5xx response that is worth retrying after a backoff."""
+
+def is_throttled(error):
+    """True for a 429 that outlasted the retries; the browser would only hit the same limit."""
+    return isinstance(error, RetryableResponse) and getattr(error.response, 'status_code', None) == 429
+
+class PageNotFound(Exception):
+    """The server says the page does not exist, so the browser is not tried."""
+
+class RequestScheduler:
+    """Per-host politeness and retry scheduler shared by all fetchers.
+
+    Each host has a token bucket (rate requests/second, up to burst at once)
+    and a concurrency limit. Failed attempts are retried with exponential
+    backoff and full jitter; when a host's recent error rate rises, its
+    rate and concurrency are halved, and they grow back slowly while
+    requests succeed.
+    """
+
+    RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, RetryableResponse, TimeoutException)
+
+    def __init__(self, rate=5.0, burst=10, max_concurrency=8, max_retries=4, base_delay=1.0, max_delay=60.0,
+                 error_threshold=0.25, window=20):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.error_threshold = error_threshold
+        self.window = window
+        self.condition = threading.Condition()
+        self.hosts = {}
+
+    def host_state(self, url):
+        host = urlsplit(url).netloc.lower()
+        if host not in self.hosts:
+            self.hosts[host] = {
+                'tokens': float(self.burst),
+                'updated': time.monotonic(),
+                'rate': self.rate,
+                'limit': self.max_concurrency,
+                'in_flight': 0,
+                'paused_until': 0.0,
+                'outcomes': deque(maxlen=self.window),
+                'last_decrease': 0.0,
+                'successes': 0,
+            }
+        return self.hosts[host]
+
+    def acquire(self, url):
+        """Blocks until the host has a free concurrency slot and a token."""
+        with self.condition:
+            state = self.host_state(url)
+            while True:
+                now = time.monotonic()
+                state['tokens'] = min(self.burst, state['tokens'] + (now - state['updated']) * state['rate'])
+                state['updated'] = now
+                if now < state['paused_until']:
+                    self.condition.wait(state['paused_until'] - now)
+                elif state['in_flight'] >= state['limit']:
+                    self.condition.wait()
+                elif state['tokens'] < 1:
+                    self.condition.wait((1 - state['tokens']) / state['rate'])
+                else:
+                    state['tokens'] -= 1
+                    state['in_flight'] += 1
+                    return
+
+    def release(self, url, ok, pause=0.0):
+        """Records the outcome of a request and adapts the host's rate and concurrency."""
+        with self.condition:
+            state = self.host_state(url)
+            state['in_flight'] -= 1
+            state['outcomes'].append(ok)
+            now = time.monotonic()
+            if pause:
+                state['paused_until'] = max(state['paused_until'], now + pause)
+
+            error_rate = state['outcomes'].count(False) / len(state['outcomes'])
+            if not ok and error_rate > self.error_threshold and now - state['last_decrease'] > 5:
+                state['limit'] = max(1, state['limit'] // 2)
+                state['rate'] = max(self.rate / 16, state['rate'] / 2)
+                state['last_decrease'] = now
+                state['successes'] = 0
+                print(f" Backing off {urlsplit(url).netloc}: {state['limit']} concurrent, {state['rate']:.2f} req/s")
+            elif ok:
+                state['successes'] += 1
+                if state['successes'] >= 2 * state['limit']:
+                    state['limit'] = min(self.max_concurrency, state['limit'] + 1)
+                    state['rate'] = min(self.rate, state['rate'] * 1.25)
+                    state['successes'] = 0
+            self.condition.notify_all()
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def run(self, url, request):
+        """Calls request() under the host's limits, retrying transient failures."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(url)
+            try:
+                result = request()
+            except self.RETRYABLE_ERRORS as e:
+                delay = self.backoff(attempt)
+                retry_after = getattr(getattr(e, 'response', None), 'headers', {}).get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = max(delay, min(self.max_delay, int(retry_after)))
+                self.release(url, False, pause=delay if isinstance(e, RetryableResponse) else 0.0)
+                if attempt == self.max_retries:
+                    raise
+                print(f" Retrying {url} in {delay:.1f}s after: {e}")
+                time.sleep(delay)
+            except Exception:
+                self.release(url, False)
+                raise
+            else:
+                self.release(url, True)
+                return result
+
+class PageFetcher:
+    """Fetches product pages over HTTP and falls back to a browser started on demand."""
+
+    def __init__(self, session=None, wait_timeout=None, metrics=None, cache=None, scheduler=None, lean=True,
+                 fingerprints=None):
+        self.session = session
+        self.wait_timeout = wait_timeout or AdaptiveTimeout()
+        self.metrics = metrics
+        self.cache = cache
+        self.scheduler = scheduler
+        self.drivers = DriverManager(lean)
+        self.fingerprints = fingerprints
+
+    def get_driver(self):
+        return self.drivers.get()
+
+    @staticmethod
+    def add_network_stats(driver, timings):
+        """Adds the browser's bytes and request counts for the page just loaded."""
+        for key, value in page_network_stats(driver).items():
+            timings[key] = timings.get(key, 0) + value
+
+    @staticmethod
+    def add_response_bytes(response, timings):
+        # Content-Length is the compressed size on the wire when the server sends it
+        size = response.headers.get('Content-Length')
+        timings['bytes'] = timings.get('bytes', 0) + (int(size) if size and size.isdigit() else len(response.content))
+        timings['requests'] = timings.get('requests', 0) + 1
+
+    def http_get(self, url, headers=None):
+        """GETs url through the scheduler, retrying timeouts, 429 and 5xx responses."""
+        def request():
+            response = self.session.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+            if response.status_code == 429 or response.status_code >= 500:
+                raise RetryableResponse(f"{response.status_code} for url: {url}", response=response)
+            return response
+
+        if self.scheduler is None:
+            return request()
+        return self.scheduler.run(url, request)
+
+    def navigate(self, driver, url):
+        """Loads url in the browser through the scheduler, retrying page load timeouts."""
+        if self.scheduler is None:
             driver.get(url)
-            time.sleep(3)  # Allow time for page to load
+        else:
+            self.scheduler.run(url, lambda: driver.get(url))
 
-            # Extract product details
-            product_details = extract_product_details(driver)
+    def with_browser(self, url, action):
+        """Returns action(driver) for url, restarting a crashed Chrome and retrying url once."""
+        for attempt in range(2):
+            driver = self.drivers.open_page()
+            try:
+                return action(driver)
+            except Exception as e:
+                if attempt or not is_driver_crash(e):
+                    raise
+                print(f" Chrome crashed while loading {url}, restarting it: {e}")
+                self.drivers.quit()
+
+    def scrape(self, url):
+        """Extracts product details, trying plain HTTP before the browser."""
+        print(f" Processing: {url}")
+        timings = {'status': 'error'}
+        started = time.perf_counter()
+        try:
+            product = self.scrape_cached_render(url, timings)
+            if not product and self.session is not None:
+                timings['mode'] = 'http'
+                try:
+                    product = self.scrape_http(url, timings)
+                except PageNotFound as e:
+                    print(f" Page not found, skipping: {e}")
+                    timings['status'] = 'not_found'
+                    if self.fingerprints is not None:
+                        self.fingerprints.missing.add(url)
+                    return None
+            if not product:
+                timings['mode'] = 'http+browser' if self.session is not None else 'browser'
+                product = self.scrape_browser(url, timings)
+            if product is UNCHANGED:
+                timings['status'] = 'unchanged'
+            elif timings['status'] == 'error':
+                timings['status'] = 'ok' if product else 'no_data'
+            return product
+        finally:
+            timings['total_s'] = time.perf_counter() - started
+            if self.metrics is not None:
+                self.metrics.record(url, timings)
+
+    def scrape_cached_render(self, url, timings):
+        """Serves a browser-rendered page from the cache while it is within the TTL."""
+        if self.cache is None:
+            return None
+        entry = self.cache.get(url)
+        if entry is None or not entry['rendered'] or not self.cache.is_fresh(entry):
+            return None
+
+        timings['mode'] = 'cache'
+        timings['cache'] = 'hit'
+        return self.extract(url, entry['content'], timings)
+
+    def extract(self, url, content, timings, require_specs=False):
+        """Extracts the product from a page, tagged with its URL, or returns UNCHANGED if delta mode has seen it."""
+        parse_started = time.perf_counter()
+        try:
+            if self.fingerprints is None:
+                product = extract_product_details_from_html(content, require_specs)
+                return dict(product, URL=url) if product else product
+
+            # Byte-identical pages are recognised without parsing them at all
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            content_hash = hashlib.sha256(content).hexdigest()
+            known = self.fingerprints.lookup(url)
+            if known is not None and known[0] == content_hash:
+                self.fingerprints.unchanged(url)
+                return UNCHANGED
 
-            if product_details:
-                print(f" Successfully extracted: {product_details}")  # Debugging output
-                all_products.append(product_details)
+            try:
+                tree = lxml_html.fromstring(content)
+            except Exception as e:
+                print(f" Error extracting product details: {e}")
+                return None
+            if require_specs and not (SPEC_CONTAINER_SELECTOR(tree) or LEGACY_SPECS_SELECTOR(tree)):
+                return None
+
+            # Otherwise only the parts that feed the record are compared
+            fingerprint = page_fingerprint(tree)
+            if known is not None and known[1] == fingerprint:
+                self.fingerprints.unchanged(url, content_hash)
+                return UNCHANGED
+
+            product = extract_product_details_from_tree(tree, require_specs)
+            if product:
+                change = self.fingerprints.stage(url, content_hash, fingerprint, product, known is not None)
+                product = dict(product, URL=url, Change=change)
+            return product
+        finally:
+            timings['parse_s'] = timings.get('parse_s', 0) + time.perf_counter() - parse_started
+
+    def scrape_http(self, url, timings):
+        # Revalidate pages cached from an earlier HTTP fetch with a conditional request
+        entry = self.cache.get(url) if self.cache is not None else None
+        headers = {}
+        if entry is not None and not entry['rendered']:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            fetch_started = time.perf_counter()
+            response = self.http_get(url, headers)
+            if response.status_code in (404, 410):
+                raise PageNotFound(url)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.RequestException as e:
+            if is_throttled(e):
+                raise
+            print(f" HTTP fetch failed, falling back to browser: {e}")
+            return None
+        finally:
+            timings['navigate_s'] = time.perf_counter() - fetch_started
+
+        self.add_response_bytes(response, timings)
+        if response.status_code == 304 and headers:
+            self.cache.touch(url)
+            content = entry['content']
+            timings['cache'] = 'revalidated'
+        else:
+            content = response.content
+            if self.cache is not None:
+                self.cache.put(
+                    url,
+                    content,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                )
+                timings['cache'] = 'miss'
+
+        product = self.extract(url, content, timings, require_specs=True)
+        if product is None:
+            print(f" No spec container in HTML, falling back to browser: {url}")
+        return product
+
+    def scrape_browser(self, url, timings):
+        return self.with_browser(url, lambda driver: self.load_product_page(driver, url, timings))
+
+    def load_product_page(self, driver, url, timings):
+        navigate_started = time.perf_counter()
+        self.navigate(driver, url)
+        timings['navigate_s'] = timings.get('navigate_s', 0) + time.perf_counter() - navigate_started
+
+        # Wait for the elements the extractor reads instead of a fixed sleep
+        wait_started = time.perf_counter()
+        timeout = self.wait_timeout.current()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(product_page_ready)
+        except TimeoutException:
+            self.wait_timeout.record_timeout(timeout)
+            timings['wait_s'] = time.perf_counter() - wait_started
+            timings['status'] = 'timeout'
+            self.add_network_stats(driver, timings)
+            print(f" Timeout waiting for product details on {url}. Skipping.")
+            return None
+        timings['wait_s'] = time.perf_counter() - wait_started
+        self.add_network_stats(driver, timings)
+        self.wait_timeout.record(time.perf_counter() - navigate_started)
+
+        # Extract product details from a single DOM snapshot
+        page_source = driver.page_source
+        if self.cache is not None:
+            self.cache.put(url, page_source, rendered=True)
+        return self.extract(url, page_source, timings)
+
+    def fetch_listing(self, url):
+        """Returns the product links on a search listing page; an empty list means no results."""
+        print(f" Listing: {url}")
+        timings = {'mode': 'listing', 'status': 'error'}
+        started = time.perf_counter()
+        try:
+            links = None
+
+            # Listing pages gain products over time, so cached copies are only used within the TTL
+            if self.cache is not None:
+                entry = self.cache.get(url)
+                if entry is not None and self.cache.is_fresh(entry):
+                    timings['cache'] = 'hit'
+                    links = listing_links_from_html(entry['content'], url) or None
+
+            if links is None and self.session is not None:
+                try:
+                    fetch_started = time.perf_counter()
+                    response = self.http_get(url)
+                    timings['navigate_s'] = time.perf_counter() - fetch_started
+                    self.add_response_bytes(response, timings)
+                    if response.status_code in (404, 410):
+                        # Past the last page of the category
+                        return []
+                    response.raise_for_status()
+                    links = listing_links_from_html(response.content, url)
+                    if links and self.cache is not None:
+                        self.cache.put(url, response.content)
+                except requests.RequestException as e:
+                    if is_throttled(e):
+                        raise
+                    print(f" HTTP fetch failed, falling back to browser: {e}")
+
+            if links is None:
+                links = self.with_browser(url, lambda driver: self.load_listing_page(driver, url, timings))
+
+            timings['status'] = 'ok' if links else 'empty'
+            return links
+        finally:
+            timings['total_s'] = time.perf_counter() - started
+            if self.metrics is not None:
+                self.metrics.record(url, timings)
+
+    def load_listing_page(self, driver, url, timings):
+        navigate_started = time.perf_counter()
+        self.navigate(driver, url)
+        timings['navigate_s'] = timings.get('navigate_s', 0) + time.perf_counter() - navigate_started
+
+        # Returns as soon as links appear, or the page finished loading without any
+        wait_started = time.perf_counter()
+        timeout = self.wait_timeout.current()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(listing_page_ready)
+        except TimeoutException:
+            self.wait_timeout.record_timeout(timeout)
+            raise
+        finally:
+            timings['wait_s'] = time.perf_counter() - wait_started
+            self.add_network_stats(driver, timings)
+
+        page_source = driver.page_source
+        links = listing_links_from_html(page_source, url) or []
+        if links and self.cache is not None:
+            self.cache.put(url, page_source, rendered=True)
+        return links
+
+    def close(self):
+        self.drivers.quit()
+
+def crawl_category_listing(category, window=4, max_pages=200, http_first=True, cache_dir="page_cache",
+                           metrics_path=None, make_fetcher=None):
+    """Yields (page, product_urls) for a satnow search category, stopping at its last page.
+
+    Up to window pages are fetched concurrently. Pages are yielded in order,
+    and the crawl stops at the first page that has no results or repeats
+    the previous page's links. make_fetcher lets a caller share its own
+    session, cache and metrics instead of opening new ones.
+    """
+    session = cache = metrics = None
+    if make_fetcher is None:
+        cleanup_orphaned_chromedrivers()
+        session = create_http_session(pool_size=window) if http_first else None
+        wait_timeout = AdaptiveTimeout()
+        metrics = ScrapeMetrics(metrics_path) if metrics_path else None
+        cache = PageCache(cache_dir) if cache_dir else None
+        scheduler = RequestScheduler(max_concurrency=window)
+        make_fetcher = lambda: PageFetcher(session, wait_timeout, metrics, cache, scheduler)
+
+    # One fetcher (and at most one Chrome instance) per pool thread
+    fetchers = []
+    local = threading.local()
+
+    def fetch(page):
+        if not hasattr(local, 'fetcher'):
+            local.fetcher = make_fetcher()
+            fetchers.append(local.fetcher)
+        return local.fetcher.fetch_listing(LISTING_URL_TEMPLATE.format(category=category, page=page))
+
+    executor = ThreadPoolExecutor(max_workers=window)
+    try:
+        futures = {}
+        next_page = 1
+        while next_page <= min(window, max_pages):
+            futures[next_page] = executor.submit(fetch, next_page)
+            next_page += 1
+
+        previous_links = None
+        page = 1
+        while page in futures:
+            try:
+                links = futures.pop(page).result()
+            except Exception as e:
+                print(f" Skipping page {page} due to error: {e}")
+                links = None
+
+            if links is not None:
+                if not links or set(links) == previous_links:
+                    print(f" Last page of {category} reached at page {page - 1}.")
+                    break
+                previous_links = set(links)
+                yield page, links
+
+            # Keep the window full
+            if next_page <= max_pages:
+                futures[next_page] = executor.submit(fetch, next_page)
+                next_page += 1
+            page += 1
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        for fetcher in fetchers:
+            fetcher.close()
+        if session is not None:
+            session.close()
+        if cache is not None:
+            cache.close()
+        if metrics is not None:
+            metrics.close()
+
+def normalize_url(url):
+    """Canonical form of a URL, used to de-duplicate the frontier."""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+class UrlFrontier:
+    """Persistent, de-duplicated work list of URLs backed by SQLite.
+
+    Each URL is pending, in_progress, done or failed, with an attempt count.
+    Opening the frontier again resumes an interrupted crawl: URLs left
+    in_progress by a crash and failed URLs with attempts to spare go back
+    to pending.
+    """
+
+    def __init__(self, path="url_frontier.sqlite3", max_attempts=3):
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at REAL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS urls_state_position ON urls (state, position)")
+        self.db.execute("UPDATE urls SET state = 'pending' WHERE state = 'in_progress'")
+        self.db.execute(
+            "UPDATE urls SET state = 'pending' WHERE state = 'failed' AND attempts < ?", (self.max_attempts,)
+        )
+        self.db.commit()
+
+    def add(self, urls):
+        """Adds URLs that are not yet known and returns the new (position, url) entries."""
+        with self.lock:
+            position = self.db.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM urls").fetchone()[0]
+            added = []
+            for url in urls:
+                url = normalize_url(url)
+                cursor = self.db.execute(
+                    "INSERT OR IGNORE INTO urls (url, position, updated_at) VALUES (?, ?, ?)",
+                    (url, position, time.time()),
+                )
+                if cursor.rowcount:
+                    added.append((position, url))
+                    position += 1
+            self.db.commit()
+        return added
+
+    def pending(self):
+        """Returns the pending (position, url) entries in order."""
+        with self.lock:
+            return self.db.execute(
+                "SELECT position, url FROM urls WHERE state = 'pending' ORDER BY position"
+            ).fetchall()
+
+    def start(self, url):
+        """Marks a URL handed out by some other route than claim() as in_progress."""
+        with self.lock:
+            self.db.execute(
+                "UPDATE urls SET state = 'in_progress', attempts = attempts + 1, updated_at = ? WHERE url = ?",
+                (time.time(), url),
+            )
+            self.db.commit()
+
+    def claim(self):
+        """Marks the next pending URL in_progress and returns (position, url), or None when none are left."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT position, url FROM urls WHERE state = 'pending' ORDER BY position LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE urls SET state = 'in_progress', attempts = attempts + 1, updated_at = ? WHERE url = ?",
+                (time.time(), row[1]),
+            )
+            self.db.commit()
+        return row
+
+    def mark_done(self, urls):
+        with self.lock:
+            now = time.time()
+            self.db.executemany(
+                "UPDATE urls SET state = 'done', last_error = NULL, updated_at = ? WHERE url = ?",
+                [(now, url) for url in urls],
+            )
+            self.db.commit()
+
+    def requeue_done(self):
+        """Moves done URLs back to pending so they are visited again, keeping their positions."""
+        with self.lock:
+            self.db.execute("UPDATE urls SET state = 'pending', attempts = 0, updated_at = ? WHERE state = 'done'",
+                            (time.time(),))
+            self.db.commit()
+
+    def mark_failed(self, url, error):
+        """Records a failure; the URL is retried on the next run until max_attempts is reached."""
+        with self.lock:
+            self.db.execute(
+                "UPDATE urls SET state = 'failed', last_error = ?, updated_at = ? WHERE url = ?",
+                (str(error), time.time(), url),
+            )
+            self.db.commit()
+
+    def counts(self):
+        with self.lock:
+            return dict(self.db.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+
+    def close(self):
+        self.db.close()
+
+class JsonLinesWriter:
+    """Appends one compact JSON record per line, flushing every few records or seconds.
+
+    A path ending in .gz is written as gzip. After each flush, on_flush is
+    called with the keys of the records that reached the file, so callers
+    can mark work done only once it is on disk.
+    """
+
+    def __init__(self, path, flush_every=50, flush_seconds=5.0, on_flush=None):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.on_flush = on_flush
+        self.lock = threading.Lock()
+        self.unflushed_keys = []
+        self.last_flush = time.monotonic()
+        self.count = 0
+
+        if path.endswith('.gz'):
+            self.file = gzip.open(path, 'at', encoding='utf-8')
+        else:
+            self.drop_partial_line(path)
+            self.file = open(path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def drop_partial_line(path):
+        """Truncates a torn last line left behind by a crash before appending."""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        with open(path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b'\n':
+                return
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b'\n') + 1)
+
+    def write(self, record, key=None):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with self.lock:
+            self.file.write(line + '\n')
+            self.count += 1
+            if key is not None:
+                self.unflushed_keys.append(key)
+            if (len(self.unflushed_keys) >= self.flush_every
+                    or time.monotonic() - self.last_flush >= self.flush_seconds):
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        keys, self.unflushed_keys = self.unflushed_keys, []
+        self.last_flush = time.monotonic()
+        if keys and self.on_flush is not None:
+            self.on_flush(keys)
+
+    def close(self):
+        with self.lock:
+            self.flush_locked()
+            self.file.close()
+
+class OrderedOutput:
+    """Hands out frontier claims and releases finished records to the writer in claim order."""
+
+    def __init__(self, frontier, writer):
+        self.frontier = frontier
+        self.writer = writer
+        self.lock = threading.Lock()
+        self.in_flight = []  # Heap of claimed positions
+        self.finished = {}  # Position -> (url, record or None)
+
+    def claim(self):
+        # Claiming under our lock keeps the heap in the same order as the frontier
+        with self.lock:
+            claimed = self.frontier.claim()
+            if claimed is not None:
+                heapq.heappush(self.in_flight, claimed[0])
+            return claimed
+
+    def track(self, position):
+        """Registers a position that was handed out outside claim()."""
+        with self.lock:
+            heapq.heappush(self.in_flight, position)
+
+    def finish(self, position, url, record):
+        """Records a finished URL; record is None for failures."""
+        with self.lock:
+            self.finished[position] = (url, record)
+            while self.in_flight and self.in_flight[0] in self.finished:
+                url, record = self.finished.pop(heapq.heappop(self.in_flight))
+                if record is not None:
+                    self.writer.write(record, key=url)
+
+def scrape_worker(frontier, output, fetcher):
+    """Scrapes URLs claimed from the shared frontier with its own fetcher."""
+    # Browser-only workers need Chrome up front; HTTP-first workers start it on first fallback
+    if fetcher.session is None:
+        try:
+            fetcher.get_driver()
         except Exception as e:
-            print(f"Skipping URL due to error: {e}")
+            print(f" Error initializing WebDriver: {e}")
+            return
 
-    # Save results to JSON file
-    if all_products:
-        with open("electronic_component_data.json", "w", encoding="utf-8") as f:
-            json.dump(all_products, f, indent=4)
-        print(" Scraping completed! Data saved in 'electronic_component_data.json'.")
-    else:
-        print(" No data extracted. Please check your URLs or site structure.")
+    try:
+        while True:
+            claimed = output.claim()
+            if claimed is None:
+                break
+            scrape_claimed_url(frontier, output, fetcher, *claimed)
+    finally:
+        fetcher.close()
+
+def scrape_claimed_url(frontier, output, fetcher, position, url):
+    """Scrapes one claimed URL and hands the outcome to the ordered output."""
+    product_details = None
+    try:
+        product_details = fetcher.scrape(url)
+        if product_details is UNCHANGED:
+            # Nothing to emit for a page that has not changed since the last run
+            product_details = None
+            frontier.mark_done([url])
+        elif product_details:
+            print(f" Successfully extracted: {product_details}")  # Debugging output
+        else:
+            frontier.mark_failed(url, "no product details extracted")
+    except Exception as e:
+        print(f"Skipping URL due to error: {e}")
+        frontier.mark_failed(url, e)
+    finally:
+        output.finish(position, url, product_details or None)
+
+def scrape_with_pool(urls, workers=1, http_first=False, metrics_path="scrape_metrics.csv", cache_dir="page_cache",
+                     frontier_path=None, output_path="electronic_component_data.jsonl", fingerprints_path=None):
+    """Scrapes urls with a pool of workers, streaming products to output_path in url order.
+
+    With fingerprints_path set this is a delta re-scrape of the whole catalog
+    in urls: every URL is visited again, but only new, changed and removed
+    products are written, each tagged with its URL and a Change field.
+    With frontier_path set, the frontier is kept in that file and a later
+    call with the same path resumes the crawl, skipping URLs already done;
+    without it every call visits all of urls.
+    Returns the number of records written in this run.
+    """
+    cleanup_orphaned_chromedrivers()
+
+    # An existing frontier file resumes the previous crawl; delete it to start over
+    frontier = UrlFrontier(frontier_path or ":memory:")
+    added = frontier.add(urls)
+    fingerprints = None
+    if fingerprints_path:
+        fingerprints = ProductFingerprints(fingerprints_path)
+        frontier.requeue_done()
+    print(f" Frontier: {len(added)} new URLs, states {frontier.counts()}")
+
+    # Workers share one keep-alive HTTP pool, the learned wait timeout, the page
+    # cache, the metrics file and the per-host request scheduler, but each owns
+    # its own Chrome instance
+    session = create_http_session(pool_size=workers) if http_first else None
+    wait_timeout = AdaptiveTimeout()
+    metrics = ScrapeMetrics(metrics_path) if metrics_path else None
+    cache = PageCache(cache_dir) if cache_dir else None
+    scheduler = RequestScheduler(max_concurrency=workers)
+
+    # URLs are only marked done, and fingerprints stored, once their record has been flushed to the output
+    def on_flush(keys):
+        if fingerprints is not None:
+            fingerprints.commit(keys)
+        frontier.mark_done(keys)
+
+    writer = JsonLinesWriter(output_path, on_flush=on_flush)
+    output = OrderedOutput(frontier, writer)
+
+    pending = frontier.counts().get('pending', 0)
+    threads = [
+        threading.Thread(
+            target=scrape_worker,
+            args=(frontier, output, PageFetcher(session, wait_timeout, metrics, cache, scheduler,
+                                                fingerprints=fingerprints)),
+            daemon=True,
+        )
+        for _ in range(max(1, min(workers, pending)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if fingerprints is not None:
+        # Products that dropped out of the catalog or whose pages are gone
+        for url, record in fingerprints.stage_removals({normalize_url(url) for url in urls}):
+            writer.write(dict(record, URL=url, Change='removed'), key=url)
+
+    writer.close()
+    if fingerprints is not None:
+        print(f" Delta: {fingerprints.summary()}")
+        fingerprints.close()
+    if session is not None:
+        session.close()
+    if cache is not None:
+        cache.close()
+    if metrics is not None:
+        metrics.close()
+        print(f" Per-page timings saved in '{metrics_path}'.")
+
+    print(f" Frontier: states {frontier.counts()}")
+    frontier.close()
+    return writer.count
+
+def discovery_worker(category_queue, frontier, url_queue, window, max_pages, make_fetcher):
+    """Crawls categories from the shared queue and feeds new product URLs to the detail stage."""
+    while True:
+        try:
+            category = category_queue.get_nowait()
+        except queue.Empty:
+            return
+
+        try:
+            for page, product_urls in crawl_category_listing(category, window, max_pages, make_fetcher=make_fetcher):
+                # Only URLs the frontier has not seen are scraped; put() blocks while the detail stage is behind
+                for entry in frontier.add(product_urls):
+                    url_queue.put(entry)
+        except Exception as e:
+            print(f" Skipping category {category} due to error: {e}")
+
+def detail_worker(url_queue, frontier, output, fetcher):
+    """Scrapes product URLs from the discovery queue until it receives the stop marker."""
+    try:
+        while True:
+            entry = url_queue.get()
+            if entry is None:
+                break
+            position, url = entry
+            frontier.start(url)
+            output.track(position)
+            scrape_claimed_url(frontier, output, fetcher, position, url)
+    finally:
+        fetcher.close()
+
+def run_pipeline(categories, listing_workers=2, detail_workers=4, queue_size=100, window=4, max_pages=200,
+                 http_first=True, metrics_path="scrape_metrics.csv", cache_dir="page_cache",
+                 frontier_path=None, output_path="electronic_component_data.jsonl"):
+    """Discovers product URLs in satnow categories and scrapes them in one pipelined run.
+
+    Listing workers push newly discovered URLs onto a bounded queue that
+    detail workers consume straight away, so detail scraping starts with the
+    first listing page and the slower stage sets the overall pace. With
+    frontier_path set, a later run with the same path resumes the crawl.
+    """
+    cleanup_orphaned_chromedrivers()
+    frontier = UrlFrontier(frontier_path or ":memory:")
+    print(f" Frontier: states {frontier.counts()}")
+
+    # Both stages share one HTTP pool, cache, metrics file, learned wait timeout
+    # and request scheduler, so politeness limits cover the whole pipeline
+    session = create_http_session(pool_size=listing_workers * window + detail_workers) if http_first else None
+    wait_timeout = AdaptiveTimeout()
+    metrics = ScrapeMetrics(metrics_path) if metrics_path else None
+    cache = PageCache(cache_dir) if cache_dir else None
+    scheduler = RequestScheduler(max_concurrency=listing_workers * window + detail_workers)
+    make_fetcher = lambda: PageFetcher(session, wait_timeout, metrics, cache, scheduler)
+
+    writer = JsonLinesWriter(output_path, on_flush=frontier.mark_done)
+    output = OrderedOutput(frontier, writer)
+    url_queue = queue.Queue(maxsize=queue_size)
+
+    category_queue = queue.Queue()
+    for category in categories:
+        category_queue.put(category)
+
+    # URLs left pending by an earlier run are fed in before newly discovered ones. The snapshot is
+    # taken before discovery starts, or URLs it adds would also be queued here and scraped twice
+    resumed = frontier.pending()
+
+    def resume_pending():
+        for entry in resumed:
+            url_queue.put(entry)
+
+    producers = [threading.Thread(target=resume_pending, daemon=True)]
+    producers += [
+        threading.Thread(
+            target=discovery_worker,
+            args=(category_queue, frontier, url_queue, window, max_pages, make_fetcher),
+            daemon=True,
+        )
+        for _ in range(max(1, listing_workers))
+    ]
+    consumers = [
+        threading.Thread(target=detail_worker, args=(url_queue, frontier, output, make_fetcher()), daemon=True)
+        for _ in range(max(1, detail_workers))
+    ]
+    for thread in producers + consumers:
+        thread.start()
+
+    # Once discovery is finished, one stop marker per detail worker drains the pipeline
+    for thread in producers:
+        thread.join()
+    for _ in consumers:
+        url_queue.put(None)
+    for thread in consumers:
+        thread.join()
+
+    writer.close()
+    if session is not None:
+        session.close()
+    if cache is not None:
+        cache.close()
+    if metrics is not None:
+        metrics.close()
+        print(f" Per-page timings saved in '{metrics_path}'.")
+
+    print(f" Frontier: states {frontier.counts()}")
+    print(f" Pipeline completed! {writer.count} products appended to '{output_path}'.")
+    frontier.close()
+    return writer.count
+
+def main(urls, workers=1, http_first=False, metrics_path="scrape_metrics.csv", cache_dir="page_cache",
+         frontier_path=None, output_path="electronic_component_data.jsonl", fingerprints_path=None):
+    """Main function to scrape product details."""
+    written = scrape_with_pool(urls, workers, http_first, metrics_path, cache_dir, frontier_path, output_path,
+                               fingerprints_path)
 
-    driver.quit()
+    if written:
+        print(f" Scraping completed! {written} products appended to '{output_path}'.")
+    else:
+        print(" No new data extracted. Please check your URLs or site structure.")
 
 # Example list of product URLs
 urls = ["https://www.satnow.com/products/analog-to-digital-converters/e2v-inc/11-16-ev12aq600",
@@ -785,7 +2379,9 @@ urls = ["https://www.satnow.com/products/analog-to-digital-converters/e2v-inc/11
 ]
 
 if __name__ == "__main__":
-    main(urls)
+    # python satellite_components_webscraping.py [--workers N] [--http-first]
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 1
+    main(urls, workers=workers, http_first="--http-first" in sys.argv)
 
 
 
@@ -794,44 +2390,29 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-# Initialize Chrome WebDriver
-driver = webdriver.Chrome()
-
-# List to store all product URLs
-all_product_urls = []
-
-# Loop through pages 1 to 10
-for page in range(1, 11):
-    url = f"https://www.satnow.com/search/satellite-terminals/filters?page={page}&country=global"
-    driver.get(url)
+def collect_satellite_terminal_urls(window=4, cache_dir="page_cache"):
+    """Collects satellite terminal product URLs from the listing pages."""
+    # List to store all product URLs
+    all_product_urls = []
 
-    try:
-        # Wait until product links are available
-        product_links = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.XPATH, "//*[@id='pnlLatestProductsBox']/div[2]/div[1]/ul/li/a"))
-        )
-
-        # Extract product URLs and store them
-        for link in product_links:
-            product_url = link.get_attribute("href")
+    # Crawl pages 1 to 10, stopping early at the last page
+    for page, product_urls in crawl_category_listing("satellite-terminals", window, max_pages=10, cache_dir=cache_dir):
+        for product_url in product_urls:
             all_product_urls.append(f'"{product_url}"')  # Wrap each URL in double quotes
 
-    except Exception as e:
-        print(f" Skipping page {page} due to error: {e}")
-
-# Close the browser
-driver.quit()
+    # Print all product URLs as double-quoted, comma-separated values
+    output_string = ",".join(all_product_urls)
+    print(output_string)
 
-# Print all product URLs as double-quoted, comma-separated values
-output_string = ",".join(all_product_urls)
-print(output_string)
+    # Save the output to a CSV file
+    output_file = "satellite_terminals_urls.csv"
+    with open(output_file, mode="w", newline="", encoding="utf-8") as file:
+        file.write(output_string)  # Writing URLs in double quotes, separated by commas
 
-# Save the output to a CSV file
-output_file = "satellite_terminals_urls.csv"
-with open(output_file, mode="w", newline="", encoding="utf-8") as file:
-    file.write(output_string)  # Writing URLs in double quotes, separated by commas
+    print(f" Scraping completed. Product URLs saved in {output_file}")
 
-print(f" Scraping completed. Product URLs saved in {output_file}")
+if __name__ == "__main__":
+    collect_satellite_terminal_urls()
 
 
 import sys
@@ -848,43 +2429,26 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import csv
 
-# Initialize Chrome WebDriver
-driver = webdriver.Chrome()
-
-# CSV file to store results
-output_file = "POWER_INDUCTORS_urls.csv"
-
-# Open the file for writing (overwrite if exists)
-with open(output_file, mode="w", newline="", encoding="utf-8") as file:
-    writer = csv.writer(file, quotechar='"', quoting=csv.QUOTE_MINIMAL)
+def collect_power_inductor_urls(window=4, cache_dir="page_cache"):
+    """Collects power inductor product URLs from the listing pages."""
+    # CSV file to store results
+    output_file = "POWER_INDUCTORS_urls.csv"
 
-    # Loop through pages 1 to 10
-    for page in range(1, 201):
-        url = f"https://www.satnow.com/search/power-inductors/filters?page={page}&country=global"
-        driver.get(url)
-
-        try:
-            # Wait until product links are available
-            product_links = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located(
-                    (By.XPATH, "//*[@id='ContentPlaceHolder1_dListItems']/div/div[2]/div[1]/h3/a")
-                )
-            )
+    # Open the file for writing (overwrite if exists)
+    with open(output_file, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, quotechar='"', quoting=csv.QUOTE_MINIMAL)
 
-            # Extract and save product URLs
-            for link in product_links:
-                product_url = link.get_attribute("href")  # Extract href (Product URL)
+        # Crawl pages 1 to 200, stopping early at the last page
+        for page, product_urls in crawl_category_listing("power-inductors", window, max_pages=200, cache_dir=cache_dir):
+            for product_url in product_urls:
                 formatted_url = f'"{product_url}",'  # Ensure double quotes and comma
                 writer.writerow([formatted_url])  # Write formatted URL to CSV
                 print(formatted_url)  # Print output in required format
 
-        except Exception as e:
-            print(f"Skipping page {page} due to error: {e}")
+    print(f"Scraping completed. Product URLs saved in {output_file}")
 
-# Close the browser
-driver.quit()
-
-print(f"Scraping completed. Product URLs saved in {output_file}")
+if __name__ == "__main__":
+    collect_power_inductor_urls()
 
 
 